@@ -0,0 +1,126 @@
+# 💾 OpenAI 응답 캐시 - (모델, 프롬프트 버전, 입력 데이터) 해시로 찾는 SQLite 저장소
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+# 기본 유효 기간 (초)
+DEFAULT_TTL = 24 * 60 * 60
+
+SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,  -- sha256(operation, model, version, data)
+        operation TEXT NOT NULL,  -- daily_feedback, smart_schedule, ...
+        model TEXT,
+        response TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        last_used REAL NOT NULL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)',
+    'CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses(expires_at)',
+)
+
+
+def cache_key(operation, model, version, data):
+    """입력 데이터를 정렬된 JSON 으로 바꿔 해시 (NamedTuple 은 값 목록으로)"""
+    payload = json.dumps([operation, model, version, data], ensure_ascii=False,
+                         sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """💾 같은 입력으로 다시 묻는 AI 요청은 저장된 응답으로 바로 돌려준다
+
+    생산성 DB와 다른 파일을 써서 캐시 쓰기가 분석 스냅샷 버전을 올리지 않게 한다.
+    항목은 expires_at 이 지나면 무시되고, 개수 / 전체 크기가 한도를 넘으면
+    가장 오래 안 쓰인 것부터 지운다. 여러 스레드에서 불러도 된다.
+    """
+
+    def __init__(self, db_path='ai_cache.db', ttl=DEFAULT_TTL, max_entries=500,
+                 max_bytes=2 * 1024 * 1024):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        conn = self.conn()
+        for statement in SCHEMA:
+            conn.execute(statement)
+        conn.commit()
+
+    def conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """유효한 응답 또는 None"""
+        now = time.time()
+        conn = self.conn()
+        row = conn.execute('SELECT response FROM responses WHERE key = ? AND expires_at > ?',
+                           (key, now)).fetchone()
+        if row is None:
+            return None
+        with self._lock:
+            conn.execute('UPDATE responses SET last_used = ? WHERE key = ?', (now, key))
+            conn.commit()
+        return row[0]
+
+    def put(self, key, operation, model, response, ttl=None):
+        now = time.time()
+        conn = self.conn()
+        with self._lock:
+            conn.execute('''
+                INSERT OR REPLACE INTO responses
+                (key, operation, model, response, size, created_at, expires_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (key, operation, model, response, len(response.encode('utf-8')),
+                  now, now + (ttl or self.ttl), now))
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn, now):
+        """만료된 항목 + 한도를 넘는 오래된 항목 삭제"""
+        conn.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+        conn.execute('''
+            DELETE FROM responses WHERE key IN (
+                SELECT key FROM (
+                    SELECT key,
+                           ROW_NUMBER() OVER (ORDER BY last_used DESC) AS position,
+                           SUM(size) OVER (ORDER BY last_used DESC) AS running_bytes
+                    FROM responses
+                )
+                WHERE position > ? OR running_bytes > ?
+            )
+        ''', (self.max_entries, self.max_bytes))
+
+    def get_or_create(self, operation, model, version, data, create, ttl=None):
+        """🔑 캐시에 있으면 (응답, True), 없으면 create() 결과를 저장하고 (응답, False)
+
+        create() 가 예외를 던지거나 빈 응답을 돌려주면 저장하지 않는다.
+        """
+        key = cache_key(operation, model, version, data)
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+        response = create()
+        if response:
+            self.put(key, operation, model, response, ttl)
+        return response, False
+
+    def clear(self, operation=None):
+        conn = self.conn()
+        with self._lock:
+            if operation:
+                conn.execute('DELETE FROM responses WHERE operation = ?', (operation,))
+            else:
+                conn.execute('DELETE FROM responses')
+            conn.commit()
@@ -0,0 +1,85 @@
+# 🤖 AI 요청을 Tk 메인 스레드 밖에서 돌리는 작업 풀
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AiJob:
+    """🤖 워커에서 실행 중인 AI 요청 하나
+
+    cancel() 은 아직 시작하지 않은 요청은 실행하지 않고, 이미 시작한 요청은
+    cancel_event 를 세워서 (스트리밍 중이면 거기서 멈추고) 결과를 버리게 한다.
+    """
+
+    def __init__(self, title, future, cancel_event):
+        self.title = title
+        self.future = future
+        self.cancel_event = cancel_event
+        self.started = time.monotonic()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def elapsed(self):
+        return int(time.monotonic() - self.started)
+
+    def cancel(self):
+        self.cancel_event.set()
+        self.future.cancel()
+
+
+class AiJobQueue:
+    """🤖 submit(title, work) 는 바로 AiJob 을 돌려주고 work(cancel_event) 는 워커에서 실행
+
+    결과 전달(UI 갱신)은 호출한 쪽이 메인 루프에서 future 를 확인해서 처리한다.
+    """
+
+    def __init__(self, max_workers=2):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ai')
+        self._jobs = []
+        self._lock = threading.Lock()
+
+    def submit(self, title, work):
+        with self._lock:
+            cancel_event = threading.Event()
+            job = AiJob(title, self.pool.submit(work, cancel_event), cancel_event)
+            self._jobs.append(job)
+            return job
+
+    def active(self):
+        """끝나지도 취소되지도 않은 작업 목록 (끝난 작업은 여기서 정리)"""
+        with self._lock:
+            self._jobs = [job for job in self._jobs if not job.future.done() and not job.cancelled]
+            return list(self._jobs)
+
+    def find(self, title):
+        """진행 중인 같은 제목의 작업 (없으면 None)"""
+        return next((job for job in self.active() if job.title == title), None)
+
+    def cancel_all(self):
+        for job in self.active():
+            job.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        self.pool.shutdown(wait=False)
+
+
+class TokenStream:
+    """🌊 워커가 받은 응답 조각을 쌓아 두고, 메인 루프가 주기적으로 모아서 가져가는 버퍼"""
+
+    def __init__(self):
+        self._parts = []
+        self._lock = threading.Lock()
+
+    def append(self, text):
+        with self._lock:
+            self._parts.append(text)
+
+    def drain(self):
+        """지금까지 쌓인 조각을 하나로 합쳐 돌려주고 비우기"""
+        with self._lock:
+            text = ''.join(self._parts)
+            self._parts.clear()
+            return text
@@ -0,0 +1,243 @@
+# 📈 대시보드용 집계를 SQLite 안에서 처리하는 분석 모듈
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional, Tuple
+
+from archive import months_before
+
+# 대시보드 기간 선택 (오늘 포함 일 수)
+RANGE_PRESETS = {'week': 7, 'month': 30, 'quarter': 91, 'year': 365}
+
+# 추이 차트 해상도 (거친 것부터). 점이 이만큼은 있어야 그래프가 찬다
+RESOLUTIONS = ('month', 'week', 'day')
+MIN_TREND_POINTS = 7
+
+
+class HourFocus(NamedTuple):
+    hour: int
+    avg_focus: Optional[float]
+    total_minutes: int
+    task_count: int
+
+
+class CategoryMinutes(NamedTuple):
+    category: str
+    minutes: int
+
+
+class DayTrend(NamedTuple):
+    date: str
+    avg_focus: float
+    completed_tasks: int
+    total_tasks: int
+
+    @property
+    def completion_rate(self):
+        return self.completed_tasks / self.total_tasks if self.total_tasks else 0.0
+
+
+class AnalyticsSnapshot(NamedTuple):
+    """대시보드 탭들과 AI 요약이 함께 쓰는 한 번의 집계 결과"""
+    version: object
+    hours: Tuple[HourFocus, ...]
+    hourly_focus: Tuple[float, ...]
+    golden: Optional[HourFocus]
+    categories: Tuple[CategoryMinutes, ...]
+    trend: Tuple[DayTrend, ...]
+    start: Optional[str] = None  # None 이면 전체 기간 + 최근 7일 추이
+    end: Optional[str] = None
+    resolution: str = 'day'  # trend 한 점의 단위 (day, week, month)
+
+
+def preset_range(name, today=None):
+    """'week' / 'month' / 'quarter' / 'year' -> (시작일, 오늘) 'YYYY-MM-DD'"""
+    today = today or datetime.now()
+    start = today - timedelta(days=RANGE_PRESETS[name] - 1)
+    return start.strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')
+
+
+def period_start(date_str, resolution):
+    """날짜가 속한 주(월요일) / 달(1일) 시작일"""
+    if resolution == 'month':
+        return date_str[:8] + '01'
+    if resolution == 'week':
+        day = datetime.strptime(date_str, '%Y-%m-%d')
+        return (day - timedelta(days=day.weekday())).strftime('%Y-%m-%d')
+    return date_str
+
+
+def pick_resolution(start, end, min_points=MIN_TREND_POINTS):
+    """기간을 채울 만큼 점이 나오는 가장 거친 해상도 (1년 -> month, 분기 -> week)"""
+    first = datetime.strptime(start, '%Y-%m-%d')
+    last = datetime.strptime(end, '%Y-%m-%d')
+    for resolution in RESOLUTIONS:
+        if resolution == 'month':
+            points = (last.year - first.year) * 12 + last.month - first.month + 1
+        elif resolution == 'week':
+            points = ((last - first).days + first.weekday()) // 7 + 1
+        else:
+            points = (last - first).days + 1
+        if points >= min_points:
+            return resolution
+    return 'day'
+
+
+def _date_clause(start, end, column='date'):
+    conditions = []
+    params = []
+    if start:
+        conditions.append(f'{column} >= ?')
+        params.append(start)
+    if end:
+        conditions.append(f'{column} <= ?')
+        params.append(end)
+    return (' AND '.join(conditions) or '1'), tuple(params)
+
+
+class AnalyticsEngine:
+    """📈 GROUP BY 를 SQLite 에 맡기고 작은 결과만 돌려주는 집계기
+
+    아카이브 파일마다 부분 합계(SUM/COUNT)를 구한 뒤 파이썬에서 합치므로
+    기록이 몇 건이든 결과 크기는 시간대/카테고리/날짜 수에만 비례한다.
+    """
+
+    def __init__(self, archive, version_source=None, columnar=None):
+        self.archive = archive
+        # DB I/O 없이 데이터 변경 여부를 알려주는 함수 (예: repo.write_version)
+        self.version_source = version_source
+        # 선택: task_records 열 단위 캐시 (ColumnarStore). 준비되면 행 단위 집계에 사용
+        self.columnar = columnar
+        self._snapshots = {}  # (start, end, trend_days) -> 마지막 스냅샷
+
+    def snapshot(self, trend_days=7, start=None, end=None) -> AnalyticsSnapshot:
+        """📸 데이터 버전이 같으면 DB를 읽지 않고 이전 스냅샷을 그대로 돌려준다
+
+        start/end 를 주면 모든 집계를 그 기간으로 제한하고, 추이는 기간 길이에
+        맞는 해상도(일/주/월)로 그린다. 없으면 전체 기간 + 최근 trend_days 일.
+        """
+        key = (start, end, trend_days)
+        version = (self.version_source() if self.version_source else None,
+                   datetime.now().strftime('%Y-%m-%d')) + key
+        cached = self._snapshots.get(key)
+        if cached is not None and self.version_source and cached.version == version:
+            return cached
+
+        hours = self.focus_by_hour(start, end)
+        rated = [row for row in hours if row.avg_focus is not None]
+        if start and end:
+            resolution = pick_resolution(start, end)
+            trend = self.trend(start, end, resolution)
+        else:
+            resolution = 'day'
+            trend = self.daily_trend(trend_days)
+        snapshot = AnalyticsSnapshot(
+            version=version,
+            hours=hours,
+            hourly_focus=tuple(self._hour_vector(hours)),
+            golden=max(rated, key=lambda row: row.avg_focus) if rated else None,
+            categories=self.minutes_by_category(start, end),
+            trend=trend,
+            start=start,
+            end=end,
+            resolution=resolution
+        )
+        # 데이터 버전이나 날짜가 바뀐 스냅샷은 버리기
+        self._snapshots = {k: v for k, v in self._snapshots.items()
+                           if v.version[:2] == version[:2]}
+        self._snapshots[key] = snapshot
+        return snapshot
+
+    def focus_by_hour(self, start=None, end=None) -> Tuple[HourFocus, ...]:
+        """⏰ 시간대별 평균 집중도 / 작업 시간"""
+        if self.columnar is not None and self.columnar.ready:
+            self.columnar.sync()
+            return self.columnar.focus_by_hour(start, end)
+        where, params = _date_clause(start, end)
+        _, rows = self.archive.query_each(f'''
+            SELECT CAST(substr(start_time, 1, 2) AS INTEGER) AS hour,
+                   SUM(focus_rating), COUNT(focus_rating),
+                   SUM(COALESCE(duration_minutes, 0)), COUNT(*)
+            FROM {{src}}.task_records
+            WHERE {where} AND start_time IS NOT NULL
+            GROUP BY hour
+        ''', params, start, end)
+
+        merged = {}
+        for hour, focus_sum, focus_count, minutes, count in rows:
+            if hour is None:
+                continue
+            acc = merged.setdefault(hour, [0, 0, 0, 0])
+            acc[0] += focus_sum or 0
+            acc[1] += focus_count
+            acc[2] += minutes or 0
+            acc[3] += count
+        return tuple(
+            HourFocus(hour, (acc[0] / acc[1]) if acc[1] else None, acc[2], acc[3])
+            for hour, acc in sorted(merged.items())
+        )
+
+    @staticmethod
+    def _hour_vector(hours):
+        values = [0.0] * 24
+        for row in hours:
+            if 0 <= row.hour < 24 and row.avg_focus is not None:
+                values[row.hour] = row.avg_focus
+        return values
+
+    def minutes_by_category(self, start=None, end=None) -> Tuple[CategoryMinutes, ...]:
+        """🗂️ 카테고리별 작업 시간 (많은 순) - 날짜 x 카테고리 집계 테이블 사용"""
+        where, params = _date_clause(start, end, 's.date')
+        _, rows = self.archive.query_each(f'''
+            SELECT COALESCE(c.name, 'Uncategorized') AS category, SUM(s.total_minutes)
+            FROM {{src}}.daily_category_stats s
+            LEFT JOIN main.categories c ON c.id = s.category_id
+            WHERE {where}
+            GROUP BY s.category_id
+        ''', params, start, end)
+
+        merged = {}
+        for category, minutes in rows:
+            merged[category] = merged.get(category, 0) + (minutes or 0)
+        return tuple(
+            CategoryMinutes(category, minutes)
+            for category, minutes in sorted(merged.items(), key=lambda kv: -kv[1])
+        )
+
+    def daily_trend(self, days=7) -> Tuple[DayTrend, ...]:
+        """📅 최근 days 일치 daily_stats (날짜 오름차순)"""
+        # 최근 기록은 핫 DB에 있으므로 핫 기간 안의 아카이브만 (보통 없음) 붙인다
+        hot_start = months_before(datetime.now(), self.archive.hot_months)
+        _, rows = self.archive.query_each('''
+            SELECT * FROM (
+                SELECT date, COALESCE(avg_focus_rating, 0), COALESCE(completed_tasks, 0),
+                       COALESCE(total_tasks, 0)
+                FROM {src}.daily_stats
+                ORDER BY date DESC
+                LIMIT ?
+            )
+        ''', (days,), hot_start, None)
+        rows = sorted(rows, reverse=True)[:days]
+        return tuple(DayTrend(*row) for row in reversed(rows))
+
+    def trend(self, start, end, resolution='day') -> Tuple[DayTrend, ...]:
+        """📅 start~end 추이. week/month 는 미리 계산된 period_stats 만 읽는다
+
+        주/월 점의 date 는 그 기간의 시작일이라 첫 점은 start 보다 이를 수 있다.
+        """
+        if resolution == 'day':
+            _, rows = self.archive.query_each('''
+                SELECT date, COALESCE(avg_focus_rating, 0), COALESCE(completed_tasks, 0),
+                       COALESCE(total_tasks, 0)
+                FROM {src}.daily_stats
+                WHERE date >= ? AND date <= ?
+            ''', (start, end), start, end)
+            return tuple(DayTrend(*row) for row in sorted(rows))
+
+        _, rows = self.archive.query_hot('''
+            SELECT period_start,
+                   CASE WHEN focus_count > 0 THEN CAST(focus_sum AS REAL) / focus_count ELSE 0 END,
+                   completed_tasks, total_tasks
+            FROM period_stats
+            WHERE resolution = ? AND period_start >= ? AND period_start <= ?
+            ORDER BY period_start
+        ''', (resolution, period_start(start, resolution), end))
+        return tuple(DayTrend(*row) for row in rows)
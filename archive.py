@@ -0,0 +1,283 @@
+# 🗄️ 오래된 기록을 월별 아카이브 DB로 옮기고 필요할 때만 ATTACH 하는 모듈
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from repository import PERIOD_KEYS, PERIOD_STATS_SELECT
+
+# 날짜(date 컬럼, 'YYYY-MM-DD')로 나눠서 옮기는 테이블들
+ARCHIVED_TABLES = ('task_records', 'daily_stats', 'daily_category_stats', 'ai_feedback',
+                   'ai_feedback_items')
+
+# SQLite 기본 ATTACH 한도(10)보다 여유 있게
+MAX_ATTACHED = 8
+
+
+def month_key(date_str):
+    """'2025-07-01' -> '2025_07'"""
+    return date_str[:7].replace('-', '_')
+
+
+def months_before(today, months):
+    """today 기준 months 개월 전 달의 1일 ('YYYY-MM-01')"""
+    year, month = today.year, today.month - months
+    while month <= 0:
+        month += 12
+        year -= 1
+    return f'{year:04d}-{month:02d}-01'
+
+
+def _save_period_stats(conn, rows):
+    conn.executemany('''
+        INSERT OR REPLACE INTO period_stats
+        (resolution, period_start, total_tasks, completed_tasks,
+         total_work_minutes, focus_sum, focus_count, active_days)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+
+
+class ArchiveManager:
+    """🗄️ 핫 DB(productivity_data.db)는 최근 몇 달만 유지하고 나머지는 월별 파일로 보관"""
+
+    def __init__(self, db_path, archive_dir='archive', hot_months=3):
+        self.db_path = db_path
+        self.archive_dir = archive_dir
+        self.hot_months = hot_months
+        self._lock = threading.Lock()
+        # repo.attach_archive() 가 연결: 핫 DB 에 직접 커밋한 뒤 호출 (쓰기 카운터 올리기),
+        # 보통 쓰기를 보낼 submit(fn, *args) -> Future (단일 writer 경로)
+        self.on_commit = None
+        self.submit = None
+
+    def _committed(self):
+        if self.on_commit:
+            self.on_commit()
+
+    def archive_path(self, period):
+        return os.path.join(self.archive_dir, f'productivity_{period}.db')
+
+    def list_periods(self):
+        """보관된 기간 목록 ('2025_07' 형식, 오름차순)"""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        periods = []
+        for name in os.listdir(self.archive_dir):
+            if name.startswith('productivity_') and name.endswith('.db'):
+                periods.append(name[len('productivity_'):-len('.db')])
+        return sorted(periods)
+
+    def periods_for_range(self, start=None, end=None):
+        """조회 기간(start~end)과 겹치는 아카이브만 골라내기"""
+        lo = month_key(start) if start else None
+        hi = month_key(end) if end else None
+        return [p for p in self.list_periods()
+                if (lo is None or p >= lo) and (hi is None or p <= hi)]
+
+    def _ensure_archive_schema(self, conn, period):
+        """핫 DB와 같은 스키마를 아카이브 파일에 생성"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        archive_conn = sqlite3.connect(self.archive_path(period))
+        try:
+            for table in ARCHIVED_TABLES:
+                row = conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    (table,)
+                ).fetchone()
+                if not row:
+                    continue
+                sql = row[0]
+                if 'IF NOT EXISTS' not in sql.upper():
+                    sql = sql.replace('CREATE TABLE', 'CREATE TABLE IF NOT EXISTS', 1)
+                archive_conn.execute(sql)
+                # 핫 DB에 나중에 추가된 컬럼은 아카이브에도 추가
+                hot_cols = conn.execute(f'PRAGMA table_info({table})').fetchall()
+                archived = {c[1] for c in archive_conn.execute(f'PRAGMA table_info({table})')}
+                for col in hot_cols:
+                    if col[1] not in archived:
+                        archive_conn.execute(
+                            f'ALTER TABLE {table} ADD COLUMN {col[1]} {col[2]}'
+                        )
+                archive_conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS idx_{table}_date ON {table}(date)'
+                )
+            archive_conn.commit()
+        finally:
+            archive_conn.close()
+
+    def archive_old_records(self, today=None):
+        """📦 hot_months 이전 달의 기록을 월별 아카이브로 이동. 옮긴 행 수 반환
+
+        ATTACH / DETACH 는 트랜잭션 안에서 할 수 없어서 단일 writer 의 배치로 보낼 수
+        없다. 그래서 자기 연결로 커밋하고, 달마다 끝나면 on_commit 으로 알린다.
+        """
+        cutoff = months_before(today or datetime.now(), self.hot_months)
+        moved = 0
+        with self._lock:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                periods = set()
+                for table in ARCHIVED_TABLES:
+                    rows = conn.execute(
+                        f"SELECT DISTINCT substr(date, 1, 7) FROM {table} WHERE date < ?",
+                        (cutoff,)
+                    ).fetchall()
+                    periods.update(month_key(r[0]) for r in rows if r[0])
+
+                for period in sorted(periods):
+                    self._ensure_archive_schema(conn, period)
+                    month_prefix = period.replace('_', '-')
+                    conn.execute('ATTACH DATABASE ? AS arch', (self.archive_path(period),))
+                    try:
+                        with conn:
+                            for table in ARCHIVED_TABLES:
+                                cols = ', '.join(
+                                    c[1] for c in conn.execute(f'PRAGMA main.table_info({table})')
+                                )
+                                conn.execute(
+                                    f'INSERT OR REPLACE INTO arch.{table} ({cols}) '
+                                    f'SELECT {cols} FROM main.{table} WHERE substr(date, 1, 7) = ?',
+                                    (month_prefix,)
+                                )
+                                cur = conn.execute(
+                                    f'DELETE FROM main.{table} WHERE substr(date, 1, 7) = ?',
+                                    (month_prefix,)
+                                )
+                                moved += cur.rowcount
+                        self._committed()
+                    finally:
+                        conn.execute('DETACH DATABASE arch')
+            finally:
+                conn.close()
+        return moved
+
+    def query_each(self, sql, params=(), start=None, end=None):
+        """📊 sql 의 {src} 를 main 과 기간에 맞는 아카이브 별칭으로 바꿔 각각 실행
+
+        집계 쿼리를 파일마다 SQLite 안에서 돌리고 부분 결과 행만 모아 돌려준다.
+        start/end 가 모두 None 이면 전체 기간이라 모든 아카이브를 붙인다.
+        ATTACH 한도 때문에 아카이브는 MAX_ATTACHED 개씩 나눠서 붙인다.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            cursor = conn.execute(sql.format(src='main'), params)
+            names = [d[0] for d in cursor.description]
+            rows = cursor.fetchall()
+
+            periods = self.periods_for_range(start, end)
+            for i in range(0, len(periods), MAX_ATTACHED):
+                batch = periods[i:i + MAX_ATTACHED]
+                aliases = []
+                try:
+                    for j, period in enumerate(batch):
+                        alias = f'arch{j}'
+                        conn.execute(f'ATTACH DATABASE ? AS {alias}', (self.archive_path(period),))
+                        aliases.append(alias)
+                    union = ' UNION ALL '.join(sql.format(src=alias) for alias in aliases)
+                    rows.extend(conn.execute(union, tuple(params) * len(aliases)).fetchall())
+                finally:
+                    for alias in aliases:
+                        conn.execute(f'DETACH DATABASE {alias}')
+            return names, rows
+        finally:
+            conn.close()
+
+    def query_hot(self, sql, params=()):
+        """📊 아카이브하지 않는 테이블(period_stats 등)은 핫 DB만 조회"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            cursor = conn.execute(sql, params)
+            return [d[0] for d in cursor.description], cursor.fetchall()
+        finally:
+            conn.close()
+
+    def backfill_period_stats(self):
+        """📅 주/월 집계가 없는 아카이브 달을 아카이브 기록으로 채우기. 채운 달 수 반환
+
+        집계는 보통 기록이 핫 DB에 있을 때 만들어지므로, 집계 테이블이 생기기 전에
+        아카이브된 달만 해당된다. 달 경계에 걸친 주는 앞뒤 6일까지 함께 읽어 계산한다.
+        """
+        periods = self.list_periods()
+        if not periods:
+            return 0
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'period_stats'").fetchone() is None:
+                return 0
+            have = {month_key(row[0]) for row in conn.execute(
+                "SELECT period_start FROM period_stats WHERE resolution = 'month'"
+            )}
+        finally:
+            conn.close()
+
+        filled = 0
+        for period in periods:
+            if period in have:
+                continue
+            first = datetime.strptime(period.replace('_', '-') + '-01', '%Y-%m-%d')
+            last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+            lo = (first - timedelta(days=6)).strftime('%Y-%m-%d')
+            hi = (last + timedelta(days=6)).strftime('%Y-%m-%d')
+            month_start, month_end = first.strftime('%Y-%m-%d'), last.strftime('%Y-%m-%d')
+
+            rows = []
+            for resolution, key in PERIOD_KEYS.items():
+                sql = PERIOD_STATS_SELECT.format(key=key, where='date >= ? AND date <= ?',
+                                                 src='{src}')
+                _, parts = self.query_each(sql, (lo, hi), lo, hi)
+                merged = {}
+                for period_start, *values in parts:
+                    acc = merged.setdefault(period_start, [0] * len(values))
+                    for i, value in enumerate(values):
+                        acc[i] += value or 0
+                # 이 달과 겹치는 주 / 이 달만 (범위 가장자리의 잘린 주는 버림)
+                lowest = month_start if resolution == 'month' else lo
+                rows.extend((resolution, period_start, *values)
+                            for period_start, values in merged.items()
+                            if lowest <= period_start <= month_end)
+            if not rows:
+                continue
+            if self.submit is not None:
+                # 앱에서는 다른 쓰기와 같은 writer 로 (잠금 충돌 없이, 커밋 후 버전도 올라감)
+                self.submit(_save_period_stats, rows).result()
+            else:
+                with self._lock:
+                    conn = sqlite3.connect(self.db_path, timeout=30)
+                    try:
+                        with conn:
+                            _save_period_stats(conn, rows)
+                    finally:
+                        conn.close()
+                self._committed()
+            filled += 1
+        return filled
+
+    def run_maintenance(self):
+        """🧹 아카이브 이동 / 주·월 집계 보충 후 ANALYZE / VACUUM (UI 스레드 밖에서 호출)"""
+        moved = self.archive_old_records()
+        self.backfill_period_stats()
+        with self._lock:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                conn.execute('ANALYZE')
+                if moved:
+                    conn.execute('VACUUM')
+            finally:
+                conn.close()
+        return moved
+
+    def start_maintenance_thread(self, on_done=None):
+        """🧹 백그라운드 유지보수 작업 시작"""
+        def worker():
+            try:
+                moved = self.run_maintenance()
+                if on_done:
+                    on_done(moved, None)
+            except Exception as e:
+                print(f'Archive maintenance error: {e}')
+                if on_done:
+                    on_done(0, e)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        return thread
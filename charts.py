@@ -0,0 +1,163 @@
+# 📊 대시보드 차트 - pyplot 전역 상태 없이 Agg 로 그리는 Figure 빌더
+from datetime import datetime
+from io import BytesIO
+
+import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from seaborn.utils import relative_luminance
+
+
+def render_png(fig, dpi=100):
+    """🖼️ Agg 로 PNG 바이트 렌더링 (Tk 없이, 워커 스레드에서 호출 가능)"""
+    if not isinstance(fig.canvas, FigureCanvasAgg):
+        FigureCanvasAgg(fig)
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi)
+    return buffer.getvalue()
+
+
+class PersistentChart:
+    """♻️ Figure 하나를 계속 재사용하는 차트
+
+    처음에는 build() 로 artist 들을 만들고, 이후에는 update() 로 데이터만
+    바꿔 끼운다 (set_data / set_array). 스냅샷 버전이 그대로면 마지막 PNG 를
+    그대로 돌려주므로 대시보드를 다시 열어도 다시 그리지 않는다.
+    같은 차트를 여러 스레드에서 동시에 그리지 않도록 한 워커에서만 호출할 것.
+    """
+
+    figsize = (8, 4)
+
+    def __init__(self):
+        self.figure = None
+        self.version = None
+        self.png = None
+
+    def render(self, snapshot, dpi=100):
+        """데이터가 없으면 None, 있으면 PNG 바이트"""
+        if self.version is not None and self.version == snapshot.version:
+            return self.png
+        data = self.extract(snapshot)
+        if not data:
+            png = None
+        else:
+            if self.figure is None or not self.update(data):
+                self.figure = Figure(figsize=self.figsize)
+                self.build(self.figure, data)
+            png = render_png(self.figure, dpi)
+        self.version = snapshot.version
+        self.png = png
+        return png
+
+    def extract(self, snapshot):
+        """스냅샷에서 그릴 데이터만 꺼낸다. 비어 있으면 그리지 않음"""
+        raise NotImplementedError
+
+    def build(self, fig, data):
+        """빈 Figure 에 artist 들을 처음 만든다"""
+        raise NotImplementedError
+
+    def update(self, data):
+        """기존 artist 에 데이터만 반영. 제자리 갱신이 불가능하면 False"""
+        return False
+
+
+class FocusHeatmapChart(PersistentChart):
+    """⏰ 시간대별 평균 집중도 히트맵"""
+
+    figsize = (8, 2)
+
+    def extract(self, snapshot):
+        return list(snapshot.hourly_focus) if snapshot.hours else None
+
+    def build(self, fig, data):
+        ax = fig.add_subplot()
+        sns.heatmap([data], cmap='YlGnBu', annot=True, cbar=True,
+                    xticklabels=range(24), yticklabels=['Focus'], ax=ax)
+        ax.set_title('Average Focus by Hour')
+        fig.tight_layout()
+        self.ax = ax
+
+    def update(self, data):
+        ax = self.ax
+        if not ax.collections or len(ax.texts) != len(data):
+            return False
+        mesh = ax.collections[0]
+        mesh.set_array([data])
+        mesh.set_clim(min(data), max(data))
+        # seaborn 과 같은 기준으로 셀 밝기에 따라 글자색을 고른다
+        for text, value in zip(ax.texts, data):
+            text.set_text(f'{value:.2g}')
+            light = relative_luminance(mesh.to_rgba(value)) > .408
+            text.set_color('.15' if light else 'w')
+        return True
+
+
+class CategoryPieChart(PersistentChart):
+    """🗂️ 카테고리별 작업 시간 파이차트"""
+
+    figsize = (5, 5)
+
+    def extract(self, snapshot):
+        return [row for row in snapshot.categories if row.minutes > 0]
+
+    def build(self, fig, data):
+        self.ax = fig.add_subplot()
+        self._draw(data)
+
+    def update(self, data):
+        # 조각 수가 바뀔 수 있어 Axes 만 비우고 다시 그린다 (Figure 는 재사용)
+        self.ax.clear()
+        self._draw(data)
+        return True
+
+    def _draw(self, data):
+        ax = self.ax
+        ax.pie([row.minutes for row in data], labels=[row.category for row in data],
+               autopct='%1.1f%%', startangle=90)
+        ax.set_title('Time Spent by Category')
+
+
+class TrendChart(PersistentChart):
+    """📅 집중도 / 달성률 추이 (기간에 따라 일/주/월 단위)"""
+
+    figsize = (8, 4)
+
+    def extract(self, snapshot):
+        if not snapshot.trend:
+            return None
+        if snapshot.start and snapshot.end:
+            unit = {'day': 'Daily', 'week': 'Weekly', 'month': 'Monthly'}[snapshot.resolution]
+            title = f'{snapshot.start} ~ {snapshot.end}: {unit} Focus & Goal Achievement'
+        else:
+            title = 'Last 7 Days: Focus & Goal Achievement'
+        return snapshot.trend, title
+
+    def build(self, fig, data):
+        trend, title = data
+        ax = fig.add_subplot()
+        dates, focus, rate = self._series(trend)
+        self.focus_line, = ax.plot(dates, focus, marker='o', label='Avg. Focus')
+        self.rate_line, = ax.plot(dates, rate, marker='s', label='Goal Achievement Rate')
+        ax.set_ylim(0, 1.1)
+        ax.legend()
+        ax.set_title(title)
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Rate/Score')
+        fig.autofmt_xdate()
+        self.ax = ax
+
+    def update(self, data):
+        trend, title = data
+        dates, focus, rate = self._series(trend)
+        self.focus_line.set_data(dates, focus)
+        self.rate_line.set_data(dates, rate)
+        self.ax.set_title(title)
+        self.ax.relim()
+        self.ax.autoscale_view(scaley=False)
+        return True
+
+    @staticmethod
+    def _series(trend):
+        dates = [datetime.strptime(day.date, '%Y-%m-%d') for day in trend]
+        return dates, [day.avg_focus for day in trend], [day.completion_rate for day in trend]
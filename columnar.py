@@ -0,0 +1,226 @@
+# 🧮 task_records 의 열 단위 스냅샷 (메모리 맵 .npy) - 긴 기록의 벡터화 분석용
+import io
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Tuple
+
+import numpy as np
+
+from analytics import HourFocus
+
+# 컬럼 이름 -> dtype. 시각은 '벽시계 초' (현지 날짜+시각을 UTC 로 본 epoch) 라서
+# 시간대 변환 없이 (t // 3600) % 24 가 시작 시각이 된다
+COLUMNS = {
+    'id': np.int64,
+    'start_epoch': np.int64,
+    'duration': np.int32,    # 분
+    'focus': np.int8,        # 1~5, 평가 없음 = 0
+    'category_id': np.int32,  # 없음 = -1
+    'pomodoros': np.int16,
+    'done': np.bool_,        # status = 'Done'
+}
+
+SELECT_COLUMNS = '''
+    SELECT id,
+           CAST(strftime('%s', date || ' ' || start_time) AS INTEGER),
+           COALESCE(duration_minutes, 0), COALESCE(focus_rating, 0),
+           COALESCE(category_id, -1), COALESCE(pomodoro_count, 0),
+           status = 'Done'
+    FROM {src}.task_records
+'''
+
+# 아직 끝나지 않은 기록은 나중에 값이 바뀌므로, 가장 오래된 진행 중 기록 앞까지만 붙인다.
+# 어제 이전에 시작해 아직 진행 중인 기록은 버려진 것으로 보고 (done = 0) 그대로 붙인다
+FINALIZED = '''
+    id > ? AND id < COALESCE(
+        (SELECT MIN(id) FROM main.task_records
+         WHERE status = 'In Progress' AND date >= date('now', 'localtime', '-1 day')),
+        9223372036854775807)
+'''
+
+
+def _epoch(date_str):
+    return int((datetime.strptime(date_str, '%Y-%m-%d') - datetime(1970, 1, 1)).total_seconds())
+
+
+def _append_npy(path, values):
+    """기존 .npy 뒤에 값만 덧붙이고 헤더의 길이만 고친다 (전체 다시 쓰기 없음)"""
+    if not os.path.exists(path):
+        np.save(path, values)
+        return
+    with open(path, 'r+b') as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        header_len = f.tell()
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(header, {
+            'descr': np.lib.format.dtype_to_descr(dtype),
+            'fortran_order': fortran_order,
+            'shape': (shape[0] + len(values),),
+        })
+        if len(header.getvalue()) != header_len:
+            # 헤더 여백이 모자라면 (드묾) 통째로 다시 저장
+            f.close()
+            np.save(path, np.concatenate([np.load(path), values.astype(dtype)]))
+            return
+        # 데이터를 먼저 쓰고 헤더를 나중에 고쳐서, 중간에 죽어도 이전 길이로 읽힌다
+        f.seek(header_len + shape[0] * dtype.itemsize)
+        f.write(values.astype(dtype).tobytes())
+        f.seek(0)
+        f.write(header.getvalue())
+
+
+class ColumnarStore:
+    """🧮 task_records 를 컬럼별 .npy 로 보관하고 새 기록만 덧붙이는 분석 캐시
+
+    sync() 는 마지막으로 붙인 id 이후의 끝난 기록만 읽는다. 첫 sync 는 월별
+    아카이브까지 모두 읽으므로 백그라운드에서 한 번 돌리는 것이 좋다.
+    배열은 mmap 으로 열어 필요한 부분만 메모리에 올라온다.
+    """
+
+    def __init__(self, archive, cache_dir='columnar'):
+        self.archive = archive
+        self.cache_dir = cache_dir
+        self.meta_path = os.path.join(cache_dir, 'meta.json')
+        self._lock = threading.Lock()
+        self._arrays = None
+        self.last_id = self._load_meta().get('last_id', 0)
+        if self.last_id and not self._is_consistent():
+            # 덧붙이는 도중에 종료된 경우 - 다음 sync 에서 처음부터 다시 만든다
+            self._clear()
+
+    @property
+    def ready(self):
+        return self.last_id > 0
+
+    def _load_meta(self):
+        try:
+            with open(self.meta_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, f'{name}.npy')
+
+    def _is_consistent(self):
+        try:
+            columns = [np.load(self._path(name), mmap_mode='r') for name in COLUMNS]
+        except (OSError, ValueError):
+            return False
+        lengths = {len(column) for column in columns}
+        return len(lengths) == 1 and len(columns[0]) and int(columns[0][-1]) == self.last_id
+
+    def _clear(self):
+        for name in COLUMNS:
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+        if os.path.exists(self.meta_path):
+            os.remove(self.meta_path)
+        self.last_id = 0
+        self._arrays = None
+
+    def sync(self):
+        """🔄 새로 끝난 기록을 덧붙이기. 붙인 행 수 반환"""
+        with self._lock:
+            sql = SELECT_COLUMNS + ' WHERE ' + FINALIZED
+            if self.last_id:
+                # 새 기록은 항상 핫 DB에 있다
+                _, rows = self.archive.query_hot(sql.format(src='main') + ' ORDER BY id',
+                                                 (self.last_id,))
+            else:
+                _, rows = self.archive.query_each(sql, (0,))
+                rows.sort()
+            if not rows:
+                return 0
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for i, (name, dtype) in enumerate(COLUMNS.items()):
+                values = np.fromiter((row[i] or 0 for row in rows), dtype=dtype, count=len(rows))
+                _append_npy(self._path(name), values)
+            self.last_id = int(rows[-1][0])
+            with open(self.meta_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump({'last_id': self.last_id, 'columns': list(COLUMNS)}, f)
+            os.replace(self.meta_path + '.tmp', self.meta_path)
+            self._arrays = None
+            return len(rows)
+
+    def _mapped(self):
+        # self._lock 을 잡은 상태에서 호출
+        if self._arrays is None:
+            if not self.ready:
+                self._arrays = {name: np.zeros(0, dtype) for name, dtype in COLUMNS.items()}
+            else:
+                self._arrays = {name: np.load(self._path(name), mmap_mode='r')
+                                for name in COLUMNS}
+        return self._arrays
+
+    def _tail(self, last_id):
+        """아직 캐시에 붙이지 않은 (last_id 이후의) 행 - 보통 오늘 것 몇 개"""
+        _, rows = self.archive.query_hot(SELECT_COLUMNS.format(src='main') + ' WHERE id > ?',
+                                         (last_id,))
+        return {name: np.fromiter((row[i] or 0 for row in rows), dtype=dtype, count=len(rows))
+                for i, (name, dtype) in enumerate(COLUMNS.items())}
+
+    def select(self, start=None, end=None, done_only=False):
+        """날짜 범위('YYYY-MM-DD', 양 끝 포함)의 컬럼 배열 (캐시 + 아직 안 붙인 최근 행)
+
+        배열과 last_id 는 lock 안에서 함께 읽는다. 그 사이에 sync() 가 덧붙여도
+        캐시 구간과 DB 에서 읽는 구간이 겹치거나 비지 않는다.
+        """
+        with self._lock:
+            mapped = self._mapped()
+            last_id = self.last_id
+            count = min(len(column) for column in mapped.values())
+        cached = {name: column[:count] for name, column in mapped.items()}
+        tail = self._tail(last_id)
+        cols = {name: np.concatenate([cached[name], tail[name]]) if len(tail[name]) else cached[name]
+                for name in COLUMNS}
+        mask = np.ones(len(cols['id']), dtype=bool)
+        if start:
+            mask &= cols['start_epoch'] >= _epoch(start)
+        if end:
+            mask &= cols['start_epoch'] < _epoch(end) + 86400
+        if done_only:
+            mask &= cols['done']
+        return {name: column[mask] for name, column in cols.items()}
+
+    # ------------------------------------------------------------------
+    # 벡터화 집계
+    # ------------------------------------------------------------------
+    def focus_by_hour(self, start=None, end=None) -> Tuple[HourFocus, ...]:
+        """⏰ AnalyticsEngine.focus_by_hour 와 같은 결과"""
+        cols = self.select(start, end)
+        hours = (cols['start_epoch'] // 3600) % 24
+        focus = cols['focus'].astype(np.int64)
+        rated = focus > 0
+        counts = np.bincount(hours, minlength=24)
+        focus_sum = np.bincount(hours[rated], weights=focus[rated], minlength=24)
+        focus_count = np.bincount(hours[rated], minlength=24)
+        minutes = np.bincount(hours, weights=cols['duration'], minlength=24)
+        return tuple(
+            HourFocus(hour, focus_sum[hour] / focus_count[hour] if focus_count[hour] else None,
+                      int(minutes[hour]), int(counts[hour]))
+            for hour in np.flatnonzero(counts).tolist()
+        )
+
+    def task_pattern(self, start=None, end=None, default_focus=3):
+        """📊 완료 업무의 시간대별 평균 집중도 (평가 없음 = default_focus) / 평균 소요시간
+
+        (업무 수, {시: 평균 집중도}, 평균 소요 분) 반환
+        """
+        cols = self.select(start, end, done_only=True)
+        count = len(cols['id'])
+        if not count:
+            return 0, {}, 0.0
+        hours = (cols['start_epoch'] // 3600) % 24
+        focus = cols['focus'].astype(np.float64)
+        focus[focus == 0] = default_focus
+        per_hour = np.bincount(hours, minlength=24)
+        focus_sum = np.bincount(hours, weights=focus, minlength=24)
+        hourly = {int(h): focus_sum[h] / per_hour[h] for h in np.flatnonzero(per_hour)}
+        return count, hourly, float(cols['duration'].mean())
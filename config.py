@@ -12,9 +12,15 @@ class Config:
     # OpenAI API Configuration
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+    # OpenAI 호환 서버 주소 (비우면 api.openai.com, 오프라인 테스트는 fake_openai.py)
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None
     
     # Database Configuration
     DATABASE_PATH = os.getenv('DATABASE_PATH', 'productivity_tracker.db')
+    # task_records 열 단위(.npy) 분석 캐시 - 기록이 아주 많을 때만 켜기
+    COLUMNAR_CACHE = os.getenv('COLUMNAR_CACHE', 'false').lower() == 'true'
+    # 하루 정리(AI 피드백 + 내일 예측)를 미리 만드는 시각 (HH:MM, off 면 종료할 때만)
+    DIGEST_TIME = os.getenv('DIGEST_TIME', '22:00')
     
     # Notification Settings
     NOTIFICATION_ENABLED = os.getenv('NOTIFICATION_ENABLED', 'true').lower() == 'true'
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+"""
+📦 토스트 트래커 데이터 내보내기 / 가져오기
+
+사용 방법:
+  python data_io.py export --format csv --out exports
+  python data_io.py export --format parquet --tables task_records daily_stats --include-archive
+  python data_io.py import --format jsonl --table task_records other_tracker.jsonl
+
+전체를 메모리에 올리지 않고 chunk-size 행씩 스트리밍하므로
+수백만 행 기록도 일정한 메모리로 처리됩니다.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+
+from archive import ARCHIVED_TABLES, ArchiveManager
+from repository import ProductivityRepository
+
+EXPORT_TABLES = ('task_records', 'daily_stats', 'goals', 'ai_feedback', 'ai_feedback_items')
+FORMATS = ('csv', 'jsonl', 'parquet')
+EXTENSIONS = {'csv': 'csv', 'jsonl': 'jsonl', 'parquet': 'parquet'}
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def require_pyarrow():
+    """Parquet 은 pyarrow 가 있을 때만 지원"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        raise SystemExit('❌ Parquet 형식은 pyarrow 가 필요합니다: pip install pyarrow')
+
+
+def iter_chunks(conn, table, chunk_size):
+    """(컬럼명, 행 chunk) 를 차례로 돌려주는 제너레이터"""
+    cursor = conn.execute(f'SELECT * FROM {table} ORDER BY id')
+    columns = [d[0] for d in cursor.description]
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield columns, rows
+
+
+def table_sources(db_path, table, include_archive):
+    """내보낼 DB 파일 목록 (핫 DB + 선택적으로 월별 아카이브)"""
+    sources = [db_path]
+    if include_archive and table in ARCHIVED_TABLES:
+        archive = ArchiveManager(db_path)
+        sources.extend(archive.archive_path(p) for p in archive.list_periods())
+    return sources
+
+
+# ----------------------------------------------------------------------
+# 내보내기 writer 들
+# ----------------------------------------------------------------------
+def column_types(db_path, table):
+    """컬럼명 -> SQLite 선언 타입 (대문자, 없으면 '')"""
+    conn = sqlite3.connect(db_path)
+    try:
+        return {row[1]: (row[2] or '').upper() for row in conn.execute(f'PRAGMA table_info({table})')}
+    finally:
+        conn.close()
+
+
+def arrow_type(pa, declared):
+    """SQLite 타입 친화도 규칙대로 pyarrow 타입 고르기"""
+    if 'INT' in declared or declared == 'BOOLEAN':
+        return pa.int64()
+    if any(name in declared for name in ('REAL', 'FLOA', 'DOUB')):
+        return pa.float64()
+    return pa.string()
+
+
+class CsvWriter:
+    def __init__(self, path, types=None):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.header_written = False
+
+    def write(self, columns, rows):
+        if not self.header_written:
+            self.writer.writerow(columns)
+            self.header_written = True
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlWriter:
+    def __init__(self, path, types=None):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write(self, columns, rows):
+        self.file.writelines(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + '\n' for row in rows
+        )
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """스키마는 첫 chunk 가 아니라 테이블 선언 타입으로 정한다
+
+    (첫 chunk 에서 한 컬럼이 모두 NULL 이면 null 타입이 되어 다음 chunk 와 맞지 않으므로)
+    """
+
+    def __init__(self, path, types=None):
+        self.pa = require_pyarrow()
+        self.path = path
+        self.types = types or {}
+        self.writer = None
+        self.schema = None
+
+    def write(self, columns, rows):
+        pa = self.pa
+        if self.schema is None:
+            self.schema = pa.schema([(c, arrow_type(pa, self.types.get(c, ''))) for c in columns])
+            self.writer = pa.parquet.ParquetWriter(self.path, self.schema)
+        arrays = list(zip(*rows))
+        table = pa.Table.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(arrays, self.schema)],
+            schema=self.schema
+        )
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+WRITERS = {'csv': CsvWriter, 'jsonl': JsonlWriter, 'parquet': ParquetWriter}
+
+
+def export_table(db_path, table, fmt, out_dir, chunk_size=DEFAULT_CHUNK_SIZE,
+                 include_archive=False):
+    """📤 테이블 하나를 파일로 내보내기. 내보낸 행 수 반환"""
+    path = os.path.join(out_dir, f'{table}.{EXTENSIONS[fmt]}')
+    writer = WRITERS[fmt](path, column_types(db_path, table))
+    count = 0
+    try:
+        for source in table_sources(db_path, table, include_archive):
+            conn = sqlite3.connect(source)
+            try:
+                for columns, rows in iter_chunks(conn, table, chunk_size):
+                    writer.write(columns, rows)
+                    count += len(rows)
+            finally:
+                conn.close()
+    finally:
+        writer.close()
+    return path, count
+
+
+# ----------------------------------------------------------------------
+# 가져오기 reader 들 - (컬럼명, 행 chunk) 를 돌려준다
+# ----------------------------------------------------------------------
+def read_csv_chunks(path, chunk_size):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        columns = next(reader, None)
+        if not columns:
+            return
+        chunk = []
+        for row in reader:
+            # CSV 빈 칸은 NULL 로
+            chunk.append(tuple(v if v != '' else None for v in row))
+            if len(chunk) >= chunk_size:
+                yield columns, chunk
+                chunk = []
+        if chunk:
+            yield columns, chunk
+
+
+def read_jsonl_chunks(path, chunk_size):
+    with open(path, encoding='utf-8') as f:
+        columns = None
+        chunk = []
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if columns is None:
+                columns = list(record.keys())
+            chunk.append(tuple(record.get(c) for c in columns))
+            if len(chunk) >= chunk_size:
+                yield columns, chunk
+                chunk = []
+        if chunk:
+            yield columns, chunk
+
+
+def read_parquet_chunks(path, chunk_size):
+    pa = require_pyarrow()
+    parquet_file = pa.parquet.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        columns = batch.schema.names
+        data = [batch.column(i).to_pylist() for i in range(batch.num_columns)]
+        yield columns, list(zip(*data))
+
+
+READERS = {'csv': read_csv_chunks, 'jsonl': read_jsonl_chunks, 'parquet': read_parquet_chunks}
+
+
+def import_file(db_path, table, fmt, path, chunk_size=DEFAULT_CHUNK_SIZE,
+                keep_ids=False, on_conflict='abort'):
+    """📥 파일을 테이블로 가져오기. chunk 마다 executemany + 트랜잭션 하나
+
+    task_records 를 가져오면 끝난 뒤 가져온 날짜들의 통계 / 집계를 다시 계산한다.
+    """
+    repo = ProductivityRepository(db_path)
+    repo.init_schema()
+    conn = repo.conn()
+    table_columns = [c[1] for c in conn.execute(f'PRAGMA table_info({table})')]
+    verb = {'abort': 'INSERT', 'ignore': 'INSERT OR IGNORE', 'replace': 'INSERT OR REPLACE'}[on_conflict]
+
+    count = 0
+    sql = None
+    indexes = date_index = None
+    dates = set()
+    try:
+        for columns, rows in READERS[fmt](path, chunk_size):
+            if sql is None:
+                # 테이블에 있는 컬럼만, id 는 --keep-ids 일 때만 유지
+                usable = [c for c in columns
+                          if c in table_columns and (keep_ids or c != 'id')]
+                if not usable:
+                    raise SystemExit(f'❌ {path}: {table} 테이블과 일치하는 컬럼이 없습니다')
+                indexes = [columns.index(c) for c in usable]
+                date_index = columns.index('date') if 'date' in usable else None
+                placeholders = ', '.join('?' for _ in usable)
+                sql = f"{verb} INTO {table} ({', '.join(usable)}) VALUES ({placeholders})"
+            with conn:
+                conn.executemany(sql, ([row[i] for i in indexes] for row in rows))
+            if date_index is not None:
+                dates.update(row[date_index] for row in rows if row[date_index])
+            count += len(rows)
+        if table == 'task_records' and count:
+            # 앱에서 기록할 때와 같은 경로로 카테고리 연결 + 일일 / 카테고리 / 주·월 집계
+            repo.refresh_imported_records(dates).result()
+    finally:
+        repo.close()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='🍞 토스트 트래커 데이터 내보내기/가져오기')
+    parser.add_argument('--db', default='productivity_data.db', help='SQLite DB 경로')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = sub.add_parser('export', help='테이블을 파일로 내보내기')
+    export_parser.add_argument('--format', choices=FORMATS, default='csv')
+    export_parser.add_argument('--out', default='exports', help='출력 폴더')
+    export_parser.add_argument('--tables', nargs='+', choices=EXPORT_TABLES,
+                               default=list(EXPORT_TABLES))
+    export_parser.add_argument('--include-archive', action='store_true',
+                               help='월별 아카이브 DB의 기록도 함께 내보내기')
+
+    import_parser = sub.add_parser('import', help='파일을 테이블로 가져오기')
+    import_parser.add_argument('--format', choices=FORMATS, default=None,
+                               help='생략하면 확장자로 판단')
+    import_parser.add_argument('--table', choices=EXPORT_TABLES, required=True)
+    import_parser.add_argument('--keep-ids', action='store_true',
+                               help='파일의 id 값을 그대로 사용')
+    import_parser.add_argument('--on-conflict', choices=('abort', 'ignore', 'replace'),
+                               default='abort')
+    import_parser.add_argument('path')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        os.makedirs(args.out, exist_ok=True)
+        for table in args.tables:
+            path, count = export_table(args.db, table, args.format, args.out,
+                                       args.chunk_size, args.include_archive)
+            print(f'📤 {table}: {count}행 -> {path}')
+    else:
+        fmt = args.format or os.path.splitext(args.path)[1].lstrip('.').lower()
+        if fmt not in FORMATS:
+            parser.error(f'알 수 없는 형식입니다: {fmt}')
+        count = import_file(args.db, args.table, fmt, args.path, args.chunk_size,
+                            args.keep_ids, args.on_conflict)
+        print(f'📥 {args.table}: {count}행 처리 <- {args.path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+# ✍️ SQLite 쓰기를 전담하는 단일 writer 스레드 (group commit)
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class DatabaseWriter:
+    """✍️ 쓰기 요청을 큐로 받아 짧은 시간 창(batch_window) 안의 요청들을 한 번에 커밋
+
+    submit(fn, *args) 는 바로 Future 를 돌려주고, fn(conn, *args) 는 writer
+    스레드에서 실행된다. Future 는 배치가 커밋된 뒤에 결과가 채워진다.
+    같은 writer 가 돌려준 Future 를 다음 쓰기의 인자로 넘기면 (예: 방금 INSERT 한
+    row id) 같은 배치 안이더라도 실행된 값으로 바꿔서 호출한다.
+    """
+
+    def __init__(self, db_path, batch_window=0.05, max_batch=200, on_commit=None):
+        self.db_path = db_path
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.on_commit = on_commit
+        self._queue = queue.Queue()
+        self._thread = None
+        self._values = {}  # 실행됐지만 아직 커밋 전인 Future -> 값
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, fn, *args, notify=True):
+        """notify=False 인 쓰기만 있는 배치는 커밋 후 on_commit 을 부르지 않는다"""
+        future = Future()
+        self._queue.put((future, fn, args, notify))
+        return future
+
+    def execute(self, sql, params=()):
+        """단일 SQL 문 쓰기. Future 결과는 lastrowid"""
+        return self.submit(lambda conn, *p: conn.execute(sql, p).lastrowid, *params)
+
+    def stop(self, timeout=5):
+        """남은 요청을 모두 커밋하고 스레드 종료"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _resolve(self, value):
+        if isinstance(value, Future):
+            if value in self._values:
+                return self._values[value]
+            return value.result()
+        return value
+
+    def _collect_batch(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        stopping = False
+        try:
+            while not stopping:
+                first = self._queue.get()
+                if first is _STOP:
+                    # 종료 전에 이미 들어온 요청은 모두 처리
+                    pending = []
+                    while not self._queue.empty():
+                        item = self._queue.get_nowait()
+                        if item is not _STOP:
+                            pending.append(item)
+                    if not pending:
+                        break
+                    batch, stopping = pending, True
+                else:
+                    batch, stopping = self._collect_batch(first)
+                self._write_batch(conn, batch)
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn, batch):
+        """배치 하나를 한 트랜잭션으로. BEGIN / COMMIT 자체가 실패해도 (예: 다른 연결이
+        잠근 'database is locked') 배치의 Future 만 실패시키고 writer 스레드는 계속 돈다"""
+        try:
+            done, notify = self._execute_batch(conn, batch)
+        except Exception as e:
+            if conn.in_transaction:
+                try:
+                    conn.execute('ROLLBACK')
+                except sqlite3.Error:
+                    pass
+            for future, *_ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._values.clear()
+        if done and notify and self.on_commit:
+            try:
+                self.on_commit()
+            except Exception as e:
+                print(f'DB writer on_commit error: {e}')
+        for future, value in done:
+            future.set_result(value)
+
+    def _execute_batch(self, conn, batch):
+        """(커밋된 (Future, 값) 목록, on_commit 을 부를지) - 커밋 실패는 예외로"""
+        done = []
+        notify = False
+        conn.execute('BEGIN')
+        for future, fn, args, intent_notify in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            # 요청 하나가 실패해도 나머지는 커밋되도록 savepoint 로 감싼다
+            conn.execute('SAVEPOINT intent')
+            try:
+                value = fn(conn, *[self._resolve(a) for a in args])
+                conn.execute('RELEASE intent')
+                self._values[future] = value
+                done.append((future, value))
+                notify = notify or intent_notify
+            except Exception as e:
+                conn.execute('ROLLBACK TO intent')
+                conn.execute('RELEASE intent')
+                future.set_exception(e)
+        conn.execute('COMMIT')
+        return done, notify
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+"""
+🧪 OpenAI 호환 로컬 가짜 서버 - 네트워크 / 유료 API 없이 AI 기능 테스트 / 벤치마크
+
+사용 방법:
+  python fake_openai.py
+  python fake_openai.py --port 8765 --latency 1.5 --chunk-delay 0.05
+  python fake_openai.py --responses fake_responses.json --error-rate 0.2 --error-status 503
+  python fake_openai.py --fail-first 2 --disconnect-rate 0.3
+
+트래커의 .env 에 아래를 넣으면 모든 AI 요청이 이 서버로 갑니다 (키는 아무 값이나).
+  OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+  OPENAI_API_KEY=test
+
+POST /v1/chat/completions (stream 포함) 와 GET /v1/models 만 흉내 냅니다.
+응답 파일은 [{"match": "프롬프트에 들어 있는 글자", "response": "답변"}, ...] 형식의
+JSON 이고, 위에서부터 처음 맞는 항목을 씁니다 (response 가 객체면 JSON 문자열로).
+맞는 항목이 없으면 프롬프트 길이를 알려주는 기본 답변을 돌려줍니다
+(response_format 이 json_object 면 피드백 JSON 형식으로).
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from prompt_builder import count_tokens
+
+DEFAULT_RESPONSE = ('🧪 가짜 서버 응답입니다. (프롬프트 {chars}자, 약 {tokens}토큰)\n\n'
+                    '**오늘의 성과**\n- 계획한 업무를 꾸준히 진행했습니다.\n\n'
+                    '**개선 제안**\n- 집중이 잘 되는 시간대에 중요한 업무를 배치해보세요.')
+# response_format 이 json_object 인 요청의 기본 답변 (feedback_schema 형식)
+DEFAULT_JSON_RESPONSE = {
+    'summary': '🧪 가짜 서버 응답입니다. (프롬프트 {chars}자, 약 {tokens}토큰)',
+    'insights': [{'category': '패턴', 'text': '계획한 업무를 꾸준히 진행했습니다.'}],
+    'recommendations': [{'priority': 'high', 'text': '집중이 잘 되는 시간대에 중요한 업무를 배치해보세요.'},
+                        {'priority': 'low', 'text': '짧은 휴식을 규칙적으로 가져보세요.'}],
+    'message': '내일도 화이팅!',
+}
+
+
+def load_responses(path):
+    """📄 응답 파일 -> [(match, response)]"""
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = json.load(f)
+    return [(rule.get('match', ''), rule['response']) for rule in rules]
+
+
+def split_chunks(text):
+    """🌊 스트리밍 조각 - 단어와 뒤따르는 공백 단위"""
+    return re.findall(r'\S+\s*|\s+', text)
+
+
+class FakeOpenAIServer:
+    """🧪 스레드에서 도는 OpenAI 호환 HTTP 서버 (스크립트 / 벤치마크에서 직접 띄울 수도 있음)
+
+    latency: 첫 바이트까지 지연(초), jitter: 지연에 더할 0~jitter 초 무작위 값
+    chunk_delay: 스트리밍 조각 사이 지연(초)
+    error_rate / error_status: 이 확률로 오류 응답 (429, 500, 503 등)
+    fail_first: 처음 N 번 요청은 무조건 오류 (재시도 테스트용)
+    disconnect_rate: 스트리밍 도중 (절반쯤에서) 연결을 끊을 확률
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, responses=(), latency=0.0, jitter=0.0,
+                 chunk_delay=0.02, error_rate=0.0, error_status=503, fail_first=0,
+                 disconnect_rate=0.0, seed=None):
+        self.responses = list(responses)
+        self.latency = latency
+        self.jitter = jitter
+        self.chunk_delay = chunk_delay
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.fail_first = fail_first
+        self.disconnect_rate = disconnect_rate
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def respond_to(self, prompt, json_mode=False):
+        for match, response in self.responses:
+            if match in prompt:
+                return response if isinstance(response, str) else json.dumps(response, ensure_ascii=False)
+        if json_mode:
+            body = dict(DEFAULT_JSON_RESPONSE)
+            body['summary'] = body['summary'].format(chars=len(prompt), tokens=count_tokens(prompt))
+            return json.dumps(body, ensure_ascii=False, indent=1)
+        return DEFAULT_RESPONSE.format(chars=len(prompt), tokens=count_tokens(prompt))
+
+    def next_request(self):
+        """요청 번호와 이번 요청의 (오류 여부, 끊기 여부, 지연)"""
+        with self._lock:
+            self.request_count += 1
+            number = self.request_count
+            failed = number <= self.fail_first or self.random.random() < self.error_rate
+            disconnect = self.random.random() < self.disconnect_rate
+            delay = self.latency + self.random.random() * self.jitter
+        return number, failed, disconnect, delay
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                print(f'🧪 {self.address_string()} {format % args}')
+
+            def send_json(self, status, body):
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.rstrip('/') in ('/v1/models', '/models'):
+                    self.send_json(200, {'object': 'list', 'data': [
+                        {'id': 'gpt-3.5-turbo', 'object': 'model', 'owned_by': 'fake'}]})
+                else:
+                    self.send_json(404, {'error': {'message': 'not found', 'type': 'invalid_request_error'}})
+
+            def do_POST(self):
+                if self.path.rstrip('/') not in ('/v1/chat/completions', '/chat/completions'):
+                    self.send_json(404, {'error': {'message': 'not found', 'type': 'invalid_request_error'}})
+                    return
+                length = int(self.headers.get('Content-Length') or 0)
+                try:
+                    request = json.loads(self.rfile.read(length) or b'{}')
+                except ValueError:
+                    self.send_json(400, {'error': {'message': 'invalid JSON', 'type': 'invalid_request_error'}})
+                    return
+
+                number, failed, disconnect, delay = server.next_request()
+                time.sleep(delay)
+                if failed:
+                    self.send_json(server.error_status, {'error': {
+                        'message': f'injected error (request {number})',
+                        'type': 'rate_limit_error' if server.error_status == 429 else 'server_error'}})
+                    return
+
+                prompt = '\n'.join(str(m.get('content', '')) for m in request.get('messages', []))
+                json_mode = (request.get('response_format') or {}).get('type') == 'json_object'
+                text = server.respond_to(prompt, json_mode)
+                model = request.get('model', 'gpt-3.5-turbo')
+                usage = {'prompt_tokens': count_tokens(prompt), 'completion_tokens': count_tokens(text)}
+                usage['total_tokens'] = usage['prompt_tokens'] + usage['completion_tokens']
+                if request.get('stream'):
+                    include_usage = (request.get('stream_options') or {}).get('include_usage')
+                    self.stream(text, model, usage if include_usage else None, disconnect)
+                    return
+                self.send_json(200, {
+                    'id': f'chatcmpl-{uuid.uuid4().hex[:12]}',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': model,
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': text}}],
+                    'usage': usage,
+                })
+
+            def stream(self, text, model, usage, disconnect):
+                """🌊 SSE 로 조각 단위 전송 (disconnect 면 절반쯤에서 연결 끊기)
+
+                chunked 전송이라 중간에 끊으면 클라이언트는 불완전한 응답으로 오류를 낸다.
+                """
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                base = {'id': f'chatcmpl-{uuid.uuid4().hex[:12]}', 'object': 'chat.completion.chunk',
+                        'created': int(time.time()), 'model': model}
+
+                def write(data):
+                    self.wfile.write(f'{len(data):x}\r\n'.encode('ascii') + data + b'\r\n')
+                    self.wfile.flush()
+
+                def send(body):
+                    write(f'data: {json.dumps(body, ensure_ascii=False)}\n\n'.encode('utf-8'))
+
+                chunks = split_chunks(text)
+                cut = len(chunks) // 2 if disconnect else None
+                try:
+                    send(dict(base, choices=[{'index': 0, 'delta': {'role': 'assistant', 'content': ''},
+                                              'finish_reason': None}]))
+                    for i, chunk in enumerate(chunks):
+                        if i == cut:
+                            self.close_connection = True
+                            return
+                        send(dict(base, choices=[{'index': 0, 'delta': {'content': chunk},
+                                                  'finish_reason': None}]))
+                        time.sleep(server.chunk_delay)
+                    send(dict(base, choices=[{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]))
+                    if usage:
+                        send(dict(base, choices=[], usage=usage))
+                    write(b'data: [DONE]\n\n')
+                    self.wfile.write(b'0\r\n\r\n')
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트가 취소하고 연결을 닫음
+                    self.close_connection = True
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='🧪 OpenAI 호환 로컬 가짜 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--responses', help='응답 JSON 파일 ([{"match": ..., "response": ...}])')
+    parser.add_argument('--latency', type=float, default=0.0, help='첫 바이트까지 지연 (초)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='지연에 더할 무작위 값 최대 (초)')
+    parser.add_argument('--chunk-delay', type=float, default=0.02, help='스트리밍 조각 사이 지연 (초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='오류 응답 확률 (0~1)')
+    parser.add_argument('--error-status', type=int, default=503, help='오류 응답 상태 코드')
+    parser.add_argument('--fail-first', type=int, default=0, help='처음 N 번 요청은 오류')
+    parser.add_argument('--disconnect-rate', type=float, default=0.0,
+                        help='스트리밍 도중 연결을 끊을 확률 (0~1)')
+    parser.add_argument('--seed', type=int, help='오류 / 지연 난수 시드 (재현용)')
+    args = parser.parse_args(argv)
+
+    try:
+        responses = load_responses(args.responses) if args.responses else ()
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f'응답 파일을 읽을 수 없습니다: {e}')
+
+    server = FakeOpenAIServer(args.host, args.port, responses, args.latency, args.jitter,
+                              args.chunk_delay, args.error_rate, args.error_status,
+                              args.fail_first, args.disconnect_rate, args.seed)
+    print(f'🧪 가짜 OpenAI 서버 실행 중: {server.url} (Ctrl+C 로 종료)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
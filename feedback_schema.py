@@ -0,0 +1,224 @@
+# 🧩 AI 피드백 구조화 출력 - JSON 형식 요청, 검증, 창에 보여줄 텍스트 (스트리밍 중에도)
+import json
+import re
+from typing import NamedTuple, Optional, Tuple
+
+# 프롬프트 끝에 붙이는 출력 형식 지시
+JSON_INSTRUCTIONS = """
+반드시 아래 형식의 JSON 객체 하나로만 답변해주세요 (코드 블록이나 다른 글 없이).
+{
+  "summary": "전체 평가 2~3문장",
+  "insights": [{"category": "성과|시간 관리|집중력|패턴|기타", "text": "데이터에서 발견한 점"}],
+  "recommendations": [{"priority": "high|medium|low", "text": "구체적이고 실행 가능한 제안"}],
+  "message": "격려 한마디"
+}
+insights 와 recommendations 는 각각 2~5개로 작성하고, 각 text 는 한두 문장으로 써주세요.
+"""
+
+MAX_ITEMS = 8
+PRIORITIES = ('high', 'medium', 'low')
+PRIORITY_LABELS = {'high': '🔴 높음', 'medium': '🟡 보통', 'low': '🟢 낮음'}
+_PRIORITY_ALIASES = {'높음': 'high', '보통': 'medium', '중간': 'medium', '낮음': 'low'}
+# 스트리밍 중 쓰는 도중이어도 보여줄 문자열 값의 키
+_STREAMED_KEYS = ('summary', 'text', 'message')
+
+
+class Insight(NamedTuple):
+    category: str
+    text: str
+
+
+class Recommendation(NamedTuple):
+    priority: str  # high, medium, low
+    text: str
+
+
+class Feedback(NamedTuple):
+    summary: str
+    insights: Tuple[Insight, ...]
+    recommendations: Tuple[Recommendation, ...]
+    message: str
+
+    @property
+    def text(self):
+        """창 / content 컬럼에 넣는 텍스트"""
+        return render(self._asdict())
+
+
+class FeedbackFormatError(ValueError):
+    """AI 응답이 약속한 JSON 형식이 아님"""
+
+
+def normalize_priority(value):
+    value = str(value).strip().lower()
+    value = _PRIORITY_ALIASES.get(value, value)
+    return value if value in PRIORITIES else 'medium'
+
+
+def _text(value):
+    return value.strip() if isinstance(value, str) else ''
+
+
+def parse_feedback(raw) -> Feedback:
+    """✅ AI 응답 문자열 -> Feedback (형식이 틀리면 FeedbackFormatError)
+
+    코드 블록으로 감싸져 있어도 첫 { 부터 마지막 } 까지를 읽는다.
+    빈 항목은 버리고 항목 수는 MAX_ITEMS 개까지, 알 수 없는 우선순위는 medium.
+    """
+    start, end = (raw or '').find('{'), (raw or '').rfind('}')
+    if start < 0 or end < start:
+        raise FeedbackFormatError('JSON 객체가 없습니다')
+    try:
+        data = json.loads(raw[start:end + 1])
+    except ValueError as e:
+        raise FeedbackFormatError(f'JSON 해석 실패: {e}') from None
+    if not isinstance(data, dict):
+        raise FeedbackFormatError('최상위 값이 객체가 아닙니다')
+
+    def items(key):
+        value = data.get(key) or []
+        if not isinstance(value, list):
+            raise FeedbackFormatError(f'{key} 가 목록이 아닙니다')
+        return [item for item in value if isinstance(item, dict) and _text(item.get('text'))]
+
+    insights = tuple(Insight(_text(item.get('category')) or '기타', _text(item['text']))
+                     for item in items('insights')[:MAX_ITEMS])
+    recommendations = tuple(Recommendation(normalize_priority(item.get('priority')), _text(item['text']))
+                            for item in items('recommendations')[:MAX_ITEMS])
+    summary = _text(data.get('summary'))
+    if not summary and not insights and not recommendations:
+        raise FeedbackFormatError('summary / insights / recommendations 가 모두 비어 있습니다')
+    return Feedback(summary, insights, recommendations, _text(data.get('message')))
+
+
+def render(data):
+    """📝 (중간까지 받은) 피드백 dict -> 보여줄 텍스트
+
+    항목은 category / priority 와 text 가 모두 있을 때만 그린다. 받는 도중에도
+    앞부분은 바뀌지 않고 뒤에 덧붙기만 하도록 (스트리밍 출력이 되돌려지지 않도록).
+    """
+    parts = []
+    summary = _text(data.get('summary'))
+    if summary:
+        parts.append(f'📋 요약\n{summary}')
+    insights = [item for item in data.get('insights') or ()
+                if _fields(item, 'category') and _text(_fields(item, 'text'))]
+    if insights:
+        parts.append('💡 인사이트\n' + '\n'.join(
+            f"- [{_text(_fields(item, 'category'))}] {_text(_fields(item, 'text'))}" for item in insights))
+    recommendations = [item for item in data.get('recommendations') or ()
+                       if _fields(item, 'priority') and _text(_fields(item, 'text'))]
+    if recommendations:
+        parts.append('🎯 추천\n' + '\n'.join(
+            f"- {PRIORITY_LABELS[normalize_priority(_fields(item, 'priority'))]} {_text(_fields(item, 'text'))}"
+            for item in recommendations))
+    message = _text(data.get('message'))
+    if message:
+        parts.append(f'💬 {message}')
+    return '\n\n'.join(parts)
+
+
+def _fields(item, name):
+    """dict 항목과 NamedTuple 항목 모두에서 필드 읽기"""
+    if isinstance(item, dict):
+        return item.get(name)
+    return getattr(item, name, None)
+
+
+def partial_json(raw) -> Optional[dict]:
+    """🌊 스트리밍 도중의 JSON 앞부분을 닫아서 dict 로 (아직 읽을 수 없으면 None)
+
+    summary / text / message 값은 쓰는 도중인 문자열도 닫아서 포함하고,
+    그 밖의 키나 값은 다 받은 것만 포함한다.
+    """
+    start = raw.find('{')
+    if start < 0:
+        return None
+    raw = raw[start:]
+    # 스택 항목: [괄호, 키를 기다리는 중인지, 마지막 키]
+    stack = []
+    safe, safe_stack = 0, ()
+    in_string = escaped = False
+    string_start, string_is_key = 0, False
+
+    def snapshot():
+        return tuple(level[0] for level in stack)
+
+    for i, ch in enumerate(raw):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+                if string_is_key:
+                    try:
+                        stack[-1][2] = json.loads(raw[string_start:i + 1])
+                    except ValueError:
+                        return None
+                else:
+                    safe, safe_stack = i + 1, snapshot()
+            continue
+        if ch == '"':
+            in_string = True
+            string_start = i
+            string_is_key = bool(stack) and stack[-1][0] == '{' and stack[-1][1]
+        elif ch in '{[':
+            stack.append([ch, ch == '{', None])
+            safe, safe_stack = i + 1, snapshot()
+        elif ch in '}]':
+            if not stack:
+                return None
+            stack.pop()
+            safe, safe_stack = i + 1, snapshot()
+            if not stack:
+                break
+        elif ch == ':':
+            if stack and stack[-1][0] == '{':
+                stack[-1][1] = False
+        elif ch == ',':
+            if stack and stack[-1][0] == '{':
+                stack[-1][1] = True
+            # 숫자 / true / false / null 값은 쉼표에서 끝난다
+            if raw[safe:i].strip():
+                safe, safe_stack = i, snapshot()
+
+    if in_string and not string_is_key and stack and stack[-1][0] == '{' and stack[-1][2] in _STREAMED_KEYS:
+        # 쓰는 도중인 문자열: 끝에 걸친 이스케이프는 떼고 닫기
+        text = raw[:-1] if escaped else re.sub(r'\\u[0-9a-fA-F]{0,3}$', '', raw)
+        candidate = text + '"' + _closers(snapshot())
+    else:
+        candidate = raw[:safe].rstrip().rstrip(',') + _closers(safe_stack)
+    try:
+        data = json.loads(candidate)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _closers(brackets):
+    return ''.join('}' if bracket == '{' else ']' for bracket in reversed(brackets))
+
+
+class FeedbackStream:
+    """🌊 JSON 조각을 받아 보여줄 텍스트 조각으로 바꿔 inner(TokenStream) 에 넘기는 어댑터
+
+    LLMClient.complete(stream=...) 에 그대로 넘길 수 있다. 앞부분이 바뀌는 경우
+    (예: 항목 순서가 약속과 다름) 에는 더 넘기지 않고, 최종 결과로 맞춘다.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.raw = ''
+        self.shown = ''
+
+    def append(self, text):
+        self.raw += text
+        data = partial_json(self.raw)
+        if data is None:
+            return
+        rendered = render(data)
+        if rendered.startswith(self.shown) and len(rendered) > len(self.shown):
+            self.inner.append(rendered[len(self.shown):])
+            self.shown = rendered
@@ -0,0 +1,136 @@
+# 🔮 로컬 생산성 예측 - 요일 효과 + 추세 회귀 (NumPy, 네트워크 없음)
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+WEEKDAYS_KO = ('월', '화', '수', '목', '금', '토', '일')
+
+# 최근 기록일수록 가중치를 크게 (반감기 일 수)
+HALF_LIFE_DAYS = 28
+# 요일 / 추세 계수를 0 쪽으로 당기는 정도 (데이터가 적을 때 과적합 방지)
+RIDGE = 1.0
+# 예측에 필요한 최소 기록일 수
+MIN_DAYS = 3
+# 95% 신뢰구간
+Z = 1.96
+
+
+class Band(NamedTuple):
+    expected: float
+    low: float
+    high: float
+
+
+class Forecast(NamedTuple):
+    date: str
+    weekday: str
+    focus: Optional[Band]  # 집중도 (0~5). 평가 기록이 부족하면 None
+    minutes: Band
+    tasks: Band
+    focus_trend_per_week: float  # 집중도 추세 (주당 변화량)
+    best_hours: Tuple[int, ...]  # 평균 집중도가 높은 시작 시각 (높은 순)
+    data_points: int
+
+
+def _design(week_index, weekday):
+    """[절편, 추세(주), 요일 더미 7개]"""
+    X = np.zeros((len(week_index), 9))
+    X[:, 0] = 1.0
+    X[:, 1] = week_index
+    X[np.arange(len(week_index)), 2 + weekday] = 1.0
+    return X
+
+
+def _fit_predict(X, y, w, x0, lower=0.0, upper=None):
+    """가중 ridge 최소제곱으로 x0 에서의 (예측, 하한, 상한) + 계수"""
+    penalty = np.full(X.shape[1], RIDGE)
+    penalty[0] = 0.0  # 절편은 규제하지 않음
+    Xw = X * w[:, None]
+    A = X.T @ Xw + np.diag(penalty)
+    A_inv = np.linalg.pinv(A)
+    beta = A_inv @ (Xw.T @ y)
+
+    residual = y - X @ beta
+    dof = max(w.sum() - np.trace(X @ A_inv @ Xw.T), 1.0)
+    sigma = np.sqrt((w * residual ** 2).sum() / dof)
+    expected = float(x0 @ beta)
+    spread = Z * sigma * np.sqrt(1.0 + x0 @ A_inv @ x0)
+    clip = (lambda v: float(np.clip(v, lower, upper))) if upper is not None else \
+        (lambda v: float(max(v, lower)))
+    return Band(clip(expected), clip(expected - spread), clip(expected + spread)), beta
+
+
+def forecast_day(history, hours=(), target=None) -> Optional[Forecast]:
+    """🔮 일일 집계로 target 날짜(기본 내일)의 집중도 / 작업시간 / 완료 업무 수 예측
+
+    history: DayHistory(date, total_work_minutes, completed_tasks, avg_focus_rating) 목록
+    hours: HourFocus(hour, avg_focus, total_minutes, task_count) 목록 (최적 시간대용)
+    기록일이 MIN_DAYS 보다 적으면 None.
+    """
+    rows = [row for row in history if row.completed_tasks]
+    if len(rows) < MIN_DAYS:
+        return None
+    target = target or datetime.now() + timedelta(days=1)
+
+    dates = np.array([np.datetime64(row.date, 'D') for row in rows])
+    target_day = np.datetime64(target.strftime('%Y-%m-%d'), 'D')
+    last = dates.max()
+    week_index = (dates - last).astype(float) / 7  # 마지막 기록일 = 0
+    weekday = ((dates.astype('int64') + 3) % 7).astype(int)  # 1970-01-01 은 목요일
+    age = (target_day - dates).astype(float)
+    w = 0.5 ** (age / HALF_LIFE_DAYS)
+
+    X = _design(week_index, weekday)
+    x0 = _design(np.array([(target_day - last).astype(float) / 7]),
+                 np.array([target.weekday()]))[0]
+
+    minutes = np.array([row.total_work_minutes or 0 for row in rows], dtype=float)
+    tasks = np.array([row.completed_tasks or 0 for row in rows], dtype=float)
+    minutes_band, _ = _fit_predict(X, minutes, w, x0)
+    tasks_band, _ = _fit_predict(X, tasks, w, x0)
+
+    focus = np.array([row.avg_focus_rating or 0 for row in rows], dtype=float)
+    rated = focus > 0
+    focus_band, trend = None, 0.0
+    if rated.sum() >= MIN_DAYS:
+        focus_band, beta = _fit_predict(X[rated], focus[rated], w[rated], x0, 0.0, 5.0)
+        trend = float(beta[1])
+
+    ranked = sorted((row for row in hours if row.avg_focus is not None and row.task_count >= 2),
+                    key=lambda row: -row.avg_focus)
+    return Forecast(
+        date=target.strftime('%Y-%m-%d'),
+        weekday=WEEKDAYS_KO[target.weekday()],
+        focus=focus_band,
+        minutes=minutes_band,
+        tasks=tasks_band,
+        focus_trend_per_week=trend,
+        best_hours=tuple(row.hour for row in ranked[:3]),
+        data_points=len(rows)
+    )
+
+
+def format_forecast(forecast: Forecast) -> str:
+    """📈 예측 결과를 예측 창에 보여줄 텍스트로"""
+    lines = [f'📈 {forecast.date} ({forecast.weekday}) 생산성 예측', '']
+    if forecast.focus:
+        f = forecast.focus
+        lines.append(f'💯 예상 집중도: {f.expected:.1f}/5.0  (95% 범위 {f.low:.1f} ~ {f.high:.1f})')
+    else:
+        lines.append('💯 예상 집중도: 평가 기록이 부족합니다')
+    m = forecast.minutes
+    lines.append(f'⏱️ 예상 작업시간: {m.expected / 60:.1f}시간  '
+                 f'(범위 {m.low / 60:.1f} ~ {m.high / 60:.1f}시간)')
+    t = forecast.tasks
+    lines.append(f'✅ 완료 가능 업무수: {t.expected:.0f}개  (범위 {t.low:.0f} ~ {t.high:.0f}개)')
+    lines.append('')
+    trend = forecast.focus_trend_per_week
+    direction = '상승' if trend > 0.05 else '하락' if trend < -0.05 else '안정'
+    lines.append(f'📊 집중도 추세: {direction} (주당 {trend:+.2f})')
+    if forecast.best_hours:
+        hours = ', '.join(f'{hour}시' for hour in forecast.best_hours)
+        lines.append(f'🌟 집중이 잘 되는 시간대: {hours}')
+    lines.append('')
+    lines.append(f'최근 {forecast.data_points}일의 기록으로 요일별 패턴과 추세를 반영해 계산했습니다.')
+    return '\n'.join(lines)
@@ -0,0 +1,160 @@
+# ⚡ 오늘의 KPI 를 쿼리 없이 보여주기 위한 메모리 집계
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+# 연속 기록(streak)을 복원할 때 거슬러 올라가는 최대 일 수
+STREAK_LOOKBACK_DAYS = 365
+
+
+class LiveKpis(NamedTuple):
+    date: str
+    started_tasks: int
+    completed_tasks: int
+    total_minutes: int
+    pomodoros: int
+    avg_focus: Optional[float]  # 오늘 평균
+    ewma_focus: Optional[float]  # 최근 작업에 가중치를 둔 이동 평균 (날짜를 넘어 이어짐)
+    streak_days: int  # 오늘 또는 어제까지 하루도 빠짐없이 완료한 날 수
+    golden_hour: Optional[int]  # 오늘 평균 집중도가 가장 높은 시작 시각
+
+
+class LiveMetrics:
+    """⚡ 시작 / 완료 / 뽀모도로 이벤트마다 O(1) 로 갱신되는 오늘의 지표
+
+    시작할 때 한 번 rehydrate() 로 DB 집계에서 값을 채우고 나면, 이후에는
+    이벤트만으로 갱신되므로 메인 창은 매초 kpis() 를 읽어도 DB를 건드리지 않는다.
+    Tk 메인 스레드에서만 호출한다고 가정한다 (잠금 없음).
+    """
+
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self.ewma_focus = None
+        self.streak_days = 0
+        self.last_active_date = None  # 마지막으로 업무를 완료한 날 'YYYY-MM-DD'
+        self._reset_day(datetime.now().strftime('%Y-%m-%d'))
+
+    def _reset_day(self, date):
+        self.date = date
+        self.started_tasks = 0
+        self.completed_tasks = 0
+        self.total_minutes = 0
+        self.pomodoros = 0
+        self.focus_sum = 0
+        self.focus_count = 0
+        self.hour_minutes = [0] * 24
+        self.hour_focus_sum = [0] * 24
+        self.hour_focus_count = [0] * 24
+
+    def _roll(self, now=None):
+        """자정을 넘겼으면 하루 누적값만 초기화 (EWMA / streak 은 유지)"""
+        today = (now or datetime.now()).strftime('%Y-%m-%d')
+        if today != self.date:
+            self._reset_day(today)
+        return today
+
+    # ------------------------------------------------------------------
+    # 이벤트
+    # ------------------------------------------------------------------
+    def on_task_start(self, now=None):
+        self._roll(now)
+        self.started_tasks += 1
+
+    def on_pomodoro(self, now=None):
+        self._roll(now)
+        self.pomodoros += 1
+
+    def on_task_complete(self, minutes, focus_rating=None, start_hour=None, now=None):
+        today = self._roll(now)
+        self.completed_tasks += 1
+        self.total_minutes += minutes or 0
+        if start_hour is not None:
+            self.hour_minutes[start_hour] += minutes or 0
+        if focus_rating:
+            self.focus_sum += focus_rating
+            self.focus_count += 1
+            self._update_ewma(focus_rating)
+            if start_hour is not None:
+                self.hour_focus_sum[start_hour] += focus_rating
+                self.hour_focus_count[start_hour] += 1
+        self._mark_active(today)
+
+    def _update_ewma(self, value):
+        if self.ewma_focus is None:
+            self.ewma_focus = float(value)
+        else:
+            self.ewma_focus += self.alpha * (value - self.ewma_focus)
+
+    def _mark_active(self, date):
+        if self.last_active_date == date:
+            return
+        yesterday = (datetime.strptime(date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+        self.streak_days = self.streak_days + 1 if self.last_active_date == yesterday else 1
+        self.last_active_date = date
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def current_streak(self, now=None):
+        """어제까지 이어진 기록은 오늘 아직 완료가 없어도 유지, 그 이전이면 끊김"""
+        if not self.last_active_date:
+            return 0
+        today = now or datetime.now()
+        yesterday = (today - timedelta(days=1)).strftime('%Y-%m-%d')
+        if self.last_active_date < yesterday:
+            return 0
+        return self.streak_days
+
+    def golden_hour(self):
+        best = None
+        for hour in range(24):
+            count = self.hour_focus_count[hour]
+            if count and (best is None or self.hour_focus_sum[hour] / count >
+                          self.hour_focus_sum[best] / self.hour_focus_count[best]):
+                best = hour
+        return best
+
+    def kpis(self, now=None) -> LiveKpis:
+        self._roll(now)
+        return LiveKpis(
+            date=self.date,
+            started_tasks=self.started_tasks,
+            completed_tasks=self.completed_tasks,
+            total_minutes=self.total_minutes,
+            pomodoros=self.pomodoros,
+            avg_focus=self.focus_sum / self.focus_count if self.focus_count else None,
+            ewma_focus=self.ewma_focus,
+            streak_days=self.current_streak(now),
+            golden_hour=self.golden_hour()
+        )
+
+    # ------------------------------------------------------------------
+    # 시작 시 복원
+    # ------------------------------------------------------------------
+    def rehydrate(self, repo, now=None):
+        """📚 일일 집계 + 오늘 완료한 업무로 누적값 / EWMA / streak 복원
+
+        daily_stats 는 핫 DB만 읽으므로 streak 은 아카이브되지 않은 최근 기간 안에서만 센다.
+        """
+        now = now or datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        self.ewma_focus = None
+        self.streak_days = 0
+        self.last_active_date = None
+        self._reset_day(today)
+
+        history = sorted(repo.get_recent_daily_stats(STREAK_LOOKBACK_DAYS))
+        # 지난 날들은 하루 평균으로 EWMA 를 데우고, 완료가 있었던 날로 streak 계산
+        for day in history:
+            if day.date >= today or not day.completed_tasks:
+                continue
+            if day.avg_focus_rating:
+                self._update_ewma(day.avg_focus_rating)
+            self._mark_active(day.date)
+
+        stats = repo.get_daily_stats(today)
+        for task in repo.get_done_tasks(today):
+            start_hour = int(task.start_time[:2]) if task.start_time else None
+            self.on_task_complete(task.duration_minutes, task.focus_rating, start_hour, now)
+            self.pomodoros += task.pomodoro_count or 0
+        self.started_tasks = max(stats.total_tasks if stats else 0, self.completed_tasks)
+        return self
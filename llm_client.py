@@ -0,0 +1,166 @@
+# 🤖 OpenAI Chat Completions 호출을 한곳에 - 연결 풀 재사용, 타임아웃 / 재시도, 사용량 기록
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError
+from typing import NamedTuple, Optional
+
+import httpx
+import openai
+from openai import OpenAI
+
+# 다시 시도할 만한 오류 (네트워크, 시간 초과, 요청 한도, 서버 오류)
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,  # APITimeoutError 포함
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class CallRecord(NamedTuple):
+    operation: str
+    model: str
+    started_at: float  # time.time()
+    latency: float  # 초 (재시도 포함 전체)
+    first_token: Optional[float]  # 스트리밍일 때 첫 조각까지 걸린 초
+    prompt_tokens: int
+    completion_tokens: int
+    attempts: int
+    ok: bool
+
+
+class LLMClient:
+    """🤖 앱 전체에서 하나만 만들어 쓰는 OpenAI 클라이언트
+
+    httpx 연결 풀을 유지해서 매 요청마다 TLS 연결을 새로 맺지 않는다. 재시도는
+    SDK 대신 여기서 지수 백오프(+지터)로 하고, 스트리밍은 첫 조각을 받은 뒤에는
+    다시 시도하지 않는다 (이미 보여준 글이 중복되지 않도록).
+    호출마다 CallRecord 를 남기고 on_call(record) 를 부른다 (워커 스레드에서).
+    """
+
+    def __init__(self, api_key, model='gpt-3.5-turbo', base_url=None, timeout=60.0,
+                 connect_timeout=5.0, max_retries=3, backoff=0.5, max_connections=4,
+                 on_call=None, history=200):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_connections = max_connections
+        self.on_call = on_call
+        self.records = deque(maxlen=history)
+        self._client = None
+        self._lock = threading.Lock()
+
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                http_client = httpx.Client(
+                    limits=httpx.Limits(max_connections=self.max_connections,
+                                        max_keepalive_connections=self.max_connections),
+                    timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                )
+                self._client = OpenAI(api_key=self.api_key, base_url=self.base_url,
+                                      http_client=http_client, max_retries=0)
+            return self._client
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    def complete(self, prompt, max_tokens, temperature=0.7, operation='', stream=None,
+                 cancel=None, json_mode=False):
+        """💬 prompt 하나로 응답 텍스트 받기
+
+        stream(TokenStream) 이 있으면 스트리밍으로 받아 조각마다 stream 에 붙인다.
+        cancel(threading.Event) 이 세워지면 CancelledError.
+        json_mode 면 JSON 객체로만 답하도록 요청한다 (프롬프트에도 JSON 이라는 말이 있어야 함).
+        """
+        messages = [{"role": "user", "content": prompt}]
+        options = {'response_format': {'type': 'json_object'}} if json_mode else {}
+        started_at, start = time.time(), time.monotonic()
+        usage = {'prompt_tokens': 0, 'completion_tokens': 0, 'first_token': None}
+        attempt, ok = 0, False
+        try:
+            while True:
+                attempt += 1
+                emitted = []
+                try:
+                    if stream is None:
+                        text = self._complete(messages, max_tokens, temperature, usage, options)
+                    else:
+                        text = self._stream(messages, max_tokens, temperature, usage, stream,
+                                            cancel, emitted, start, options)
+                    ok = True
+                    return text
+                except RETRYABLE_ERRORS:
+                    if emitted or attempt > self.max_retries:
+                        raise
+                    delay = self.backoff * 2 ** (attempt - 1) * (1 + random.random())
+                    if cancel is not None:
+                        if cancel.wait(delay):
+                            raise CancelledError()
+                    else:
+                        time.sleep(delay)
+        finally:
+            self._record(CallRecord(operation, self.model, started_at, time.monotonic() - start,
+                                    usage['first_token'], usage['prompt_tokens'],
+                                    usage['completion_tokens'], attempt, ok))
+
+    def _complete(self, messages, max_tokens, temperature, usage, options):
+        response = self.client().chat.completions.create(
+            model=self.model, messages=messages, max_tokens=max_tokens, temperature=temperature,
+            **options
+        )
+        if response.usage:
+            usage['prompt_tokens'] = response.usage.prompt_tokens
+            usage['completion_tokens'] = response.usage.completion_tokens
+        return response.choices[0].message.content
+
+    def _stream(self, messages, max_tokens, temperature, usage, stream, cancel, emitted, start,
+                options):
+        response = self.client().chat.completions.create(
+            model=self.model, messages=messages, max_tokens=max_tokens, temperature=temperature,
+            stream=True, stream_options={'include_usage': True}, **options
+        )
+        try:
+            for chunk in response:
+                if cancel is not None and cancel.is_set():
+                    raise CancelledError()
+                if chunk.usage:
+                    # 마지막 조각에만 사용량이 온다 (choices 는 비어 있음)
+                    usage['prompt_tokens'] = chunk.usage.prompt_tokens
+                    usage['completion_tokens'] = chunk.usage.completion_tokens
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    if usage['first_token'] is None:
+                        usage['first_token'] = time.monotonic() - start
+                    emitted.append(delta)
+                    stream.append(delta)
+        finally:
+            response.close()
+        return ''.join(emitted)
+
+    def _record(self, record):
+        self.records.append(record)
+        if self.on_call:
+            try:
+                self.on_call(record)
+            except Exception as e:
+                print(f'LLM usage callback error: {e}')
+
+    def usage_summary(self):
+        """📈 기록된 호출의 작업별 (횟수, 실패, 평균 지연, 입력 토큰, 출력 토큰)"""
+        summary = {}
+        for record in list(self.records):
+            calls, failed, latency, prompt, completion = summary.get(record.operation, (0, 0, 0.0, 0, 0))
+            summary[record.operation] = (calls + 1, failed + (not record.ok), latency + record.latency,
+                                         prompt + record.prompt_tokens,
+                                         completion + record.completion_tokens)
+        return {op: (calls, failed, latency / calls, prompt, completion)
+                for op, (calls, failed, latency, prompt, completion) in summary.items()}
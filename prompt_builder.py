@@ -0,0 +1,108 @@
+# 📏 토큰 예산 안에서 AI 프롬프트 조립 - 덜 중요한 행은 합계로 접고, 긴 기간은 단계적으로 요약
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def _encoder(model):
+    """tiktoken 이 설치되어 있으면 모델 토크나이저, 없으면 None (추정치 사용)"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding('cl100k_base')
+    except KeyError:
+        return tiktoken.get_encoding('cl100k_base')
+
+
+def count_tokens(text, model=None):
+    """🔢 토큰 수. tiktoken 이 없으면 ASCII 4글자 = 1토큰, 한글 등은 1글자 = 1토큰으로 넉넉히 추정"""
+    encoder = _encoder(model)
+    if encoder is not None:
+        return len(encoder.encode(text))
+    ascii_chars = sum(1 for ch in text if ch < '\x80')
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def fit_rows(rows, render, collapse, budget, model=None):
+    """📋 rows(중요한 것부터 정렬) 를 한 줄씩 budget 토큰까지 넣고 나머지는 collapse(나머지) 한 줄로
+
+    collapse 줄이 들어갈 자리는 미리 남겨 두므로 결과는 항상 budget 안이다
+    (collapse 줄 하나도 못 들어갈 만큼 예산이 작을 때만 빼고).
+    """
+    rows = list(rows)
+    if not rows:
+        return []
+    lines = [render(row) for row in rows]
+    costs = [count_tokens(line + '\n', model) for line in lines]
+    if sum(costs) <= budget:
+        return lines
+    # 접은 줄 길이는 개수 / 합계 숫자 자릿수 정도만 달라지므로 전체를 접은 줄로 자리 예약
+    reserve = count_tokens(collapse(rows) + '\n', model)
+    kept, used = [], reserve
+    for line, cost in zip(lines, costs):
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return kept + [collapse(rows[len(kept):])]
+
+
+def _week_start(date_str):
+    day = datetime.strptime(date_str, '%Y-%m-%d')
+    return (day - timedelta(days=day.weekday())).strftime('%Y-%m-%d')
+
+
+def _merge(days, key):
+    """DayHistory 목록을 key(date) 별로 합치기 -> [(라벨, 기록일 수, 분, 완료, 평균 집중도)]"""
+    groups = {}
+    for day in days:
+        acc = groups.setdefault(key(day.date), [0, 0, 0, 0.0, 0])
+        acc[0] += 1
+        acc[1] += day.total_work_minutes or 0
+        acc[2] += day.completed_tasks or 0
+        if day.avg_focus_rating:
+            acc[3] += day.avg_focus_rating
+            acc[4] += 1
+    return [(label, n, minutes, done, focus_sum / rated if rated else None)
+            for label, (n, minutes, done, focus_sum, rated) in sorted(groups.items())]
+
+
+def _line(label, days, minutes, done, focus):
+    focus_text = f'{focus:.1f}/5' if focus is not None else '-'
+    span = f' ({days}일 기록)' if days > 1 else ''
+    return f'- {label}{span}: {minutes // 60}시간 {minutes % 60}분, 완료 {done}개, 집중도 {focus_text}'
+
+
+# 요약 단계: 하루 -> 주(월요일 시작) -> 달
+LEVELS = (
+    ('일별', lambda date: date),
+    ('주별', lambda date: f'{_week_start(date)} 주'),
+    ('월별', lambda date: date[:7]),
+)
+
+
+def summarize_days(days, budget, model=None):
+    """🗓️ 일일 요약(DayHistory) 을 budget 안에 들어가는 가장 자세한 단위로
+
+    하루 단위로 다 들어가면 그대로, 아니면 주 단위, 그래도 넘치면 달 단위로 합친다.
+    달 단위도 넘치면 최근 달부터 fit_rows 로 자르고 나머지는 합계 한 줄로 접는다.
+    """
+    days = sorted(days)
+    if not days:
+        return ''
+    for name, key in LEVELS:
+        lines = [_line(*row) for row in _merge(days, key)]
+        text = f'({name})\n' + '\n'.join(lines)
+        if count_tokens(text, model) <= budget:
+            return text
+
+    def collapse(rows):
+        minutes = sum(row[2] for row in rows)
+        done = sum(row[3] for row in rows)
+        return f'- 그 이전 {len(rows)}개월: {minutes // 60}시간, 완료 {done}개'
+
+    months = list(reversed(_merge(days, LEVELS[-1][1])))
+    lines = fit_rows(months, lambda row: _line(*row), collapse, budget - 4, model)
+    return '(월별)\n' + '\n'.join(lines)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+"""
+🗒️ 토스트 트래커 일일 / 주간 리포트 생성기 (GUI 없이 실행)
+
+사용 방법:
+  python reports.py --kind daily
+  python reports.py --kind weekly --start 2025-07-01 --end 2025-09-30
+  python reports.py --db alice/productivity_data.db --db bob/productivity_data.db --workers 4
+
+DB 파일 하나가 사용자 한 명입니다. 사용자 x 기간마다 HTML 한 장과 차트 PNG 를
+만들고, 렌더링은 프로세스 풀에 나눠서 처리합니다. 집계 데이터가 지난번과 같은
+리포트는 (해시 비교) 다시 그리지 않습니다.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import matplotlib
+matplotlib.use('Agg')  # 창 없이 렌더링 (charts 보다 먼저)
+
+from analytics import AnalyticsEngine
+from archive import ArchiveManager
+from repository import ProductivityRepository
+
+# 리포트 형식(HTML/차트)을 바꾸면 올려서 캐시를 무효화
+REPORT_VERSION = 2
+KINDS = ('daily', 'weekly')
+CACHE_FILE = '.report_cache.json'
+CHART_NAMES = ('heatmap', 'category', 'trend')
+
+# 워커 프로세스마다 한 번 만든 Figure 를 다음 리포트에 재사용
+_charts = None
+
+
+def user_name(db_path):
+    """'alice/productivity_data.db' -> 'alice', 'productivity_data.db' -> 'productivity_data'"""
+    folder = os.path.basename(os.path.dirname(os.path.normpath(db_path)))
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    return folder if stem == 'productivity_data' and folder else stem
+
+
+def report_periods(kind, start, end):
+    """(라벨, 시작일, 종료일) 목록. 주간은 start~end 와 겹치는 월요일 시작 주"""
+    first = datetime.strptime(start, '%Y-%m-%d')
+    last = datetime.strptime(end, '%Y-%m-%d')
+    if kind == 'weekly':
+        first -= timedelta(days=first.weekday())
+        step = timedelta(days=7)
+        span = timedelta(days=6)
+    else:
+        step = timedelta(days=1)
+        span = timedelta(0)
+    periods = []
+    day = first
+    while day <= last:
+        label = day.strftime('%G-W%V') if kind == 'weekly' else day.strftime('%Y-%m-%d')
+        periods.append((label, day.strftime('%Y-%m-%d'), (day + span).strftime('%Y-%m-%d')))
+        day += step
+    return periods
+
+
+def collect_report_data(repo, engine, start, end):
+    """리포트 한 장에 필요한 집계 + 기간 중 저장된 AI 추천 (작고 pickle 가능한 값만)"""
+    snapshot = engine.snapshot(start=start, end=end)
+    tasks = repo.get_done_tasks(start) if start == end else ()
+    recommendations = repo.get_feedback_items('recommendation', start, end)
+    return snapshot, tuple(tasks), recommendations
+
+
+def data_hash(snapshot, tasks, recommendations=()):
+    """버전 필드를 뺀 집계 내용 + 리포트 형식 버전의 해시"""
+    payload = repr((REPORT_VERSION, snapshot._replace(version=None), tasks, recommendations))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_cache(user_dir):
+    try:
+        with open(os.path.join(user_dir, CACHE_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(user_dir, cache):
+    path = os.path.join(user_dir, CACHE_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+# ----------------------------------------------------------------------
+# 워커 프로세스에서 실행되는 렌더링
+# ----------------------------------------------------------------------
+def render_report(user, kind, label, snapshot, tasks, recommendations, out_dir):
+    """📝 차트 PNG + HTML 쓰기. 쓴 HTML 경로 반환"""
+    global _charts
+    import charts
+    if _charts is None:
+        _charts = {
+            'heatmap': charts.FocusHeatmapChart(),
+            'category': charts.CategoryPieChart(),
+            'trend': charts.TrendChart(),
+        }
+
+    os.makedirs(out_dir, exist_ok=True)
+    images = {}
+    # Figure 만 재사용하고 PNG 는 매번 새로 그린다. 리포트 엔진에는 version_source 가 없어서
+    # 같은 기간이면 다른 사용자의 스냅샷도 버전이 같다 (변경 여부는 data_hash 로 이미 걸렀다)
+    chart_snapshot = snapshot._replace(version=None)
+    for name in CHART_NAMES:
+        png = _charts[name].render(chart_snapshot)
+        if png is None:
+            continue
+        filename = f'{label}_{name}.png'
+        with open(os.path.join(out_dir, filename), 'wb') as f:
+            f.write(png)
+        images[name] = filename
+
+    path = os.path.join(out_dir, f'{label}.html')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(report_html(user, kind, label, snapshot, tasks, recommendations, images))
+    return path
+
+
+def report_html(user, kind, label, snapshot, tasks, recommendations, images):
+    trend = snapshot.trend
+    total = sum(day.total_tasks for day in trend)
+    completed = sum(day.completed_tasks for day in trend)
+    rated = [day.avg_focus for day in trend if day.avg_focus]
+    minutes = sum(row.minutes for row in snapshot.categories)
+    golden = (f'{snapshot.golden.hour}:00 ({snapshot.golden.avg_focus:.2f})'
+              if snapshot.golden else '-')
+    kpis = [
+        ('Period', f'{snapshot.start} ~ {snapshot.end}'),
+        ('Completed tasks', f'{completed} / {total}'),
+        ('Work time', f'{minutes // 60}h {minutes % 60}m'),
+        ('Avg. focus', f'{sum(rated) / len(rated):.2f}' if rated else '-'),
+        ('Golden hour', golden),
+    ]
+    esc = html.escape
+    parts = [
+        '<!DOCTYPE html>',
+        '<html><head><meta charset="utf-8">',
+        f'<title>{esc(user)} - {kind} report {esc(label)}</title>',
+        '<style>body{font-family:Arial,sans-serif;margin:24px}'
+        'table{border-collapse:collapse}td,th{border:1px solid #ddd;padding:4px 10px}'
+        'img{max-width:100%;display:block;margin:12px 0}</style>',
+        '</head><body>',
+        f'<h1>🍞 {esc(user)} - {kind.capitalize()} Report {esc(label)}</h1>',
+        '<table>',
+    ]
+    parts.extend(f'<tr><th>{esc(k)}</th><td>{esc(v)}</td></tr>' for k, v in kpis)
+    parts.append('</table>')
+    if not images:
+        parts.append('<p>No data for this period.</p>')
+    for name in CHART_NAMES:
+        if name in images:
+            parts.append(f'<img src="{esc(images[name])}" alt="{name}">')
+    if tasks:
+        parts.append('<h2>Completed Tasks</h2><table>'
+                     '<tr><th>Task</th><th>Start</th><th>Minutes</th><th>Focus</th></tr>')
+        parts.extend(
+            f'<tr><td>{esc(t.task_name)}</td><td>{esc(t.start_time or "")}</td>'
+            f'<td>{t.duration_minutes or 0}</td><td>{t.focus_rating or "-"}</td></tr>'
+            for t in tasks
+        )
+        parts.append('</table>')
+    if recommendations:
+        parts.append('<h2>AI Recommendations</h2><table>'
+                     '<tr><th>Date</th><th>Priority</th><th>Recommendation</th></tr>')
+        parts.extend(
+            f'<tr><td>{esc(r.date)}</td><td>{esc(r.label or "")}</td><td>{esc(r.text)}</td></tr>'
+            for r in recommendations
+        )
+        parts.append('</table>')
+    parts.append(f'<p><small>Generated {datetime.now():%Y-%m-%d %H:%M}</small></p>')
+    parts.append('</body></html>')
+    return '\n'.join(parts)
+
+
+# ----------------------------------------------------------------------
+# 작업 나누기
+# ----------------------------------------------------------------------
+def generate_reports(db_paths, kind, start, end, out_dir, workers=None, force=False):
+    """📦 사용자 x 기간 리포트 생성. (생성 수, 건너뛴 수, 실패 수) 반환
+
+    집계는 부모 프로세스에서 SQLite 로 뽑고 (가볍다), 무거운 차트 렌더링만
+    워커 프로세스로 보낸다.
+    """
+    jobs = []  # (user_dir, 캐시 키, 해시, render_report 인자)
+    caches = {}
+    skipped = 0
+    for db_path in db_paths:
+        user = user_name(db_path)
+        user_dir = os.path.join(out_dir, user)
+        cache = caches[user_dir] = load_cache(user_dir)
+        repo = ProductivityRepository(db_path)
+        repo.init_schema()  # 이전 버전 DB면 집계 테이블 생성
+        archive = ArchiveManager(db_path, os.path.join(os.path.dirname(db_path), 'archive'))
+        engine = AnalyticsEngine(archive)
+        try:
+            for label, period_start, period_end in report_periods(kind, start, end):
+                snapshot, tasks, recommendations = collect_report_data(repo, engine, period_start,
+                                                                       period_end)
+                if not snapshot.hours and not snapshot.trend:
+                    continue
+                key = f'{kind}/{label}'
+                digest = data_hash(snapshot, tasks, recommendations)
+                target = os.path.join(user_dir, kind, f'{label}.html')
+                if not force and cache.get(key) == digest and os.path.exists(target):
+                    skipped += 1
+                    continue
+                jobs.append((user_dir, key, digest,
+                             (user, kind, label, snapshot, tasks, recommendations,
+                              os.path.join(user_dir, kind))))
+        finally:
+            repo.close()
+
+    written = failed = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(render_report, *args): (user_dir, key, digest)
+                       for user_dir, key, digest, args in jobs}
+            for future in as_completed(futures):
+                user_dir, key, digest = futures[future]
+                try:
+                    path = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f'❌ {key} ({user_dir}): {e}')
+                    continue
+                caches[user_dir][key] = digest
+                written += 1
+                print(f'📝 {path}')
+
+    for user_dir, cache in caches.items():
+        if cache:
+            os.makedirs(user_dir, exist_ok=True)
+            save_cache(user_dir, cache)
+    return written, skipped, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='🍞 토스트 트래커 일일/주간 리포트 생성')
+    parser.add_argument('--db', action='append', dest='dbs',
+                        help='SQLite DB 경로 (사용자마다 반복, 기본 productivity_data.db)')
+    parser.add_argument('--kind', choices=KINDS, default='daily')
+    parser.add_argument('--start', help='시작일 YYYY-MM-DD (기본: 종료일 6일 전)')
+    parser.add_argument('--end', help='종료일 YYYY-MM-DD (기본: 오늘)')
+    parser.add_argument('--out', default='reports', help='출력 폴더')
+    parser.add_argument('--workers', type=int, default=None, help='렌더링 프로세스 수')
+    parser.add_argument('--force', action='store_true', help='캐시를 무시하고 모두 다시 생성')
+    args = parser.parse_args(argv)
+
+    try:
+        end = args.end or datetime.now().strftime('%Y-%m-%d')
+        end_day = datetime.strptime(end, '%Y-%m-%d')
+        start = args.start or (end_day - timedelta(days=6)).strftime('%Y-%m-%d')
+        if datetime.strptime(start, '%Y-%m-%d') > end_day:
+            parser.error('시작일이 종료일보다 늦습니다')
+    except ValueError:
+        parser.error('날짜는 YYYY-MM-DD 형식이어야 합니다')
+
+    db_paths = args.dbs or ['productivity_data.db']
+    for db_path in db_paths:
+        if not os.path.exists(db_path):
+            parser.error(f'DB 파일이 없습니다: {db_path}')
+
+    written, skipped, failed = generate_reports(db_paths, args.kind, start, end, args.out,
+                                                args.workers, args.force)
+    print(f'🗒️ 생성 {written}개, 변경 없음 {skipped}개, 실패 {failed}개 -> {args.out}')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,723 @@
+# 📚 생산성 DB 접근을 한곳에 모은 저장소 모듈
+import json
+import sqlite3
+import threading
+from concurrent.futures import Future
+from functools import wraps
+from typing import NamedTuple, Optional, Tuple
+
+
+class DailyStats(NamedTuple):
+    total_tasks: int
+    completed_tasks: int
+    total_work_minutes: int
+    avg_focus_rating: float
+
+
+class Goal(NamedTuple):
+    target_work_hours: float
+    target_tasks: int
+    target_focus_avg: float
+    target_pomodoros: int
+
+
+class DoneTask(NamedTuple):
+    task_name: str
+    start_time: str
+    end_time: Optional[str]
+    duration_minutes: Optional[int]
+    focus_rating: Optional[int]
+    pomodoro_count: Optional[int]
+
+
+class DayHistory(NamedTuple):
+    date: str
+    total_work_minutes: int
+    completed_tasks: int
+    avg_focus_rating: float
+
+
+class TaskPattern(NamedTuple):
+    task_name: str
+    duration_minutes: Optional[int]
+    focus_rating: Optional[int]
+    start_time: str
+
+
+class FeedbackItem(NamedTuple):
+    date: str
+    feedback_type: str
+    label: str  # insight 는 category, recommendation 은 priority
+    text: str
+
+
+class ActiveSession(NamedTuple):
+    record_id: Optional[int]
+    page_id: Optional[str]
+    task_name: str
+    task_type: Optional[str]
+    task_time: Optional[str]
+    priority: Optional[str]
+    elapsed_seconds: int
+    pomodoro_mode: int
+    pomodoro_elapsed: Optional[int]
+    pomodoro_count: int
+    is_break_time: int
+
+
+SCHEMA = (
+    # 업무 기록 테이블
+    '''
+    CREATE TABLE IF NOT EXISTS task_records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        task_name TEXT NOT NULL,
+        category TEXT,
+        category_id INTEGER REFERENCES categories(id),
+        start_time TEXT NOT NULL,
+        end_time TEXT,
+        duration_minutes INTEGER,
+        status TEXT,
+        pomodoro_count INTEGER DEFAULT 0,
+        break_count INTEGER DEFAULT 0,
+        productivity_score REAL,
+        focus_rating INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    # 🗂️ 카테고리 (Notion Type) 정규화 테이블
+    '''
+    CREATE TABLE IF NOT EXISTS categories (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL
+    )
+    ''',
+    # 🗂️ 날짜 x 카테고리 일일 집계 (완료된 업무 기준)
+    '''
+    CREATE TABLE IF NOT EXISTS daily_category_stats (
+        date TEXT NOT NULL,
+        category_id INTEGER,
+        total_minutes INTEGER DEFAULT 0,
+        task_count INTEGER DEFAULT 0,
+        focus_sum INTEGER DEFAULT 0,
+        focus_count INTEGER DEFAULT 0,
+        PRIMARY KEY (date, category_id)
+    )
+    ''',
+    # 📅 주/월 단위 집계 (긴 기간 추이를 일일 행 없이 그리기 위한 것, 아카이브하지 않음)
+    '''
+    CREATE TABLE IF NOT EXISTS period_stats (
+        resolution TEXT NOT NULL,  -- week, month
+        period_start TEXT NOT NULL,  -- 주의 월요일 또는 달의 1일 (YYYY-MM-DD)
+        total_tasks INTEGER DEFAULT 0,
+        completed_tasks INTEGER DEFAULT 0,
+        total_work_minutes INTEGER DEFAULT 0,
+        focus_sum INTEGER DEFAULT 0,
+        focus_count INTEGER DEFAULT 0,
+        active_days INTEGER DEFAULT 0,
+        PRIMARY KEY (resolution, period_start)
+    )
+    ''',
+    # 일일 통계 테이블
+    '''
+    CREATE TABLE IF NOT EXISTS daily_stats (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT UNIQUE NOT NULL,
+        total_work_minutes INTEGER DEFAULT 0,
+        total_break_minutes INTEGER DEFAULT 0,
+        completed_tasks INTEGER DEFAULT 0,
+        total_tasks INTEGER DEFAULT 0,
+        avg_focus_rating REAL DEFAULT 0,
+        peak_productivity_hour INTEGER,
+        ai_feedback TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    # AI 피드백 테이블
+    '''
+    CREATE TABLE IF NOT EXISTS ai_feedback (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        feedback_type TEXT NOT NULL,  -- daily, weekly, monthly
+        content TEXT NOT NULL,
+        insights TEXT,  -- JSON 목록 (구조화 응답일 때)
+        recommendations TEXT,  -- JSON 목록 (구조화 응답일 때)
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    # AI 피드백의 인사이트 / 추천 항목 (기간별로 다시 조회할 수 있도록 한 행씩)
+    '''
+    CREATE TABLE IF NOT EXISTS ai_feedback_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        feedback_id INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        feedback_type TEXT NOT NULL,
+        kind TEXT NOT NULL,  -- insight, recommendation
+        label TEXT,  -- insight 는 category, recommendation 은 priority (high, medium, low)
+        position INTEGER NOT NULL,
+        text TEXT NOT NULL
+    )
+    ''',
+    # 🎯 목표 설정 테이블
+    '''
+    CREATE TABLE IF NOT EXISTS goals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        goal_type TEXT NOT NULL,  -- daily, weekly, monthly
+        date_range TEXT NOT NULL,  -- 2025-07-01 or 2025-W27 or 2025-07
+        target_work_hours REAL DEFAULT 0,
+        target_tasks INTEGER DEFAULT 0,
+        target_focus_avg REAL DEFAULT 0,
+        target_pomodoros INTEGER DEFAULT 0,
+        actual_work_hours REAL DEFAULT 0,
+        actual_tasks INTEGER DEFAULT 0,
+        actual_focus_avg REAL DEFAULT 0,
+        actual_pomodoros INTEGER DEFAULT 0,
+        achievement_rate REAL DEFAULT 0,
+        status TEXT DEFAULT 'active',  -- active, completed, failed
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    # 🔄 AI 일정 추천 테이블
+    '''
+    CREATE TABLE IF NOT EXISTS ai_schedule_suggestions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        suggested_order TEXT NOT NULL,  -- JSON format
+        reasoning TEXT,
+        user_accepted BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    # 💾 진행 중인 세션 체크포인트 (항상 최대 1행)
+    '''
+    CREATE TABLE IF NOT EXISTS active_session (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        record_id INTEGER,
+        page_id TEXT,
+        task_name TEXT NOT NULL,
+        task_type TEXT,
+        task_time TEXT,
+        priority TEXT,
+        elapsed_seconds INTEGER DEFAULT 0,
+        pomodoro_mode INTEGER DEFAULT 0,
+        pomodoro_elapsed INTEGER,
+        pomodoro_count INTEGER DEFAULT 0,
+        is_break_time INTEGER DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+)
+
+# 컬럼 추가 마이그레이션이 끝난 뒤에 만드는 인덱스
+INDEXES = (
+    'CREATE INDEX IF NOT EXISTS idx_task_records_date ON task_records(date)',
+    'CREATE INDEX IF NOT EXISTS idx_task_records_category ON task_records(category_id, date)',
+    'CREATE INDEX IF NOT EXISTS idx_daily_category_stats_category ON daily_category_stats(category_id)',
+    'CREATE INDEX IF NOT EXISTS idx_ai_feedback_date ON ai_feedback(date)',
+    'CREATE INDEX IF NOT EXISTS idx_ai_feedback_items_kind ON ai_feedback_items(kind, date)',
+    'CREATE INDEX IF NOT EXISTS idx_ai_feedback_items_feedback ON ai_feedback_items(feedback_id)',
+    'CREATE INDEX IF NOT EXISTS idx_goals_type_range ON goals(goal_type, date_range)',
+)
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def _migrate(conn):
+    """이전 버전 DB에 새 컬럼 / 집계 추가"""
+    if 'category_id' not in _columns(conn, 'task_records'):
+        conn.execute('ALTER TABLE task_records ADD COLUMN category_id INTEGER REFERENCES categories(id)')
+        # 예전 category 텍스트가 있으면 정규화 테이블로 옮기기
+        _link_categories(conn)
+        conn.execute('DELETE FROM daily_category_stats')
+    if conn.execute('SELECT 1 FROM daily_category_stats LIMIT 1').fetchone() is None:
+        _rebuild_category_stats(conn)
+    if conn.execute('SELECT 1 FROM period_stats LIMIT 1').fetchone() is None:
+        _rebuild_period_stats(conn)
+
+
+def _link_categories(conn):
+    """category 텍스트만 있고 category_id 가 없는 기록을 정규화 테이블에 연결"""
+    conn.execute('''
+        INSERT OR IGNORE INTO categories (name)
+        SELECT DISTINCT trim(category) FROM task_records
+        WHERE category_id IS NULL AND category IS NOT NULL AND trim(category) != ''
+    ''')
+    conn.execute('''
+        UPDATE task_records
+        SET category_id = (SELECT id FROM categories WHERE name = trim(task_records.category))
+        WHERE category_id IS NULL AND category IS NOT NULL
+    ''')
+
+
+def _rebuild_category_stats(conn, date=None):
+    """task_records 에서 날짜 x 카테고리 집계 다시 계산 (date 가 없으면 전체)"""
+    where = 'AND date = ?' if date else ''
+    params = (date,) if date else ()
+    if date:
+        conn.execute('DELETE FROM daily_category_stats WHERE date = ?', params)
+    conn.execute(f'''
+        INSERT OR REPLACE INTO daily_category_stats
+        (date, category_id, total_minutes, task_count, focus_sum, focus_count)
+        SELECT date, category_id, SUM(COALESCE(duration_minutes, 0)), COUNT(*),
+               SUM(COALESCE(focus_rating, 0)), COUNT(focus_rating)
+        FROM task_records
+        WHERE status = 'Done' {where}
+        GROUP BY date, category_id
+    ''', params)
+
+
+# 날짜 -> 주/월 시작일 SQL 식 (주는 월요일 시작)
+PERIOD_KEYS = {
+    'week': "date(date, 'weekday 0', '-6 days')",
+    'month': "substr(date, 1, 7) || '-01'",
+}
+PERIOD_LENGTHS = {'week': '+7 days', 'month': '+1 month'}
+
+PERIOD_STATS_SELECT = '''
+    SELECT {key} AS period_start,
+           COUNT(*),
+           COUNT(CASE WHEN status = 'Done' THEN 1 END),
+           SUM(CASE WHEN status = 'Done' THEN COALESCE(duration_minutes, 0) ELSE 0 END),
+           SUM(CASE WHEN focus_rating > 0 THEN focus_rating ELSE 0 END),
+           COUNT(CASE WHEN focus_rating > 0 THEN 1 END),
+           COUNT(DISTINCT date)
+    FROM {src}.task_records
+    WHERE {where}
+    GROUP BY period_start
+'''
+
+
+def _rebuild_period_stats(conn, date=None):
+    """task_records 에서 date 가 속한 주/월 집계 다시 계산 (date 가 없으면 전체)"""
+    for resolution, key in PERIOD_KEYS.items():
+        if date:
+            period_start = conn.execute(f'SELECT {key} FROM (SELECT ? AS date)', (date,)).fetchone()[0]
+            conn.execute('DELETE FROM period_stats WHERE resolution = ? AND period_start = ?',
+                         (resolution, period_start))
+            # date 인덱스를 쓰도록 키 식 대신 기간 범위로 거른다
+            where = f"date >= ? AND date < date(?, '{PERIOD_LENGTHS[resolution]}')"
+            params = (period_start, period_start)
+        else:
+            where, params = '1', ()
+        conn.execute(f'''
+            INSERT OR REPLACE INTO period_stats
+            (period_start, total_tasks, completed_tasks, total_work_minutes,
+             focus_sum, focus_count, active_days, resolution)
+            SELECT *, ? FROM ({PERIOD_STATS_SELECT.format(key=key, src='main', where=where)})
+        ''', (resolution,) + params)
+
+
+def _category_id(conn, name):
+    """카테고리 이름 -> id (없으면 생성, 빈 값은 None)"""
+    name = (name or '').strip()
+    if not name:
+        return None
+    conn.execute('INSERT OR IGNORE INTO categories (name) VALUES (?)', (name,))
+    return conn.execute('SELECT id FROM categories WHERE name = ?', (name,)).fetchone()[0]
+
+
+def _report_write_error(future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f'DB write error: {future.exception()}')
+
+
+def memoized(method):
+    """📚 쓰기 카운터가 바뀌기 전까지 같은 인자의 조회 결과를 재사용 (DB 조회 없이 확인)"""
+    @wraps(method)
+    def wrapper(self, *args):
+        key = (method.__name__, args)
+        version = self.write_version()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] == version:
+                return hit[1]
+        result = method(self, *args)
+        with self._cache_lock:
+            self._cache[key] = (version, result)
+        return result
+    return wrapper
+
+
+class ProductivityRepository:
+    """📚 productivity_data.db 조회/저장 메서드 모음
+
+    스레드마다 연결 하나를 열어두고 재사용하므로 sqlite3 의 statement cache 가
+    그대로 동작한다. 조회 결과는 쓰기 카운터(write_version) 가 같은 동안
+    메모이즈된다. 카운터는 연결과 상관없이 저장소 하나에 하나이므로, 다른 연결로
+    커밋하는 쓰기(아카이브 유지보수 등)도 끝나면 카운터를 올려야 한다.
+
+    카운터는 프로세스 안에서만 올라가므로 이 캐시는 DB 에 쓰는 프로세스가 앱
+    하나라고 가정한다. 앱이 켜져 있는 동안 다른 프로세스(reports / data_io CLI
+    등)가 쓴 내용은 앱이 다음에 직접 쓰기 전까지 보이지 않을 수 있다. 다른
+    프로세스는 읽기만 하거나, 쓴 뒤에는 앱을 다시 시작하는 것을 전제로 한다.
+
+    쓰기 메서드는 모두 Future 를 돌려준다. attach_writer() 로 DatabaseWriter 를
+    붙이면 쓰기는 writer 스레드에서 모아서 커밋되고, 붙이지 않으면 호출한
+    스레드에서 바로 커밋된 Future 를 돌려준다.
+    """
+
+    def __init__(self, db_path, cached_statements=128):
+        self.db_path = db_path
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._write_counter = 0
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self.writer = None
+
+    # ------------------------------------------------------------------
+    # 연결 / 버전 관리
+    # ------------------------------------------------------------------
+    def conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30,
+                                   cached_statements=self.cached_statements)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def write_version(self):
+        """DB I/O 없이 확인할 수 있는 쓰기 카운터 (분석 스냅샷 키)"""
+        return self._write_counter
+
+    def attach_writer(self, writer):
+        """✍️ 이후 쓰기는 writer 스레드로 보낸다"""
+        writer.on_commit = self._bump_version
+        self.writer = writer
+
+    def attach_archive(self, archive):
+        """🗄️ 주·월 집계 보충은 이 저장소의 쓰기 경로로 보내고, 자기 연결로 커밋하는
+        아카이브 이동은 끝날 때마다 카운터를 올리게 한다"""
+        archive.submit = self._submit
+        archive.on_commit = self._bump_version
+
+    def _submit(self, fn, *args, notify=True):
+        """fn(conn, *args) 를 쓰기 트랜잭션에서 실행하는 Future
+
+        notify=False 는 분석 결과에 영향이 없는 쓰기(세션 체크포인트)라서
+        write_version() 을 올리지 않는다.
+        """
+        if self.writer is not None:
+            future = self.writer.submit(fn, *args, notify=notify)
+        else:
+            future = Future()
+            conn = self.conn()
+            try:
+                args = [a.result() if isinstance(a, Future) else a for a in args]
+                value = fn(conn, *args)
+                conn.commit()
+                if notify:
+                    self._bump_version()
+                future.set_result(value)
+            except Exception as e:
+                conn.rollback()
+                future.set_exception(e)
+        future.add_done_callback(_report_write_error)
+        return future
+
+    def _write(self, sql, params=(), notify=True):
+        """단일 SQL 문 쓰기. Future 결과는 lastrowid"""
+        return self._submit(lambda conn, *p: conn.execute(sql, p).lastrowid, *params,
+                            notify=notify)
+
+    def _bump_version(self):
+        with self._cache_lock:
+            self._write_counter += 1
+            self._cache.clear()
+
+    def init_schema(self):
+        conn = self.conn()
+        for statement in SCHEMA:
+            conn.execute(statement)
+        _migrate(conn)
+        for statement in INDEXES:
+            conn.execute(statement)
+        conn.commit()
+        self._bump_version()
+
+    # ------------------------------------------------------------------
+    # 업무 기록
+    # ------------------------------------------------------------------
+    def insert_task_start(self, date, task_name, start_time, category=None) -> Future:
+        """Future 결과는 새 기록의 id (다른 쓰기 메서드에 그대로 넘겨도 된다)"""
+        return self._submit(self._insert_task_start, date, task_name, start_time, category)
+
+    @staticmethod
+    def _insert_task_start(conn, date, task_name, start_time, category):
+        category = (category or '').strip() or None
+        return conn.execute('''
+            INSERT INTO task_records (date, task_name, category, category_id, start_time, status)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (date, task_name, category, _category_id(conn, category), start_time,
+              'In Progress')).lastrowid
+
+    def complete_task_record(self, record_id, end_time, duration_minutes,
+                             pomodoro_count, focus_rating, status='Done') -> Future:
+        return self._write('''
+            UPDATE task_records
+            SET end_time = ?, duration_minutes = ?, status = ?,
+                pomodoro_count = ?, focus_rating = ?
+            WHERE id = ?
+        ''', (end_time, duration_minutes, status, pomodoro_count, focus_rating, record_id))
+
+    def close_orphan_record(self, record_id, end_time, duration_minutes, pomodoro_count) -> Future:
+        """중단된 'In Progress' 기록을 경과 시간까지로 마감"""
+        return self._write('''
+            UPDATE task_records
+            SET end_time = ?, duration_minutes = ?, status = ?, pomodoro_count = ?
+            WHERE id = ? AND status = 'In Progress'
+        ''', (end_time, duration_minutes, 'Interrupted', pomodoro_count, record_id))
+
+    @memoized
+    def get_done_tasks(self, date) -> Tuple[DoneTask, ...]:
+        rows = self.conn().execute('''
+            SELECT task_name, start_time, end_time, duration_minutes,
+                   focus_rating, pomodoro_count
+            FROM task_records
+            WHERE date = ? AND status = 'Done'
+            ORDER BY start_time
+        ''', (date,)).fetchall()
+        return tuple(DoneTask(*row) for row in rows)
+
+    @memoized
+    def get_recent_task_patterns(self, days=7) -> Tuple[TaskPattern, ...]:
+        rows = self.conn().execute('''
+            SELECT task_name, duration_minutes, focus_rating, start_time
+            FROM task_records
+            WHERE date >= date('now', ?) AND status = 'Done'
+            ORDER BY date DESC
+        ''', (f'-{days} days',)).fetchall()
+        return tuple(TaskPattern(*row) for row in rows)
+
+    # ------------------------------------------------------------------
+    # 일일 통계
+    # ------------------------------------------------------------------
+    def refresh_daily_stats(self, date) -> Future:
+        """task_records 에서 하루 통계 / 카테고리 / 주·월 집계를 다시 계산해 저장"""
+        return self._submit(self._refresh_daily_stats, date)
+
+    @staticmethod
+    def _refresh_daily_stats(conn, date):
+        stats = conn.execute('''
+            SELECT
+                COUNT(*) as total_tasks,
+                COUNT(CASE WHEN status = 'Done' THEN 1 END) as completed_tasks,
+                SUM(CASE WHEN status = 'Done' THEN duration_minutes ELSE 0 END) as total_work_minutes,
+                AVG(CASE WHEN focus_rating > 0 THEN focus_rating END) as avg_focus_rating
+            FROM task_records
+            WHERE date = ?
+        ''', (date,)).fetchone()
+        # 하루 정리(ai_feedback) 는 완료 기록이 그대로일 때만 유지 - 바뀌면 다시 만들도록 비움
+        conn.execute('''
+            INSERT INTO daily_stats
+            (date, total_tasks, completed_tasks, total_work_minutes, avg_focus_rating)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(date) DO UPDATE SET
+                ai_feedback = CASE
+                    WHEN completed_tasks = excluded.completed_tasks
+                     AND total_work_minutes = excluded.total_work_minutes
+                    THEN ai_feedback END,
+                total_tasks = excluded.total_tasks,
+                completed_tasks = excluded.completed_tasks,
+                total_work_minutes = excluded.total_work_minutes,
+                avg_focus_rating = excluded.avg_focus_rating
+        ''', (date, stats[0], stats[1], stats[2] or 0, stats[3] or 0))
+        _rebuild_category_stats(conn, date)
+        _rebuild_period_stats(conn, date)
+
+    def refresh_imported_records(self, dates) -> Future:
+        """📥 가져온 기록의 category_id 를 채우고 그 날짜들의 통계 / 집계를 다시 계산"""
+        return self._submit(self._refresh_imported_records, sorted(set(dates)))
+
+    @classmethod
+    def _refresh_imported_records(cls, conn, dates):
+        _link_categories(conn)
+        for date in dates:
+            cls._refresh_daily_stats(conn, date)
+
+    @memoized
+    def get_daily_stats(self, date) -> Optional[DailyStats]:
+        row = self.conn().execute('''
+            SELECT total_tasks, completed_tasks, total_work_minutes, avg_focus_rating
+            FROM daily_stats
+            WHERE date = ?
+        ''', (date,)).fetchone()
+        return DailyStats(*row) if row else None
+
+    @memoized
+    def get_recent_daily_stats(self, days=7) -> Tuple[DayHistory, ...]:
+        rows = self.conn().execute('''
+            SELECT date, total_work_minutes, completed_tasks, avg_focus_rating
+            FROM daily_stats
+            WHERE date >= date('now', ?)
+            ORDER BY date DESC
+        ''', (f'-{days} days',)).fetchall()
+        return tuple(DayHistory(*row) for row in rows)
+
+    # ------------------------------------------------------------------
+    # 목표
+    # ------------------------------------------------------------------
+    def save_goal(self, goal_type, date_range, updated_at, target_work_hours=0,
+                  target_tasks=0, target_focus_avg=0, target_pomodoros=0) -> Future:
+        return self._write('''
+            INSERT OR REPLACE INTO goals
+            (goal_type, date_range, target_work_hours, target_tasks,
+             target_focus_avg, target_pomodoros, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (goal_type, date_range, target_work_hours, target_tasks,
+              target_focus_avg, target_pomodoros, updated_at))
+
+    @memoized
+    def get_goal(self, goal_type, date_range) -> Optional[Goal]:
+        # 같은 기간에 여러 번 저장했으면 가장 최근 목표
+        row = self.conn().execute('''
+            SELECT target_work_hours, target_tasks, target_focus_avg, target_pomodoros
+            FROM goals
+            WHERE goal_type = ? AND date_range = ?
+            ORDER BY id DESC LIMIT 1
+        ''', (goal_type, date_range)).fetchone()
+        return Goal(*row) if row else None
+
+    # ------------------------------------------------------------------
+    # AI 결과
+    # ------------------------------------------------------------------
+    def insert_ai_feedback(self, date, feedback_type, content, feedback=None) -> Future:
+        """Future 결과는 피드백 id. feedback(구조화 응답) 이 있으면 인사이트 / 추천도 행으로 저장"""
+        return self._submit(self._insert_ai_feedback, date, feedback_type, content, feedback)
+
+    @staticmethod
+    def _insert_ai_feedback(conn, date, feedback_type, content, feedback=None):
+        if feedback is None:
+            return conn.execute('''
+                INSERT INTO ai_feedback (date, feedback_type, content)
+                VALUES (?, ?, ?)
+            ''', (date, feedback_type, content)).lastrowid
+        insights = [(item.category, item.text) for item in feedback.insights]
+        recommendations = [(item.priority, item.text) for item in feedback.recommendations]
+        feedback_id = conn.execute('''
+            INSERT INTO ai_feedback (date, feedback_type, content, insights, recommendations)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (date, feedback_type, content,
+              json.dumps([item._asdict() for item in feedback.insights], ensure_ascii=False),
+              json.dumps([item._asdict() for item in feedback.recommendations], ensure_ascii=False))
+        ).lastrowid
+        conn.executemany('''
+            INSERT INTO ai_feedback_items
+            (feedback_id, date, feedback_type, kind, label, position, text)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [(feedback_id, date, feedback_type, kind, label, position, text)
+              for kind, items in (('insight', insights), ('recommendation', recommendations))
+              for position, (label, text) in enumerate(items)])
+        return feedback_id
+
+    @memoized
+    def get_feedback_items(self, kind, start, end, feedback_type=None) -> Tuple[FeedbackItem, ...]:
+        """💡 start ~ end 의 인사이트 / 추천 항목 (kind: insight, recommendation), 최근 날짜부터"""
+        rows = self.conn().execute('''
+            SELECT date, feedback_type, label, text
+            FROM ai_feedback_items
+            WHERE kind = ? AND date BETWEEN ? AND ? AND (? IS NULL OR feedback_type = ?)
+            ORDER BY date DESC, feedback_id DESC, position
+        ''', (kind, start, end, feedback_type, feedback_type)).fetchall()
+        return tuple(FeedbackItem(*row) for row in rows)
+
+    def save_digests(self, rows) -> Future:
+        """🌙 하루 정리 / 예측 [(date, feedback_type, content, feedback)] 을 한 트랜잭션으로 저장
+
+        feedback 은 구조화 응답(없으면 None). feedback_type 이 daily 인 행은
+        daily_stats.ai_feedback 에도 넣는다.
+        """
+        return self._submit(self._save_digests, list(rows))
+
+    @classmethod
+    def _save_digests(cls, conn, rows):
+        for date, feedback_type, content, feedback in rows:
+            cls._insert_ai_feedback(conn, date, feedback_type, content, feedback)
+        conn.executemany('''
+            UPDATE daily_stats SET ai_feedback = ? WHERE date = ?
+        ''', [(row[2], row[0]) for row in rows if row[1] == 'daily'])
+
+    @memoized
+    def get_digest(self, date) -> Optional[str]:
+        """하루 정리 (완료 기록이 바뀌면 None)"""
+        row = self.conn().execute('''
+            SELECT ai_feedback FROM daily_stats WHERE date = ?
+        ''', (date,)).fetchone()
+        return row[0] if row else None
+
+    @memoized
+    def get_latest_ai_feedback(self, date, feedback_type) -> Optional[str]:
+        row = self.conn().execute('''
+            SELECT content FROM ai_feedback
+            WHERE date = ? AND feedback_type = ?
+            ORDER BY id DESC LIMIT 1
+        ''', (date, feedback_type)).fetchone()
+        return row[0] if row else None
+
+    @memoized
+    def get_undigested_dates(self, start, end) -> Tuple[str, ...]:
+        """start ~ end 중 완료 업무가 있는데 하루 정리가 없는 날짜"""
+        rows = self.conn().execute('''
+            SELECT date FROM daily_stats
+            WHERE date BETWEEN ? AND ? AND completed_tasks > 0 AND ai_feedback IS NULL
+            ORDER BY date
+        ''', (start, end)).fetchall()
+        return tuple(row[0] for row in rows)
+
+    def insert_schedule_suggestion(self, date, suggested_order, reasoning) -> Future:
+        """Future 결과는 추천 id (suggested_order 는 JSON 계획)"""
+        return self._write('''
+            INSERT INTO ai_schedule_suggestions (date, suggested_order, reasoning)
+            VALUES (?, ?, ?)
+        ''', (date, suggested_order, reasoning))
+
+    def update_schedule_reasoning(self, suggestion_id, reasoning) -> Future:
+        return self._write('''
+            UPDATE ai_schedule_suggestions SET reasoning = ? WHERE id = ?
+        ''', (reasoning, suggestion_id))
+
+    def accept_schedule_suggestion(self, suggestion_id) -> Future:
+        return self._write('''
+            UPDATE ai_schedule_suggestions SET user_accepted = 1 WHERE id = ?
+        ''', (suggestion_id,))
+
+    # ------------------------------------------------------------------
+    # 💾 세션 체크포인트
+    # ------------------------------------------------------------------
+    def save_session(self, session: ActiveSession, updated_at) -> Future:
+        # record_id 는 insert_task_start 의 Future 일 수도 있다
+        return self._write('''
+            INSERT OR REPLACE INTO active_session
+            (id, record_id, page_id, task_name, task_type, task_time, priority,
+             elapsed_seconds, pomodoro_mode, pomodoro_elapsed, pomodoro_count,
+             is_break_time, updated_at)
+            VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', tuple(session) + (updated_at,), notify=False)
+
+    def tick_session(self, elapsed_seconds, pomodoro_elapsed, updated_at) -> Future:
+        return self._write('''
+            UPDATE active_session
+            SET elapsed_seconds = ?, pomodoro_elapsed = ?, updated_at = ?
+            WHERE id = 1
+        ''', (elapsed_seconds, pomodoro_elapsed, updated_at), notify=False)
+
+    def clear_session(self) -> Future:
+        return self._write('DELETE FROM active_session WHERE id = 1', notify=False)
+
+    def get_session(self) -> Optional[ActiveSession]:
+        row = self.conn().execute('''
+            SELECT record_id, page_id, task_name, task_type, task_time, priority,
+                   elapsed_seconds, pomodoro_mode, pomodoro_elapsed, pomodoro_count,
+                   is_break_time
+            FROM active_session WHERE id = 1
+        ''').fetchone()
+        return ActiveSession(*row) if row else None
@@ -0,0 +1,158 @@
+# 🗓️ 오늘 업무 순서를 로컬에서 정하는 결정적 스케줄러 (LLM 없음, 밀리초 단위)
+import json
+import math
+from datetime import datetime, timedelta
+
+PLAN_VERSION = 1
+POMODORO_MINUTES = 25
+BREAK_MINUTES = 5
+SLOT_MINUTES = POMODORO_MINUTES + BREAK_MINUTES
+# 이 시각 이후로는 배치하지 않음
+DAY_END_HOUR = 22
+# 시간대 기록이 없을 때의 집중도
+DEFAULT_FOCUS = 3.0
+
+PRIORITY_WEIGHTS = {'높음': 3, 'High': 3, '보통': 2, 'Medium': 2, '낮음': 1, 'Low': 1}
+
+
+def _round_up(now, minutes=5):
+    """다음 5분 단위 시각 (초 버림)"""
+    now = now.replace(second=0, microsecond=0)
+    return now + timedelta(minutes=-now.minute % minutes)
+
+
+def build_slots(now, day_end_hour=DAY_END_HOUR):
+    """지금부터 day_end_hour 까지의 뽀모도로 슬롯 시작 시각 목록"""
+    start = _round_up(now)
+    end = now.replace(hour=day_end_hour, minute=0, second=0, microsecond=0)
+    slots = []
+    while start + timedelta(minutes=POMODORO_MINUTES) <= end:
+        slots.append(start)
+        start += timedelta(minutes=SLOT_MINUTES)
+    return slots
+
+
+def _deadline(task, now):
+    value = task.get('deadline')
+    if not value:
+        return None
+    try:
+        deadline = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if deadline.tzinfo is not None:
+        deadline = deadline.astimezone().replace(tzinfo=None)
+    # 시각 없는 마감일은 그날 하루 끝까지
+    if len(value) <= 10:
+        deadline += timedelta(days=1)
+    return deadline if deadline.date() <= now.date() + timedelta(days=1) else None
+
+
+def _reason(task, focus, golden, deadline):
+    reasons = []
+    if deadline is not None:
+        reasons.append(f'마감 {deadline:%H:%M} 전')
+    if PRIORITY_WEIGHTS.get(task.get('priority'), 2) >= 3:
+        reasons.append('우선순위 높음')
+    if golden is not None and focus >= golden - 0.25:
+        reasons.append('집중이 잘 되는 시간대')
+    elif focus < DEFAULT_FOCUS:
+        reasons.append('가벼운 업무를 집중도 낮은 시간에')
+    return ', '.join(reasons) or '남은 시간에 순서대로'
+
+
+def optimize_schedule(tasks, hour_focus, now=None, day_end_hour=DAY_END_HOUR):
+    """📋 tasks(dict: page_id, name, duration, priority, deadline) 를 뽀모도로 슬롯에 배치
+
+    hour_focus: {시: 평균 집중도} (분석 집계에서)
+    1) 마감이 있는 업무 -> 2) 우선순위 높은 것 -> 3) 오래 걸리는 것 순으로 하나씩,
+       마감 전 연속 빈 슬롯 중 평균 집중도가 가장 높은 구간에 넣는다 (같으면 이른 구간).
+    중요한 업무가 먼저 골든 타임을 차지하고, 가벼운 업무는 남은 시간으로 간다.
+    결과는 json.dumps 가능한 dict.
+    """
+    now = now or datetime.now()
+    slots = build_slots(now, day_end_hour)
+    rated = [value for value in hour_focus.values() if value]
+    default = sum(rated) / len(rated) if rated else DEFAULT_FOCUS
+    slot_focus = [hour_focus.get(slot.hour) or default for slot in slots]
+    golden = max(rated) if rated else None
+    free = [True] * len(slots)
+
+    def order(task):
+        deadline = _deadline(task, now)
+        return (deadline is None, deadline or now,
+                -PRIORITY_WEIGHTS.get(task.get('priority'), 2), -(task.get('duration') or 0),
+                task.get('name') or '')
+
+    items, unscheduled = [], []
+    for task in sorted(tasks, key=order):
+        count = max(1, math.ceil((task.get('duration') or POMODORO_MINUTES) / POMODORO_MINUTES))
+        deadline = _deadline(task, now)
+        best = None
+        for first in range(len(slots) - count + 1):
+            if not all(free[first:first + count]):
+                continue
+            end = slots[first + count - 1] + timedelta(minutes=POMODORO_MINUTES)
+            if deadline is not None and end > deadline:
+                break
+            score = sum(slot_focus[first:first + count]) / count
+            if best is None or score > best[0] + 1e-9:
+                best = (score, first)
+        if best is None:
+            unscheduled.append({'page_id': task.get('page_id'), 'name': task.get('name'),
+                                'duration': task.get('duration'), 'priority': task.get('priority')})
+            continue
+        score, first = best
+        for i in range(first, first + count):
+            free[i] = False
+        start = slots[first]
+        items.append({
+            'page_id': task.get('page_id'),
+            'name': task.get('name'),
+            'priority': task.get('priority'),
+            'duration': task.get('duration'),
+            'pomodoros': count,
+            'start': start.strftime('%H:%M'),
+            'end': (slots[first + count - 1] + timedelta(minutes=POMODORO_MINUTES)).strftime('%H:%M'),
+            'focus': round(score, 2),
+            'reason': _reason(task, score, golden, deadline),
+        })
+
+    items.sort(key=lambda item: item['start'])
+    return {
+        'version': PLAN_VERSION,
+        'date': now.strftime('%Y-%m-%d'),
+        'generated_at': now.strftime('%Y-%m-%dT%H:%M'),
+        'pomodoro_minutes': POMODORO_MINUTES,
+        'break_minutes': BREAK_MINUTES,
+        'items': items,
+        'unscheduled': unscheduled,
+    }
+
+
+def plan_to_json(plan):
+    return json.dumps(plan, ensure_ascii=False)
+
+
+def format_plan(plan):
+    """📝 추천 창에 보여줄 텍스트"""
+    lines = ['🔄 추천 업무 순서', '']
+    for i, item in enumerate(plan['items'], 1):
+        lines.append(f"{i}. [{item['start']}-{item['end']}] {item['name']} "
+                     f"(🍅 {item['pomodoros']}회, {item['reason']})")
+    if not plan['items']:
+        lines.append('오늘 남은 시간에 배치할 수 있는 업무가 없습니다.')
+    if plan['unscheduled']:
+        lines.append('')
+        lines.append('⏭️ 오늘 시간에 들어가지 않는 업무')
+        lines.extend(f"- {item['name']} ({item['duration']}분)" for item in plan['unscheduled'])
+    lines.append('')
+    lines.append(f"{plan['pomodoro_minutes']}분 집중 + {plan['break_minutes']}분 휴식 단위로, "
+                 '우선순위 / 마감 / 집중이 잘 되는 시간대를 반영해 계산했습니다.')
+    return '\n'.join(lines)
+
+
+def notion_start(plan, item):
+    """Notion Time 속성에 넣을 현지 시간대 ISO 시각"""
+    start = datetime.strptime(f"{plan['date']} {item['start']}", '%Y-%m-%d %H:%M')
+    return start.astimezone().isoformat()
@@ -0,0 +1,98 @@
+# 🛫 같은 요청이 동시에 여러 번 들어오면 한 번만 실행하고 결과를 함께 받는 single-flight
+import hashlib
+import json
+import threading
+from concurrent.futures import CancelledError, Future, TimeoutError
+
+# 다른 요청을 기다리는 동안 취소를 확인하는 간격 (초)
+_CANCEL_POLL = 0.1
+
+
+def flight_key(operation, args=()):
+    """(작업 이름, 인자) -> 키. 인자는 정렬된 JSON 으로 (NamedTuple 은 값 목록으로)"""
+    payload = json.dumps(args, ensure_ascii=False, sort_keys=True, default=str,
+                         separators=(',', ':'))
+    return f"{operation}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]}"
+
+
+class SingleFlight:
+    """🛫 진행 중인 (operation, args) 요청의 Future 를 나눠 쓴다
+
+    submit() 은 executor 에서, call() 은 부른 스레드에서 실행한다. 둘은 같은 표를
+    쓰므로 워커에서 시작한 요청에 다른 스레드의 call() 이 합류할 수 있고 그 반대도 된다.
+    요청이 끝나면 표에서 빠지므로 결과를 캐시하지는 않는다 (끝난 뒤의 요청은 새로 실행).
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.started = 0
+        self.shared = 0
+
+    def _join_or_lead(self, key):
+        """(진행 중인 Future, False) 또는 새로 등록한 (Future, True)"""
+        with self._lock:
+            running = self._flights.get(key)
+            if running is not None:
+                self.shared += 1
+                return running, False
+            future = Future()
+            self._flights[key] = future
+            self.started += 1
+            return future, True
+
+    def _land(self, key, future):
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+
+    def submit(self, operation, args, fn, executor):
+        """fn() 을 executor 에서 실행하는 Future 와 합류 여부 (future, shared)"""
+        key = flight_key(operation, args)
+        with self._lock:
+            running = self._flights.get(key)
+            if running is not None:
+                self.shared += 1
+                return running, True
+            future = executor.submit(fn)
+            self._flights[key] = future
+            self.started += 1
+        future.add_done_callback(lambda done: self._land(key, done))
+        return future, False
+
+    def call(self, operation, args, fn, cancel=None):
+        """fn() 을 지금 스레드에서 실행하거나 진행 중인 요청을 기다려 (결과, shared)
+
+        먼저 시작한 요청이 취소되면 (CancelledError) 기다리던 쪽이 직접 다시 실행한다.
+        기다리는 동안 cancel(threading.Event) 이 세워지면 CancelledError.
+        """
+        key = flight_key(operation, args)
+        while True:
+            future, leader = self._join_or_lead(key)
+            if not leader:
+                try:
+                    return self._wait(future, cancel), True
+                except CancelledError:
+                    if cancel is not None and cancel.is_set():
+                        raise
+                    continue
+            try:
+                value = fn()
+            except BaseException as e:
+                future.set_exception(e)
+                self._land(key, future)
+                raise
+            future.set_result(value)
+            self._land(key, future)
+            return value, False
+
+    @staticmethod
+    def _wait(future, cancel):
+        if cancel is None:
+            return future.result()
+        while True:
+            try:
+                return future.result(timeout=_CANCEL_POLL)
+            except TimeoutError:
+                if cancel.is_set():
+                    raise CancelledError() from None
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from analytics import AnalyticsEngine
+from archive import ArchiveManager
+from repository import ProductivityRepository
+
+
+def test_snapshot_refreshes_after_archive_and_backfill(tmp_path):
+    repo = ProductivityRepository(str(tmp_path / 'productivity_data.db'))
+    repo.init_schema()
+    archive = ArchiveManager(repo.db_path, str(tmp_path / 'archive'), hot_months=3)
+    repo.attach_archive(archive)
+    engine = AnalyticsEngine(archive, version_source=repo.write_version)
+
+    for day in ('2025-01-06', '2025-01-07', '2025-02-03'):
+        record_id = repo.insert_task_start(day, 'Write', '09:00:00', 'Work')
+        repo.complete_task_record(record_id.result(), '09:50:00', 50, 1, 4)
+        repo.refresh_daily_stats(day).result()
+
+    version = repo.write_version()
+    assert archive.archive_old_records(today=datetime(2025, 9, 15)) > 0
+    assert repo.write_version() > version
+    # 집계 테이블이 생기기 전에 아카이브된 달처럼 주/월 집계를 비운다
+    repo._write('DELETE FROM period_stats').result()
+
+    start, end = '2025-01-01', '2025-06-30'
+    before = engine.snapshot(start=start, end=end)
+    assert sum(point.completed_tasks for point in before.trend) == 0
+
+    assert archive.backfill_period_stats() == 2
+    after = engine.snapshot(start=start, end=end)
+    assert after is not before
+    assert sum(point.completed_tasks for point in after.trend) == 3
+    repo.close()
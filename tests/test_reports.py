@@ -0,0 +1,65 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip('seaborn')
+
+import reports  # noqa: E402
+from analytics import AnalyticsEngine
+from archive import ArchiveManager
+from repository import ProductivityRepository
+
+
+def make_user_db(tmp_path, user, tasks):
+    """tasks: [(date, 이름, 카테고리, 시작 시각 'HH:MM:SS', 분, 집중도)]"""
+    db_path = str(tmp_path / user / 'productivity_data.db')
+    os.makedirs(os.path.dirname(db_path))
+    repo = ProductivityRepository(db_path)
+    repo.init_schema()
+    for date, name, category, start, minutes, focus in tasks:
+        end = datetime.strptime(start, '%H:%M:%S') + timedelta(minutes=minutes)
+        record_id = repo.insert_task_start(date, name, start, category)
+        repo.complete_task_record(record_id.result(), end.strftime('%H:%M:%S'), minutes, 1, focus)
+        repo.refresh_daily_stats(date).result()
+    return repo, db_path
+
+
+def collect(repo, db_path, start, end):
+    archive = ArchiveManager(db_path, os.path.join(os.path.dirname(db_path), 'archive'))
+    return reports.collect_report_data(repo, AnalyticsEngine(archive), start, end)
+
+
+def read_pngs(out_dir, label):
+    return {name: open(os.path.join(out_dir, f'{label}_{name}.png'), 'rb').read()
+            for name in reports.CHART_NAMES}
+
+
+def test_same_period_charts_are_not_shared_between_users(tmp_path, monkeypatch):
+    monkeypatch.setattr(reports, '_charts', None)
+    alice = make_user_db(tmp_path, 'alice', [
+        ('2025-09-29', 'Write spec', 'Work', '09:00:00', 50, 5),
+        ('2025-09-30', 'Review', 'Work', '10:00:00', 40, 4),
+    ])
+    bob = make_user_db(tmp_path, 'bob', [
+        ('2025-09-29', 'Gym', 'Personal', '18:00:00', 60, 2),
+        ('2025-10-01', 'Read', 'Study', '21:00:00', 30, 3),
+    ])
+    label, start, end = '2025-W40', '2025-09-29', '2025-10-05'
+    snapshots = {}
+    for user, (repo, db_path) in (('alice', alice), ('bob', bob)):
+        snapshot, tasks, recommendations = collect(repo, db_path, start, end)
+        snapshots[user] = snapshot
+        # 한 워커 프로세스가 두 사용자의 같은 기간 리포트를 차례로 그리는 상황
+        reports.render_report(user, 'weekly', label, snapshot, tasks, recommendations,
+                              str(tmp_path / 'out' / user))
+        repo.close()
+    assert snapshots['alice'].version == snapshots['bob'].version
+
+    # 새 Figure 로 처음부터 그린 bob 의 차트와 같아야 한다
+    monkeypatch.setattr(reports, '_charts', None)
+    reports.render_report('bob', 'weekly', label, snapshots['bob'], (), (),
+                          str(tmp_path / 'fresh'))
+    shared = read_pngs(str(tmp_path / 'out' / 'bob'), label)
+    assert shared == read_pngs(str(tmp_path / 'fresh'), label)
+    assert shared != read_pngs(str(tmp_path / 'out' / 'alice'), label)
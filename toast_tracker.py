@@ -8,20 +8,62 @@ from datetime import datetime, timedelta
 import winsound
 from plyer import notification
 import threading
-import sqlite3
+import queue
 import json
-import openai
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import os
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, wait
 from PIL import Image, ImageTk
+import charts
+from archive import ArchiveManager
+from analytics import AnalyticsEngine, RANGE_PRESETS, preset_range
+from repository import ProductivityRepository, ActiveSession
+from db_writer import DatabaseWriter
+from live_metrics import LiveMetrics
+from forecast import forecast_day, format_forecast
+from columnar import ColumnarStore
+from ai_cache import ResponseCache
+from ai_jobs import AiJobQueue, TokenStream
+from llm_client import LLMClient
+from prompt_builder import count_tokens, fit_rows, summarize_days
+from schedule_optimizer import format_plan, notion_start, optimize_schedule, plan_to_json
+from feedback_schema import JSON_INSTRUCTIONS, Feedback, FeedbackStream, parse_feedback
+from single_flight import SingleFlight
+from config import Config
 
 # 🎨 CustomTkinter 설정
 ctk.set_appearance_mode("light")  # "dark" or "light"
 ctk.set_default_color_theme("blue")  # "blue", "green", "dark-blue"
 
+# 🤖 프롬프트 문구를 바꾸면 해당 버전을 올려서 저장된 AI 응답을 무효화
+AI_PROMPT_VERSIONS = {
+    'daily_feedback': 3,
+    'period_feedback': 3,
+    'smart_schedule': 3,
+    'prediction': 1,
+    'dashboard_feedback': 1,
+}
+
+# 📏 프롬프트 전체 토큰 예산 - 넘치는 행은 합계로 접는다
+AI_PROMPT_BUDGETS = {
+    'daily_feedback': 1500,
+    'period_feedback': 1800,
+    'smart_schedule': 1500,
+}
+
+# 🌙 하루 정리(피드백 + 내일 예측) 작업 - 빠진 날은 최근 며칠까지 한 번에 채움
+DIGEST_JOB = 'AI 하루 정리'
+DIGEST_BACKFILL_DAYS = 14
+# 종료할 때 오늘 정리를 기다리는 최대 시간 (초)
+DIGEST_EXIT_TIMEOUT = 60
+
+# 🤖 피드백 기간 선택 -> (ai_feedback.feedback_type, 일 수)
+FEEDBACK_PERIODS = {
+    '일일': ('daily', 1),
+    '주간': ('weekly', 7),
+    '월간': ('monthly', 30),
+}
+
 class SchedulerNotionTracker:
     def __init__(self):
         self.root = ctk.CTk()
@@ -52,12 +94,67 @@ class SchedulerNotionTracker:
         self.daily_stats = {}
         self.ai_feedback = ''
         self.current_task_id = None
+        self.repo = ProductivityRepository(self.db_path)
+        # 💾 같은 데이터로 다시 묻는 AI 요청은 저장된 응답 재사용
+        self.ai_cache = ResponseCache('ai_cache.db')
+        # 🤖 연결 풀을 재사용하는 OpenAI 클라이언트 하나 (모델은 .env 의 OPENAI_MODEL,
+        #    OPENAI_BASE_URL 로 호환 서버 - 예: fake_openai.py - 를 가리킬 수 있음)
+        self.llm = LLMClient('', model=Config.OPENAI_MODEL, base_url=Config.OPENAI_BASE_URL,
+                             on_call=self.on_ai_call)
+        self.db_writer = DatabaseWriter(self.db_path)
+        
+        # ⚡ 메인 창 KPI (이벤트로만 갱신되는 메모리 집계)
+        self.metrics = LiveMetrics()
+        self.kpi_text = ''
+        
+        # 💾 세션 체크포인트 관련 속성들
+        self.checkpoint_interval = 30  # 초
+        self.last_checkpoint = 0
+        
+        # 🗄️ 아카이브 관련 속성들
+        self.archive = ArchiveManager(self.db_path, archive_dir='archive', hot_months=3)
+        self.repo.attach_archive(self.archive)
+        self.analytics = AnalyticsEngine(self.archive, version_source=self.repo.write_version)
+        self.use_columnar = Config.COLUMNAR_CACHE  # .env 의 COLUMNAR_CACHE=true 로 켜기
+        self.columnar = None
+        
+        # 🌙 하루 정리 시각 (.env 의 DIGEST_TIME=HH:MM, off 면 종료할 때만)
+        self.digest_time = Config.DIGEST_TIME
+        self.digest_day = None  # 오늘 정리를 시작한 날짜
+        self.digest_backfilled = False
+        
+        # 📊 대시보드 백그라운드 렌더링용 워커
+        self.chart_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chart')
+        # 대시보드를 열 때마다 Figure 를 새로 만들지 않도록 차트별로 하나씩 유지
+        self.charts = {
+            'heatmap': charts.FocusHeatmapChart(),
+            'category': charts.CategoryPieChart(),
+            'trend': charts.TrendChart(),
+        }
+        # 🔗 노션 쓰기(일정 적용 등)도 메인 스레드 밖에서
+        self.notion_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notion')
+        # 🔄 스마트 일정: 계산 중 / 열려 있는 추천 창 (중복 추천 방지)
+        self.schedule_pending = False
+        self.schedule_window = None
+        # 🤖 AI 요청은 워커에서 - 기다리는 동안에도 창과 타이머가 계속 동작
+        self.ai_jobs = AiJobQueue(max_workers=2)
+        # 🛫 같은 AI / 노션 요청이 동시에 들어오면 한 번만 보내고 결과를 나눠 씀
+        self.flights = SingleFlight()
+        self.tasks_loading = False
+        self.ai_progress_text = ''
+        # 📝 워커 스레드의 로그는 큐를 거쳐 메인 스레드에서 출력
+        self.log_queue = queue.Queue()
         
         self.load_config()
         self.setup_ui()
         self.init_database()
+        self.load_live_metrics()
+        self.init_columnar_cache()
+        self.restore_active_session()
+        self.start_archive_maintenance()
         self.update_timer()
         self.start_scheduler()  # 🚨 핵심! 스케줄러 시작!
+        self.root.protocol('WM_DELETE_WINDOW', self.on_close)
     
     def load_config(self):
         try:
@@ -70,6 +167,12 @@ class SchedulerNotionTracker:
                         self.db_id = line.split('=', 1)[1]
                     elif line.startswith('OPENAI_API_KEY='):
                         self.openai_key = line.split('=', 1)[1]
+                    elif line.startswith('OPENAI_BASE_URL='):
+                        self.llm.base_url = line.split('=', 1)[1].strip() or None
+                    elif line.startswith('COLUMNAR_CACHE='):
+                        self.use_columnar = line.split('=', 1)[1].strip().lower() == 'true'
+                    elif line.startswith('DIGEST_TIME='):
+                        self.digest_time = line.split('=', 1)[1].strip()
             
             if self.token and self.db_id:
                 self.headers = {
@@ -79,7 +182,13 @@ class SchedulerNotionTracker:
                 }
             
             if self.openai_key:
-                openai.api_key = self.openai_key
+                self.llm.api_key = self.openai_key
+            
+            # HH:MM 형식이 아니면 (off 등) 정해진 시각 없이 종료할 때만 정리
+            try:
+                self.digest_time = datetime.strptime(self.digest_time, '%H:%M').strftime('%H:%M')
+            except (TypeError, ValueError):
+                self.digest_time = None
                 
         except Exception as e:
             print(f'Config error: {e}')
@@ -87,98 +196,48 @@ class SchedulerNotionTracker:
     def init_database(self):
         """📊 생산성 데이터 저장을 위한 SQLite 데이터베이스 초기화"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 업무 기록 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS task_records (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL,
-                    task_name TEXT NOT NULL,
-                    category TEXT,
-                    start_time TEXT NOT NULL,
-                    end_time TEXT,
-                    duration_minutes INTEGER,
-                    status TEXT,
-                    pomodoro_count INTEGER DEFAULT 0,
-                    break_count INTEGER DEFAULT 0,
-                    productivity_score REAL,
-                    focus_rating INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # 일일 통계 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS daily_stats (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT UNIQUE NOT NULL,
-                    total_work_minutes INTEGER DEFAULT 0,
-                    total_break_minutes INTEGER DEFAULT 0,
-                    completed_tasks INTEGER DEFAULT 0,
-                    total_tasks INTEGER DEFAULT 0,
-                    avg_focus_rating REAL DEFAULT 0,
-                    peak_productivity_hour INTEGER,
-                    ai_feedback TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # AI 피드백 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS ai_feedback (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL,
-                    feedback_type TEXT NOT NULL,  -- daily, weekly, monthly
-                    content TEXT NOT NULL,
-                    insights TEXT,
-                    recommendations TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # 🎯 목표 설정 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS goals (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    goal_type TEXT NOT NULL,  -- daily, weekly, monthly
-                    date_range TEXT NOT NULL,  -- 2025-07-01 or 2025-W27 or 2025-07
-                    target_work_hours REAL DEFAULT 0,
-                    target_tasks INTEGER DEFAULT 0,
-                    target_focus_avg REAL DEFAULT 0,
-                    target_pomodoros INTEGER DEFAULT 0,
-                    actual_work_hours REAL DEFAULT 0,
-                    actual_tasks INTEGER DEFAULT 0,
-                    actual_focus_avg REAL DEFAULT 0,
-                    actual_pomodoros INTEGER DEFAULT 0,
-                    achievement_rate REAL DEFAULT 0,
-                    status TEXT DEFAULT 'active',  -- active, completed, failed
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # 🔄 AI 일정 추천 테이블
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS ai_schedule_suggestions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date TEXT NOT NULL,
-                    suggested_order TEXT NOT NULL,  -- JSON format
-                    reasoning TEXT,
-                    user_accepted BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
+            self.repo.init_schema()
+            # 이후 쓰기는 writer 스레드에서 모아서 커밋
+            self.repo.attach_writer(self.db_writer.start())
             self.add_log('📊 데이터베이스 초기화 완료!')
             
         except Exception as e:
             print(f'Database init error: {e}')
             self.add_log(f'❌ DB 초기화 오류: {e}')
     
+    def start_archive_maintenance(self):
+        """🗄️ 오래된 기록 아카이브 + ANALYZE/VACUUM 을 백그라운드에서 실행"""
+        def on_done(moved, error):
+            if error:
+                self.post_log(f'❌ 아카이브 오류: {error}')
+            elif moved:
+                self.post_log(f'🗄️ 오래된 기록 {moved}건을 아카이브로 이동했습니다')
+            self.sync_columnar_cache()
+        self.archive.start_maintenance_thread(on_done)
+
+    def init_columnar_cache(self):
+        """🧮 (선택) task_records 열 단위 캐시 연결 - 처음 만드는 작업은 유지보수 스레드에서"""
+        if not self.use_columnar:
+            return
+        try:
+            self.columnar = ColumnarStore(self.archive, cache_dir='columnar')
+            self.analytics.columnar = self.columnar
+        except Exception as e:
+            print(f'Columnar cache error: {e}')
+            self.columnar = None
+
+    def sync_columnar_cache(self):
+        """🧮 열 단위 캐시에 새 기록 덧붙이기 (백그라운드 스레드에서 호출)"""
+        if self.columnar is None:
+            return
+        try:
+            added = self.columnar.sync()
+            if added > 1000:
+                self.post_log(f'🧮 분석 캐시에 기록 {added}건을 추가했습니다')
+        except Exception as e:
+            print(f'Columnar sync error: {e}')
+
+
     def show_toast(self, title, message, duration=5):
         try:
             notification.notify(
@@ -193,7 +252,7 @@ class SchedulerNotionTracker:
             except:
                 pass
         except Exception as e:
-            self.add_log(f'TOAST ERROR: {e}')
+            self.post_log(f'TOAST ERROR: {e}')
 
     def start_scheduler(self):
         """🚨 핵심! 10초마다 시간을 체크해서 알림을 보내는 스케줄러"""
@@ -223,7 +282,6 @@ class SchedulerNotionTracker:
             print(f'[DEBUG] 현재 시간: {current_time}, 오늘: {today}')
             
             # 오늘의 모든 작업 가져오기
-            url = f'https://api.notion.com/v1/databases/{self.db_id}/query'
             query = {
                 'filter': {
                     'property': 'Date',
@@ -233,7 +291,7 @@ class SchedulerNotionTracker:
                 }
             }
             
-            response = requests.post(url, headers=self.headers, json=query)
+            response, _ = self.query_notion_tasks(query)
             
             if response.status_code == 200:
                 data = response.json()
@@ -273,7 +331,7 @@ class SchedulerNotionTracker:
                                     '🕐 업무 시작 시간!',
                                     f'{task_name} 시작할 시간입니다!'
                                 )
-                                self.add_log(f'⏰ 알림: {task_name} ({scheduled_time})')
+                                self.post_log(f'⏰ 알림: {task_name} ({scheduled_time})')
                                 self.notified_tasks.add(task_id)
                                 print(f'[DEBUG] 알림 발송: {task_name}')
                                 
@@ -347,6 +405,33 @@ class SchedulerNotionTracker:
         )
         self.status_label.pack(pady=(0, 10))
         
+        # ⚡ 오늘의 실시간 지표
+        self.kpi_label = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=ctk.CTkFont(size=12, weight="normal"),
+            text_color="#555555"
+        )
+        self.kpi_label.pack(pady=(0, 10))
+        
+        # 🤖 AI 요청 진행 표시 (요청이 있을 때만 보임)
+        self.ai_progress_frame = ctk.CTkFrame(header_frame, fg_color="transparent")
+        self.ai_progress_label = ctk.CTkLabel(
+            self.ai_progress_frame,
+            text="",
+            font=ctk.CTkFont(size=12, weight="normal"),
+            text_color="#6f42c1"
+        )
+        self.ai_progress_label.pack(side="left", padx=(0, 8))
+        self.ai_progress_bar = ctk.CTkProgressBar(self.ai_progress_frame, mode="indeterminate", width=120)
+        self.ai_progress_bar.pack(side="left", padx=(0, 8))
+        ctk.CTkButton(
+            self.ai_progress_frame,
+            text="취소",
+            width=60,
+            command=self.cancel_ai_jobs
+        ).pack(side="left")
+        
         # 🍅 뽀모도로 설정
         pomodoro_frame = ctk.CTkFrame(header_frame)
         pomodoro_frame.pack(fill="x", padx=15, pady=8)
@@ -518,15 +603,24 @@ class SchedulerNotionTracker:
         
         self.feedback_btn = ctk.CTkButton(
             ai_row1,
-            text="일일 피드백",
+            text="AI 피드백",
             command=self.get_daily_feedback,
             font=ctk.CTkFont(size=12, weight="normal"),
             fg_color="#17a2b8",
             hover_color="#138496",
-            width=140,
+            width=100,
             height=35
         )
-        self.feedback_btn.pack(side="left", padx=5)
+        self.feedback_btn.pack(side="left", padx=(5, 0))
+        
+        self.feedback_period = ctk.StringVar(value='일일')
+        ctk.CTkOptionMenu(
+            ai_row1,
+            values=list(FEEDBACK_PERIODS),
+            variable=self.feedback_period,
+            width=70,
+            height=35
+        ).pack(side="left", padx=(2, 5))
         
         self.stats_btn = ctk.CTkButton(
             ai_row1,
@@ -564,6 +658,22 @@ class SchedulerNotionTracker:
         )
         self.prediction_btn.pack(side="left", padx=5)
         
+        # 두 번째 줄
+        ai_row2 = ctk.CTkFrame(ai_buttons_frame)
+        ai_row2.pack(fill="x", pady=5)
+        
+        self.schedule_btn = ctk.CTkButton(
+            ai_row2,
+            text="스마트 일정",
+            command=self.get_smart_schedule,
+            font=ctk.CTkFont(size=12, weight="normal"),
+            fg_color="#17a2b8",
+            hover_color="#138496",
+            width=140,
+            height=35
+        )
+        self.schedule_btn.pack(side="left", padx=5)
+        
         # 📝 로그 섹션
         log_frame = ctk.CTkFrame(main_container)
         log_frame.pack(fill="both", expand=True, padx=15, pady=(8, 15))
@@ -604,7 +714,7 @@ class SchedulerNotionTracker:
             return
         
         self.is_break_time = True
-        self.pomodoro_start = time.time()
+        self.pomodoro_start = time.monotonic()
         self.start_btn.configure(state="disabled")
         self.break_btn.configure(state="disabled")
         self.complete_btn.configure(state="normal")
@@ -615,6 +725,7 @@ class SchedulerNotionTracker:
         
         # 휴식 시간 후 알림
         self.root.after(self.break_duration * 1000, self.break_finished)
+        self.save_session_checkpoint()
     
     def break_finished(self):
         """☕ 휴식 종료"""
@@ -624,65 +735,95 @@ class SchedulerNotionTracker:
             self.show_toast('⏰ 휴식 종료', '이제 다시 집중할 시간입니다!')
             self.pomodoro_status.configure(text='🍅 작업 시간!')
             self.break_btn.configure(state="normal")
+            self.save_session_checkpoint()
+
+    def query_notion_tasks(self, query=None, executor=None):
+        """🔗 노션 업무 DB 조회 - 같은 조회(query 까지 같을 때)가 진행 중이면 새로 보내지 않고 그 응답을 함께 받음
+
+        executor 가 있으면 거기서 실행하는 (Future, shared), 없으면 지금 스레드에서 (Response, shared).
+        """
+        url = f'https://api.notion.com/v1/databases/{self.db_id}/query'
+        headers = dict(self.headers)
+        query = query or {}
+
+        def fetch():
+            return requests.post(url, headers=headers, json=query, timeout=30)
+
+        args = (self.db_id, query)
+        if executor is not None:
+            return self.flights.submit('notion_query', args, fetch, executor)
+        return self.flights.call('notion_query', args, fetch)
 
     def load_tasks(self):
         if not self.headers:
             self.add_log('❌ 오류: 노션 설정이 필요합니다')
             self.show_toast('❌ 오류', '노션이 설정되지 않았습니다')
             return
-        try:
-            today = datetime.now().date()
-            self.add_log(f'업무 로딩중...')
-            self.show_toast('로딩중...', '노션에서 업무를 가져오는 중')
-            url = f'https://api.notion.com/v1/databases/{self.db_id}/query'
-            query = {}
-            response = requests.post(url, headers=self.headers, json=query)
-            if response.status_code == 200:
-                data = response.json()
-                self.tasks = data.get('results', [])
-                for row in self.task_table.get_children():
-                    self.task_table.delete(row)
-                for task in self.tasks:
-                    time_val = ''
-                    is_today = False
-                    time_prop = task['properties'].get('Time')
-                    if time_prop and time_prop.get('date') and time_prop['date'].get('start'):
-                        scheduled_datetime = time_prop['date']['start']
-                        try:
-                            dt = datetime.fromisoformat(scheduled_datetime.replace('Z', '+00:00'))
-                            time_val = dt.strftime('%Y-%m-%d %H:%M')
-                            if dt.date() == today:
-                                is_today = True
-                        except Exception:
-                            pass
-                    if not is_today:
-                        continue
-                    task_name = 'Untitled'
-                    if (task['properties'].get('Task') and 
-                        task['properties']['Task'].get('title') and 
-                        len(task['properties']['Task']['title']) > 0):
-                        task_name = task['properties']['Task']['title'][0]['plain_text']
-                    type_val = ''
-                    if (task['properties'].get('Type') and 
-                        task['properties']['Type'].get('select')):
-                        type_val = task['properties']['Type']['select']['name']
-                    priority_val = ''
-                    if (task['properties'].get('Priority') and 
-                        task['properties']['Priority'].get('select')):
-                        priority_val = task['properties']['Priority']['select']['name']
-                    page_id = task['id']
-                    self.task_table.insert('', 'end', iid=page_id, values=(task_name, type_val, time_val, priority_val))
-                self.add_log(f'성공: {self.task_table.get_children().__len__()}개 업무 로드됨')
-                self.show_toast('업무 로드 완료', f'오늘 {self.task_table.get_children().__len__()}개 업무를 찾았습니다')
-                if len(self.task_table.get_children()) == 0:
-                    self.add_log('업무가 없습니다. 노션에서 업무를 만들어주세요!')
-                    self.show_toast('업무 없음', '노션에서 먼저 업무를 만들어주세요!')
-            else:
-                self.add_log(f'오류: {response.status_code}\n{response.text}')
-                self.show_toast('로드 실패', f'오류 코드: {response.status_code}')
-        except Exception as e:
-            self.add_log(f'예외: {str(e)}')
-            self.show_toast('예외 발생', f'오류: {str(e)[:50]}')
+        if self.tasks_loading:
+            # 더블클릭 등으로 다시 눌러도 진행 중인 조회 결과를 기다림
+            self.add_log('⏳ 업무를 이미 불러오는 중입니다')
+            return
+        today = datetime.now().date()
+        self.add_log(f'업무 로딩중...')
+        self.show_toast('로딩중...', '노션에서 업무를 가져오는 중')
+        self.tasks_loading = True
+        future, _ = self.query_notion_tasks(executor=self.notion_pool)
+
+        def done(future):
+            self.tasks_loading = False
+            try:
+                response = future.result()
+                if response.status_code == 200:
+                    self.fill_task_table(response.json().get('results', []), today)
+                else:
+                    self.add_log(f'오류: {response.status_code}\n{response.text}')
+                    self.show_toast('로드 실패', f'오류 코드: {response.status_code}')
+            except Exception as e:
+                self.add_log(f'예외: {str(e)}')
+                self.show_toast('예외 발생', f'오류: {str(e)[:50]}')
+
+        self.call_when_done(future, done)
+
+    def fill_task_table(self, tasks, today):
+        """📋 노션 조회 결과 중 오늘 업무로 업무 표 채우기 (메인 스레드)"""
+        self.tasks = tasks
+        for row in self.task_table.get_children():
+            self.task_table.delete(row)
+        for task in self.tasks:
+            time_val = ''
+            is_today = False
+            time_prop = task['properties'].get('Time')
+            if time_prop and time_prop.get('date') and time_prop['date'].get('start'):
+                scheduled_datetime = time_prop['date']['start']
+                try:
+                    dt = datetime.fromisoformat(scheduled_datetime.replace('Z', '+00:00'))
+                    time_val = dt.strftime('%Y-%m-%d %H:%M')
+                    if dt.date() == today:
+                        is_today = True
+                except Exception:
+                    pass
+            if not is_today:
+                continue
+            task_name = 'Untitled'
+            if (task['properties'].get('Task') and 
+                task['properties']['Task'].get('title') and 
+                len(task['properties']['Task']['title']) > 0):
+                task_name = task['properties']['Task']['title'][0]['plain_text']
+            type_val = ''
+            if (task['properties'].get('Type') and 
+                task['properties']['Type'].get('select')):
+                type_val = task['properties']['Type']['select']['name']
+            priority_val = ''
+            if (task['properties'].get('Priority') and 
+                task['properties']['Priority'].get('select')):
+                priority_val = task['properties']['Priority']['select']['name']
+            page_id = task['id']
+            self.task_table.insert('', 'end', iid=page_id, values=(task_name, type_val, time_val, priority_val))
+        self.add_log(f'성공: {self.task_table.get_children().__len__()}개 업무 로드됨')
+        self.show_toast('업무 로드 완료', f'오늘 {self.task_table.get_children().__len__()}개 업무를 찾았습니다')
+        if len(self.task_table.get_children()) == 0:
+            self.add_log('업무가 없습니다. 노션에서 업무를 만들어주세요!')
+            self.show_toast('업무 없음', '노션에서 먼저 업무를 만들어주세요!')
 
     def start_task(self):
         selected = self.task_table.selection()
@@ -704,21 +845,23 @@ class SchedulerNotionTracker:
             'page_id': page_id
         }
         self.current_label.configure(text=f'진행중: {task_name}')
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.is_tracking = True
         self.is_break_time = False
         self.start_btn.configure(state="disabled")
         self.complete_btn.configure(state="normal")
         if self.pomodoro_mode:
             self.break_btn.configure(state="normal")
-            self.pomodoro_start = time.time()
+            self.pomodoro_start = time.monotonic()
             self.pomodoro_status.configure(text=f'집중 시간! ({self.pomodoro_duration//60}분)')
             self.root.after(self.pomodoro_duration * 1000, self.pomodoro_break_reminder)
         self.add_log(f'▶️ 시작: {task_name}')
         self.show_toast('업무 시작', f'{task_name} 업무를 시작했습니다!')
         # Notion Status를 In Progress로 업데이트
         self.update_notion_status('In Progress')
-        self.save_task_start(task_name)
+        self.save_task_start(task_name, type_val)
+        self.metrics.on_task_start()
+        self.save_session_checkpoint()
 
     def pomodoro_break_reminder(self):
         """🍅 뽀모도로 휴식 시간 알림"""
@@ -726,33 +869,136 @@ class SchedulerNotionTracker:
             self.add_log('🍅 25분 완료! 5분 휴식을 권장합니다.')
             self.show_toast('🍅 뽀모도로 완료', '25분 집중 완료! 5분 휴식을 하세요.')
             self.pomodoro_count += 1
+            self.metrics.on_pomodoro()
             self.pomodoro_status.configure(text='🍅 휴식 시간 권장!')
+            self.save_session_checkpoint()
     
-    def save_task_start(self, task_name):
+    def save_task_start(self, task_name, category=None):
         """📊 업무 시작 데이터 저장"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             today = datetime.now().strftime('%Y-%m-%d')
             start_time = datetime.now().strftime('%H:%M:%S')
             
-            cursor.execute('''
-                INSERT INTO task_records (date, task_name, start_time, status)
-                VALUES (?, ?, ?, ?)
-            ''', (today, task_name, start_time, 'In Progress'))
-            
-            self.current_task_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            self.current_task_id = self.repo.insert_task_start(today, task_name, start_time, category)
             
         except Exception as e:
             print(f'Save task start error: {e}')
 
+
+    def save_session_checkpoint(self):
+        """💾 진행 중인 세션 전체 상태 저장 (시작/휴식 등 상태 변경 시)"""
+        if not self.is_tracking or not self.current_task:
+            return
+        try:
+            now = time.monotonic()
+            pomodoro_elapsed = int(now - self.pomodoro_start) if self.pomodoro_start else None
+            session = ActiveSession(
+                record_id=self.current_task_id,
+                page_id=self.current_task.get('page_id'),
+                task_name=self.current_task.get('task_name', 'Untitled'),
+                task_type=self.current_task.get('type'),
+                task_time=self.current_task.get('time'),
+                priority=self.current_task.get('priority'),
+                elapsed_seconds=int(now - self.start_time),
+                pomodoro_mode=int(self.pomodoro_mode),
+                pomodoro_elapsed=pomodoro_elapsed,
+                pomodoro_count=self.pomodoro_count,
+                is_break_time=int(self.is_break_time)
+            )
+            self.repo.save_session(session, datetime.now().isoformat())
+            self.last_checkpoint = now
+        except Exception as e:
+            print(f'Save checkpoint error: {e}')
+
+    def tick_session_checkpoint(self):
+        """💾 주기적 체크포인트 - 경과 시간만 한 번의 UPDATE로 갱신"""
+        now = time.monotonic()
+        if now - self.last_checkpoint < self.checkpoint_interval:
+            return
+        try:
+            pomodoro_elapsed = int(now - self.pomodoro_start) if self.pomodoro_start else None
+            self.repo.tick_session(int(now - self.start_time), pomodoro_elapsed,
+                                   datetime.now().isoformat())
+            self.last_checkpoint = now
+        except Exception as e:
+            print(f'Tick checkpoint error: {e}')
+
+    def clear_session_checkpoint(self):
+        """💾 세션 종료 시 체크포인트 삭제"""
+        try:
+            self.repo.clear_session()
+        except Exception as e:
+            print(f'Clear checkpoint error: {e}')
+
+    def restore_active_session(self):
+        """💾 비정상 종료된 세션이 있으면 이어서 진행할지 묻기"""
+        try:
+            row = self.repo.get_session()
+        except Exception as e:
+            print(f'Restore checkpoint error: {e}')
+            return
+        if not row:
+            return
+        (record_id, page_id, task_name, task_type, task_time, priority, elapsed,
+         pomodoro_mode, pomodoro_elapsed, pomodoro_count, is_break_time) = row
+        elapsed = elapsed or 0
+        
+        resume = messagebox.askyesno(
+            '세션 복구',
+            f"이전에 진행 중이던 업무가 있습니다.\n\n"
+            f"'{task_name}' ({elapsed // 60}분 경과)\n\n"
+            f"이어서 진행할까요?"
+        )
+        if not resume:
+            # 고아 'In Progress' 기록은 경과 시간까지로 마감
+            try:
+                self.repo.close_orphan_record(record_id, datetime.now().strftime('%H:%M:%S'),
+                                              elapsed // 60, pomodoro_count or 0)
+            except Exception as e:
+                print(f'Close orphan record error: {e}')
+            self.clear_session_checkpoint()
+            self.add_log(f'🗑️ 이전 세션 종료 처리: {task_name}')
+            return
+        
+        now = time.monotonic()
+        self.current_task = {
+            'task_name': task_name,
+            'type': task_type,
+            'time': task_time,
+            'priority': priority,
+            'page_id': page_id
+        }
+        self.current_task_id = record_id
+        self.start_time = now - elapsed
+        self.is_tracking = True
+        self.pomodoro_count = pomodoro_count or 0
+        self.is_break_time = bool(is_break_time)
+        self.pomodoro_mode = bool(pomodoro_mode)
+        self.pomodoro_var.set(self.pomodoro_mode)
+        self.current_label.configure(text=f'진행중: {task_name}')
+        self.start_btn.configure(state="disabled")
+        self.complete_btn.configure(state="normal")
+        
+        if self.pomodoro_mode and pomodoro_elapsed is not None:
+            self.pomodoro_start = now - pomodoro_elapsed
+            if self.is_break_time:
+                remaining = max(0, self.break_duration - pomodoro_elapsed)
+                self.pomodoro_status.configure(text=f'☕ 휴식 중... ({self.break_duration//60}분)')
+                self.root.after(remaining * 1000, self.break_finished)
+            else:
+                remaining = max(0, self.pomodoro_duration - pomodoro_elapsed)
+                self.break_btn.configure(state="normal")
+                self.pomodoro_status.configure(text=f'집중 시간! ({self.pomodoro_duration//60}분)')
+                self.root.after(remaining * 1000, self.pomodoro_break_reminder)
+        
+        self.metrics.pomodoros += self.pomodoro_count
+        self.last_checkpoint = now
+        self.add_log(f'♻️ 세션 복구: {task_name} ({elapsed // 60}분부터 이어서)')
+
     def complete_task(self):
         if not self.is_tracking or not self.current_task:
             return
-        duration = int(time.time() - self.start_time)
+        duration = int(time.monotonic() - self.start_time)
         minutes = duration // 60
         task_name = self.current_task.get('task_name', 'Untitled')
         focus_rating = self.get_focus_rating(task_name, minutes)
@@ -761,6 +1007,7 @@ class SchedulerNotionTracker:
         # Notion Status를 Done으로 업데이트
         self.update_notion_status('Done', duration)
         self.save_task_completion(task_name, duration, focus_rating)
+        self.clear_session_checkpoint()
         self.current_label.configure(text='작업을 선택하세요')
         self.timer_label.configure(text='00:00:00', text_color="#4a9eff")
         self.pomodoro_status.configure(text='')
@@ -795,22 +1042,14 @@ class SchedulerNotionTracker:
     def save_task_completion(self, task_name, duration_seconds, focus_rating):
         """📊 업무 완료 데이터 저장"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             end_time = datetime.now().strftime('%H:%M:%S')
             minutes = duration_seconds // 60
             
             # 기존 레코드 업데이트
-            cursor.execute('''
-                UPDATE task_records 
-                SET end_time = ?, duration_minutes = ?, status = ?, 
-                    pomodoro_count = ?, focus_rating = ?
-                WHERE id = ?
-            ''', (end_time, minutes, 'Done', self.pomodoro_count, focus_rating, self.current_task_id))
-            
-            conn.commit()
-            conn.close()
+            self.repo.complete_task_record(self.current_task_id, end_time, minutes,
+                                           self.pomodoro_count, focus_rating)
+            started_at = datetime.now() - timedelta(seconds=duration_seconds)
+            self.metrics.on_task_complete(minutes, focus_rating, started_at.hour)
             
             # 일일 통계 업데이트
             self.update_daily_stats()
@@ -821,33 +1060,8 @@ class SchedulerNotionTracker:
     def update_daily_stats(self):
         """📊 일일 통계 업데이트"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             today = datetime.now().strftime('%Y-%m-%d')
-            
-            # 오늘의 통계 계산
-            cursor.execute('''
-                SELECT 
-                    COUNT(*) as total_tasks,
-                    COUNT(CASE WHEN status = 'Done' THEN 1 END) as completed_tasks,
-                    SUM(CASE WHEN status = 'Done' THEN duration_minutes ELSE 0 END) as total_work_minutes,
-                    AVG(CASE WHEN focus_rating > 0 THEN focus_rating END) as avg_focus_rating
-                FROM task_records 
-                WHERE date = ?
-            ''', (today,))
-            
-            stats = cursor.fetchone()
-            
-            # 일일 통계 저장/업데이트
-            cursor.execute('''
-                INSERT OR REPLACE INTO daily_stats 
-                (date, total_tasks, completed_tasks, total_work_minutes, avg_focus_rating)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (today, stats[0], stats[1], stats[2] or 0, stats[3] or 0))
-            
-            conn.commit()
-            conn.close()
+            self.repo.refresh_daily_stats(today)
             
         except Exception as e:
             print(f'Update daily stats error: {e}')
@@ -883,7 +1097,7 @@ class SchedulerNotionTracker:
         if self.is_tracking and self.start_time:
             if self.is_break_time and self.pomodoro_start:
                 # 휴식 시간 카운트다운
-                break_elapsed = int(time.time() - self.pomodoro_start)
+                break_elapsed = int(time.monotonic() - self.pomodoro_start)
                 remaining = max(0, self.break_duration - break_elapsed)
                 if remaining == 0:
                     self.break_finished()
@@ -892,48 +1106,149 @@ class SchedulerNotionTracker:
                 self.timer_label.configure(text=f'☕ {minutes:02d}:{seconds:02d}', text_color="#6f42c1")
             else:
                 # 일반 작업 시간
-                elapsed = int(time.time() - self.start_time)
+                elapsed = int(time.monotonic() - self.start_time)
                 hours = elapsed // 3600
                 minutes = (elapsed % 3600) // 60
                 seconds = elapsed % 60
                 if self.pomodoro_mode and self.pomodoro_start:
                     # 뽀모도로 모드: 25분 카운트다운
-                    pomodoro_elapsed = int(time.time() - self.pomodoro_start)
+                    pomodoro_elapsed = int(time.monotonic() - self.pomodoro_start)
                     pomodoro_remaining = max(0, self.pomodoro_duration - pomodoro_elapsed)
                     p_minutes = pomodoro_remaining // 60
                     p_seconds = pomodoro_remaining % 60
                     self.timer_label.configure(text=f'🍅 {p_minutes:02d}:{p_seconds:02d}', text_color="#ff6b6b")
                 else:
                     self.timer_label.configure(text=f'{hours:02d}:{minutes:02d}:{seconds:02d}', text_color="#4a9eff")
+            self.tick_session_checkpoint()
+        self.refresh_kpi_label()
+        self.refresh_ai_progress()
+        self.check_digest_time()
+        self.drain_log_queue()
         self.root.after(1000, self.update_timer)
 
+    def load_live_metrics(self):
+        """⚡ 시작 시 한 번 DB 집계로 실시간 지표 복원"""
+        try:
+            self.metrics.rehydrate(self.repo)
+        except Exception as e:
+            print(f'Load live metrics error: {e}')
+
+    def refresh_kpi_label(self):
+        """⚡ 메모리 지표로 KPI 표시 갱신 (DB 조회 없음, 바뀐 경우에만 다시 그림)"""
+        kpis = self.metrics.kpis()
+        minutes = kpis.total_minutes
+        if self.is_tracking and self.start_time and not self.is_break_time:
+            minutes += int(time.monotonic() - self.start_time) // 60
+        focus = f'{kpis.avg_focus:.1f}' if kpis.avg_focus is not None else '-'
+        trend = f'{kpis.ewma_focus:.1f}' if kpis.ewma_focus is not None else '-'
+        text = (f'⏱️ {minutes // 60}h {minutes % 60:02d}m  ·  ✅ {kpis.completed_tasks}/{kpis.started_tasks}'
+                f'  ·  💯 {focus} (추세 {trend})  ·  🍅 {kpis.pomodoros}  ·  🔥 {kpis.streak_days}일 연속')
+        if text != self.kpi_text:
+            self.kpi_text = text
+            self.kpi_label.configure(text=text)
+
+    def run_ai_task(self, title, work, on_result, join_running=False, on_failure=None):
+        """🤖 work(cancel_event) 를 AI 워커에서 실행하고, 끝나면 메인 루프에서 on_result(결과)
+
+        같은 작업이 이미 진행 중이면 새로 요청하지 않는다 (join_running 이면 그 결과를
+        함께 받는다). 취소된 작업의 결과는 버린다. on_failure 가 있으면 취소되면
+        on_failure(None), 오류면 on_failure(예외) 를 부른다 (진행 중 표시를 바꾸도록).
+        """
+        job = self.ai_jobs.find(title)
+        if job is not None and not join_running:
+            self.add_log(f'⏳ {title} 생성이 이미 진행 중입니다')
+            return None
+        job = job or self.ai_jobs.submit(title, work)
+        self.refresh_ai_progress()
+        
+        def deliver(future):
+            self.refresh_ai_progress()
+            if job.cancelled or future.cancelled():
+                if on_failure:
+                    on_failure(None)
+                return
+            if future.exception() is not None:
+                self.add_log(f'❌ {title} 오류: {future.exception()}')
+                if on_failure:
+                    on_failure(future.exception())
+                return
+            on_result(future.result())
+        
+        self.call_when_done(job.future, deliver)
+        return job
+    
+    def cancel_ai_jobs(self):
+        """⏹️ 진행 중인 AI 요청 취소 (이미 보낸 요청의 응답은 무시)"""
+        for job in self.ai_jobs.active():
+            job.cancel()
+            self.add_log(f'⏹️ {job.title} 취소됨')
+        self.refresh_ai_progress()
+    
+    def refresh_ai_progress(self):
+        """🤖 진행 중인 AI 요청 표시 갱신 (update_timer 에서 매초 호출)"""
+        jobs = self.ai_jobs.active()
+        if not jobs:
+            if self.ai_progress_text:
+                self.ai_progress_text = ''
+                self.ai_progress_bar.stop()
+                self.ai_progress_frame.pack_forget()
+            return
+        text = f'🤖 {jobs[0].title} 생성 중... {jobs[0].elapsed()}초'
+        if len(jobs) > 1:
+            text += f' (외 {len(jobs) - 1}건)'
+        if not self.ai_progress_text:
+            self.ai_progress_frame.pack(after=self.kpi_label, pady=(0, 10))
+            self.ai_progress_bar.start()
+        if text != self.ai_progress_text:
+            self.ai_progress_text = text
+            self.ai_progress_label.configure(text=text)
+    
     def get_daily_feedback(self):
-        """🤖 AI 일일 피드백 생성"""
+        """🤖 AI 일일 / 주간 / 월간 피드백 생성 (워커에서, 창을 바로 띄우고 받는 대로 채움)
+
+        오늘의 하루 정리가 이미 만들어져 있으면 (그 뒤로 기록이 바뀌지 않았다면) 그대로 보여준다.
+        """
+        label = self.feedback_period.get()
+        if FEEDBACK_PERIODS[label][0] == 'daily':
+            digest = self.repo.get_digest(datetime.now().strftime('%Y-%m-%d'))
+            if digest:
+                self.add_log('🌙 저장된 오늘의 하루 정리를 불러왔습니다')
+                self.show_feedback_window(digest, title='🤖 AI 일일 피드백')
+                return
+        
         if not self.openai_key:
             self.add_log('❌ OpenAI API 키가 설정되지 않았습니다')
             self.show_toast('❌ AI 설정 필요', 'OpenAI API 키를 .env 파일에 추가해주세요')
             return
         
         try:
-            self.add_log('🤖 AI 피드백 생성 중...')
-            self.show_toast('🤖 AI 분석 중', '오늘의 업무 패턴을 분석하고 있습니다...')
+            feedback_type, days = FEEDBACK_PERIODS[label]
             
-            # 오늘의 데이터 가져오기
-            today_data = self.get_today_analytics()
+            # 기간 데이터 가져오기
+            if feedback_type == 'daily':
+                today_data = self.get_today_analytics()
+                generate = self.generate_ai_feedback
+            else:
+                today_data = self.get_period_analytics(days)
+                generate = self.generate_period_feedback
             
             if not today_data:
-                self.add_log('📊 오늘의 데이터가 없습니다')
+                self.add_log(f'📊 {label} 데이터가 없습니다')
                 self.show_toast('📊 데이터 없음', '먼저 업무를 완료해주세요')
                 return
             
-            # AI 피드백 생성
-            feedback = self.generate_ai_feedback(today_data)
-            
-            # 피드백 창 표시
-            self.show_feedback_window(feedback)
+            self.add_log(f'🤖 AI {label} 피드백 생성 중...')
+            self.show_toast('🤖 AI 분석 중', f'{label} 업무 패턴을 분석하고 있습니다...')
             
-            # 데이터베이스에 저장
-            self.save_ai_feedback(feedback, 'daily')
+            # AI 피드백 생성 - 끝나면 데이터베이스에 저장
+            stream = TokenStream()
+            job = self.run_ai_task(
+                f'AI {label} 피드백',
+                lambda cancel: generate(today_data, stream, cancel),
+                lambda feedback: self.save_ai_feedback(feedback, feedback_type)
+            )
+            if job is not None:
+                self.show_feedback_window(stream, job, title=f'🤖 AI {label} 피드백')
             
         except Exception as e:
             self.add_log(f'❌ AI 피드백 오류: {e}')
@@ -941,32 +1256,14 @@ class SchedulerNotionTracker:
     
     def get_today_analytics(self):
         """📊 오늘의 분석 데이터 수집"""
+        return self.get_day_analytics(datetime.now().strftime('%Y-%m-%d'))
+    
+    def get_day_analytics(self, date):
+        """📊 하루(date) 의 분석 데이터 수집"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            today = datetime.now().strftime('%Y-%m-%d')
-            
-            # 업무 기록들
-            cursor.execute('''
-                SELECT task_name, start_time, end_time, duration_minutes, 
-                       focus_rating, pomodoro_count
-                FROM task_records 
-                WHERE date = ? AND status = 'Done'
-                ORDER BY start_time
-            ''', (today,))
-            
-            tasks = cursor.fetchall()
-            
-            # 일일 통계
-            cursor.execute('''
-                SELECT total_tasks, completed_tasks, total_work_minutes, avg_focus_rating
-                FROM daily_stats 
-                WHERE date = ?
-            ''', (today,))
-            
-            stats = cursor.fetchone()
-            conn.close()
+            # 업무 기록들 + 일일 통계
+            tasks = self.repo.get_done_tasks(date)
+            stats = self.repo.get_daily_stats(date)
             
             if not tasks and not stats:
                 return None
@@ -974,29 +1271,134 @@ class SchedulerNotionTracker:
             return {
                 'tasks': tasks,
                 'stats': stats,
-                'date': today
+                'date': date
             }
             
         except Exception as e:
             print(f'Get analytics error: {e}')
             return None
     
-    def generate_ai_feedback(self, data):
+    def get_period_analytics(self, days):
+        """📊 최근 days 일의 일일 요약 (주간 / 월간 피드백용)"""
+        try:
+            end = datetime.now()
+            start = (end - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+            history = [day for day in self.repo.get_recent_daily_stats(days) if day.date >= start]
+            if not any(day.completed_tasks for day in history):
+                return None
+            
+            return {
+                'days': tuple(history),
+                'start': start,
+                'end': end.strftime('%Y-%m-%d')
+            }
+            
+        except Exception as e:
+            print(f'Get period analytics error: {e}')
+            return None
+    
+    def generate_period_feedback(self, data, stream=None, cancel=None):
+        """🤖 주간 / 월간 피드백 - 일일 요약을 예산에 맞춰 일 / 주 / 월 단위로 접어서 전달"""
+        try:
+            days = data['days']
+            snapshot = self.analytics.snapshot(start=data['start'], end=data['end'])
+            model = self.llm.model
+            
+            total_minutes = sum(day.total_work_minutes or 0 for day in days)
+            completed = sum(day.completed_tasks or 0 for day in days)
+            rated = [day.avg_focus_rating for day in days if day.avg_focus_rating]
+            avg_focus = sum(rated) / len(rated) if rated else 0
+            golden = (f'{snapshot.golden.hour}시 (평균 집중도 {snapshot.golden.avg_focus:.1f})'
+                      if snapshot.golden else '데이터 부족')
+            categories = '\n'.join(fit_rows(
+                snapshot.categories,
+                lambda row: f'- {row.category}: {row.minutes}분',
+                lambda rest: f'- 그 외 {len(rest)}개 유형: {sum(row.minutes for row in rest)}분',
+                200, model
+            ))
+            
+            # 이 기간에 받은 일일 추천 (다시 LLM 에 옛 피드백 전체를 넣지 않고 저장된 항목만).
+            # 오늘 것과 주간 / 월간 피드백 자신의 추천은 빼서 프롬프트(캐시 키)가 매번 바뀌지 않게
+            yesterday = (datetime.strptime(data['end'], '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+            past = self.repo.get_feedback_items('recommendation', data['start'], yesterday, 'daily')
+            past_recommendations = '\n'.join(fit_rows(
+                past,
+                lambda item: f'- {item.date} [{item.label}] {item.text}',
+                lambda rest: f'- 그 외 추천 {len(rest)}개',
+                300, model
+            )) or '- 저장된 추천 없음'
+            
+            template = f"""
+당신은 생산성 전문가입니다. 다음 사용자의 기간 업무 기록을 분석하고 개인맞춤 피드백을 제공해주세요.
+
+**기간 요약 ({data['start']} ~ {data['end']})**
+- 기록한 날: {len(days)}일
+- 완료된 업무: {completed}개
+- 총 작업 시간: {total_minutes//60}시간 {total_minutes%60}분
+- 평균 집중도: {avg_focus:.1f}/5.0
+- 집중이 가장 잘 된 시간대: {golden}
+
+**작업 유형별 시간:**
+{categories}
+
+**기간 흐름:**
+{{days_summary}}
+
+**이 기간에 받은 일일 추천 (어제까지):**
+{past_recommendations}
+
+다음 관점에서 분석해주세요:
+1. **기간 성과 평가** (긍정적인 부분 강조)
+2. **요일 / 주별 패턴** (작업량과 집중도의 흐름)
+3. **시간 배분 분석** (작업 유형, 집중 시간대)
+4. **지난 추천의 실천 여부** (기록에 드러난 변화)
+5. **다음 기간을 위한 개선 제안과 목표**
+
+친근하고 격려하는 톤으로 작성해주세요. 이모지를 적절히 사용하여 읽기 쉽게 만들어주세요.
+{JSON_INSTRUCTIONS}"""
+            budget = AI_PROMPT_BUDGETS['period_feedback'] - count_tokens(template, model)
+            prompt = template.replace('{days_summary}', summarize_days(days, budget, model))
+            
+            return self.structured_feedback('period_feedback', prompt, prompt, 1200, stream, cancel)
+            
+        except Exception as e:
+            return f"AI 피드백 생성 중 오류가 발생했습니다: {str(e)}"
+    
+    def generate_ai_feedback(self, data, stream=None, cancel=None):
         """🤖 OpenAI를 사용한 피드백 생성"""
         try:
-            tasks_summary = "\n".join([
-                f"- {task[0]}: {task[1]}-{task[2] or 'ongoing'} "
-                f"({task[3] or 0}분, 집중도: {task[4] or 0}/5, 뽀모도로: {task[5] or 0}회)"
-                for task in data['tasks']
-            ])
-            
-            stats = data['stats']
-            total_tasks = stats[0] if stats else 0
-            completed_tasks = stats[1] if stats else 0
-            total_minutes = stats[2] if stats else 0
-            avg_focus = stats[3] if stats else 0
-            
-            prompt = f"""
+            prompt = self.build_daily_feedback_prompt(data)
+            return self.structured_feedback('daily_feedback', prompt, data, 1000, stream, cancel)
+            
+        except Exception as e:
+            return f"AI 피드백 생성 중 오류가 발생했습니다: {str(e)}"
+    
+    def structured_feedback(self, operation, prompt, key_data, max_tokens, stream=None, cancel=None):
+        """🧩 JSON 형식으로 피드백을 받아 검증한 Feedback (형식이 틀리면 FeedbackFormatError)
+
+        stream 에는 JSON 이 아니라 보여줄 텍스트가 채워진다. 형식이 틀린 응답은 캐시하지 않는다.
+        """
+        json_stream = FeedbackStream(stream) if stream is not None else None
+        
+        def create():
+            raw = self.llm.complete(prompt, max_tokens, operation=operation, stream=json_stream,
+                                    cancel=cancel, json_mode=True)
+            parse_feedback(raw)
+            return raw
+        
+        raw = self.cached_completion(operation, self.llm.model, key_data, create, stream=json_stream,
+                                     cancel=cancel)
+        return parse_feedback(raw)
+    
+    def build_daily_feedback_prompt(self, data):
+        """📝 하루 기록(get_day_analytics) 으로 일일 피드백 프롬프트 만들기"""
+        stats = data['stats']
+        total_tasks = stats[0] if stats else 0
+        completed_tasks = stats[1] if stats else 0
+        total_minutes = stats[2] if stats else 0
+        avg_focus = stats[3] if stats else 0
+        
+        template = f"""
 당신은 생산성 전문가입니다. 다음 사용자의 오늘 업무 데이터를 분석하고 개인맞춤 피드백을 제공해주세요.
 
 **오늘의 업무 현황 ({data['date']})**
@@ -1006,7 +1408,7 @@ class SchedulerNotionTracker:
 - 평균 집중도: {avg_focus:.1f}/5.0
 
 **완료된 업무 상세:**
-{tasks_summary}
+{{tasks_summary}}
 
 다음 관점에서 분석해주세요:
 1. **오늘의 성과 평가** (긍정적인 부분 강조)
@@ -1016,28 +1418,29 @@ class SchedulerNotionTracker:
 5. **내일을 위한 권장사항**
 
 친근하고 격려하는 톤으로 작성해주세요. 이모지를 적절히 사용하여 읽기 쉽게 만들어주세요.
-"""
-            
-            # OpenAI API 호출 (새로운 클라이언트 방식)
-            from openai import OpenAI
-            client = OpenAI(api_key=self.openai_key)
-            
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            return f"AI 피드백 생성 중 오류가 발생했습니다: {str(e)}"
+{JSON_INSTRUCTIONS}"""
+        
+        # 업무가 많은 날은 오래 걸린 업무부터 예산까지 넣고 나머지는 합계 한 줄로
+        def render(task):
+            return (f"- {task.task_name}: {task.start_time}-{task.end_time or 'ongoing'} "
+                    f"({task.duration_minutes or 0}분, 집중도: {task.focus_rating or 0}/5, "
+                    f"뽀모도로: {task.pomodoro_count or 0}회)")
+        
+        def collapse(rest):
+            rated = [t.focus_rating for t in rest if t.focus_rating]
+            focus = f'{sum(rated) / len(rated):.1f}' if rated else '-'
+            return (f"- 그 외 짧은 업무 {len(rest)}개: 총 {sum(t.duration_minutes or 0 for t in rest)}분, "
+                    f"평균 집중도 {focus}/5, 뽀모도로 {sum(t.pomodoro_count or 0 for t in rest)}회")
+        
+        budget = AI_PROMPT_BUDGETS['daily_feedback'] - count_tokens(template, self.llm.model)
+        ranked = sorted(data['tasks'], key=lambda t: -(t.duration_minutes or 0))
+        return template.replace('{tasks_summary}', '\n'.join(
+            fit_rows(ranked, render, collapse, budget, self.llm.model)))
     
-    def show_feedback_window(self, feedback):
-        """🤖 피드백 창 표시"""
+    def show_feedback_window(self, feedback, job=None, title='🤖 AI 일일 피드백'):
+        """🤖 피드백 창 표시 (job 이 있으면 feedback 은 TokenStream - 받는 대로 채움)"""
         feedback_window = tk.Toplevel(self.root)
-        feedback_window.title('🤖 AI 일일 피드백')
+        feedback_window.title(title)
         feedback_window.geometry('600x500')
         
         # 스크롤 가능한 텍스트
@@ -1053,8 +1456,7 @@ class SchedulerNotionTracker:
         
         scrollbar.config(command=text_widget.yview)
         
-        text_widget.insert(tk.END, feedback)
-        text_widget.config(state=tk.DISABLED)
+        self.fill_text_widget(text_widget, feedback, job)
         
         # 닫기 버튼
         close_btn = tk.Button(feedback_window, text='닫기', 
@@ -1062,159 +1464,420 @@ class SchedulerNotionTracker:
                             font=('Arial', 12, 'bold'))
         close_btn.pack(pady=10)
     
+    def fill_text_widget(self, text_widget, content, job=None, interval=80):
+        """🌊 문자열은 바로 넣고, TokenStream 은 interval(ms) 마다 쌓인 조각을 모아서 붙이기
+
+        job 이 끝나면 최종 결과(.text 가 있으면 그 텍스트)와 비교해 빠진 부분을 마저 붙이고,
+        받은 조각과 다르면 (구조화 응답 정리, 오류 메시지) 이 호출이 넣은 부분만 바꿔 쓴다.
+        """
+        shown = []
+        start = text_widget.index('end-1c')
+        
+        def append(text):
+            # 사용자가 위로 스크롤해 읽는 중이면 자동으로 내리지 않음
+            at_bottom = text_widget.yview()[1] >= 0.999
+            text_widget.config(state=tk.NORMAL)
+            text_widget.insert(tk.END, text)
+            text_widget.config(state=tk.DISABLED)
+            if at_bottom:
+                text_widget.see(tk.END)
+            shown.append(text)
+        
+        if job is None:
+            append(content)
+            return
+        
+        def pump():
+            if not text_widget.winfo_exists():
+                return
+            text = content.drain()
+            if text:
+                append(text)
+            if job.cancelled:
+                append('\n\n⏹️ 취소되었습니다')
+                return
+            if not job.future.done():
+                self.root.after(interval, pump)
+                return
+            if job.future.exception() is not None:
+                append(f'\n\n❌ 오류: {job.future.exception()}')
+                return
+            final = job.future.result()
+            final = getattr(final, 'text', final) or ''
+            so_far = ''.join(shown)
+            if not final.startswith(so_far):
+                text_widget.config(state=tk.NORMAL)
+                text_widget.delete(start, tk.END)
+                text_widget.config(state=tk.DISABLED)
+                so_far = ''
+            if final[len(so_far):]:
+                append(final[len(so_far):])
+        
+        pump()
+    
+    def on_ai_call(self, record):
+        """📈 AI 호출마다 지연시간 / 토큰 사용량 로그 (워커 스레드에서 호출됨)"""
+        if not record.ok:
+            return
+        first = f', 첫 응답 {record.first_token:.1f}초' if record.first_token is not None else ''
+        retry = f', 재시도 {record.attempts - 1}회' if record.attempts > 1 else ''
+        message = (f'📈 {record.operation}: {record.latency:.1f}초{first}, '
+                   f'토큰 {record.prompt_tokens}+{record.completion_tokens}{retry}')
+        self.post_log(message)
+    
+    def cached_completion(self, operation, model, data, create, ttl=None, stream=None, cancel=None):
+        """💾 (모델, 프롬프트 버전, 입력 데이터) 가 같으면 저장된 응답, 아니면 create() 호출
+
+        예외는 그대로 올라가고 저장되지 않는다 (오류 메시지가 캐시되지 않도록).
+        저장된 응답은 stream 에 한 번에 넣는다. 다른 서버(OPENAI_BASE_URL) 의 응답과는 섞이지 않는다.
+        같은 요청이 이미 진행 중이면 (버튼 / 하루 정리 / 대시보드가 겹칠 때) API 를 또 부르지 않고
+        그 응답을 기다렸다가 함께 받는다.
+        """
+        if self.llm.base_url:
+            model = f'{model}@{self.llm.base_url}'
+        version = AI_PROMPT_VERSIONS[operation]
+        
+        def compute():
+            return self.ai_cache.get_or_create(operation, model, version, data, create, ttl)
+        
+        (response, hit), shared = self.flights.call(f'ai:{operation}', (model, version, data),
+                                                    compute, cancel)
+        if (hit or shared) and stream is not None:
+            stream.append(response)
+        return response
+    
     def save_ai_feedback(self, feedback, feedback_type):
-        """🤖 AI 피드백 저장"""
+        """🤖 AI 피드백 저장 (인사이트 / 추천은 항목별로, 오류 메시지는 저장하지 않음)"""
+        if not isinstance(feedback, Feedback):
+            return
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             today = datetime.now().strftime('%Y-%m-%d')
-            
-            cursor.execute('''
-                INSERT INTO ai_feedback (date, feedback_type, content)
-                VALUES (?, ?, ?)
-            ''', (today, feedback_type, feedback))
-            
-            conn.commit()
-            conn.close()
+            self.repo.insert_ai_feedback(today, feedback_type, feedback.text, feedback)
             
             self.add_log('🤖 AI 피드백이 저장되었습니다')
             
         except Exception as e:
             print(f'Save feedback error: {e}')
     
+    def check_digest_time(self):
+        """🌙 시작 직후 빠진 날 정리, DIGEST_TIME 이 지나면 오늘 정리 (update_timer 에서 매초)"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        due = self.digest_time is not None and datetime.now().strftime('%H:%M') >= self.digest_time
+        if self.digest_day == today or (self.digest_backfilled and not due):
+            return
+        if self.ai_jobs.find(DIGEST_JOB) is not None:
+            return
+        self.digest_backfilled = True
+        if due:
+            self.digest_day = today
+        self.start_digest_job(include_today=due)
+    
+    def start_digest_job(self, include_today):
+        """🌙 하루 정리가 없는 최근 날짜 + (include_today 면) 오늘과 내일 예측을 한 번에 만들어 저장
+
+        정리할 것이 없으면 None. 결과는 워커에서 한 트랜잭션으로 저장된다.
+        """
+        now = datetime.now()
+        start = (now - timedelta(days=DIGEST_BACKFILL_DAYS)).strftime('%Y-%m-%d')
+        end = now if include_today else now - timedelta(days=1)
+        # 피드백은 AI 키가 있을 때만, 내일 예측은 로컬 계산이라 항상
+        dates = self.repo.get_undigested_dates(start, end.strftime('%Y-%m-%d')) if self.openai_key else ()
+        if not dates and not include_today:
+            return None
+        
+        def work(cancel):
+            rows, failed = [], []
+            for date in dates:
+                if cancel.is_set():
+                    break
+                data = self.get_day_analytics(date)
+                if not data:
+                    continue
+                try:
+                    feedback = self.generate_daily_digest(data, cancel)
+                    rows.append((date, 'daily', feedback.text, feedback))
+                except Exception as e:
+                    failed.append(f'{date} ({e})')
+            if include_today and not cancel.is_set():
+                forecast = self.generate_forecast_digest(cancel)
+                if forecast:
+                    rows.append(forecast)
+            if rows:
+                self.repo.save_digests(rows).result()
+            return rows, failed
+        
+        def done(result):
+            rows, failed = result
+            days = sum(1 for row in rows if row[1] == 'daily')
+            if days:
+                self.add_log(f'🌙 하루 정리 {days}일치를 저장했습니다')
+            if failed:
+                self.add_log(f"❌ 하루 정리 실패: {', '.join(failed)}")
+        
+        return self.run_ai_task(DIGEST_JOB, work, done)
+    
+    def generate_daily_digest(self, data, cancel=None):
+        """🌙 하루 정리 피드백 - 일일 피드백과 같은 프롬프트 / 캐시
+
+        generate_ai_feedback 과 달리 예외를 그대로 올려서 오류 메시지가 저장되지 않게 한다.
+        """
+        prompt = self.build_daily_feedback_prompt(data)
+        return self.structured_feedback('daily_feedback', prompt, data, 1000, cancel=cancel)
+    
+    def generate_forecast_digest(self, cancel=None):
+        """🌙 내일 예측 (date, 'forecast', 내용, None) - 키가 있으면 AI 해설까지 붙임, 데이터가 부족하면 None"""
+        data = self.collect_prediction_data()
+        if not data or data['forecast'] is None:
+            return None
+        forecast = data['forecast']
+        content = format_forecast(forecast)
+        if self.openai_key:
+            prompt = self.build_prediction_prompt(data)
+            
+            def create():
+                return self.llm.complete(prompt, 1500, operation='prediction', cancel=cancel)
+            
+            try:
+                key_data = {'forecast': forecast, 'goal': data['current_goals']}
+                narration = self.cached_completion('prediction', self.llm.model, key_data, create,
+                                                   cancel=cancel)
+                content += f'\n\n🤖 AI 해설\n\n{narration}'
+            except Exception as e:
+                print(f'Forecast narration error: {e}')
+        return forecast.date, 'forecast', content, None
+    
+    def finish_digest_on_exit(self):
+        """🌙 종료 전에 오늘 정리가 아직이면 만들고 저장될 때까지 (최대 DIGEST_EXIT_TIMEOUT 초) 기다림"""
+        today = datetime.now().strftime('%Y-%m-%d')
+        tomorrow = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+        
+        def missing():
+            pending = self.openai_key and self.repo.get_undigested_dates(today, today)
+            return pending or not self.repo.get_latest_ai_feedback(tomorrow, 'forecast')
+        
+        if not missing():
+            return
+        running = self.ai_jobs.find(DIGEST_JOB)
+        if running is not None:
+            # 진행 중이던 정리가 오늘 것까지 만들었으면 다시 시작하지 않음
+            if wait([running.future], timeout=DIGEST_EXIT_TIMEOUT).not_done:
+                running.cancel()
+                return
+            if not missing():
+                return
+        self.digest_day = today
+        job = self.start_digest_job(include_today=True)
+        if job is None:
+            return
+        self.root.withdraw()
+        if wait([job.future], timeout=DIGEST_EXIT_TIMEOUT).not_done:
+            job.cancel()
+    
     def show_analytics(self):
-        """Show statistics dashboard window (English version)"""
+        """Show statistics dashboard window (English version)
+
+        Each tab is rendered only when it is first selected. Charts are drawn
+        with Agg on a worker thread into long-lived figures and swapped in for
+        the placeholder. The range selector re-renders the chart tabs for the
+        chosen period; the trend switches to weekly/monthly points for long
+        ranges so a year costs about as much as a week.
+        """
         try:
             analytics_win = tk.Toplevel(self.root)
             analytics_win.title('Statistics Dashboard')
             analytics_win.geometry('1100x800')
+
+            # 📅 Range selector
+            range_frame = tk.Frame(analytics_win)
+            range_frame.pack(fill='x', padx=10, pady=5)
+            tk.Label(range_frame, text='Range:', font=('Arial', 11)).pack(side='left')
+            range_names = [name.capitalize() for name in RANGE_PRESETS] + ['Custom']
+            range_var = tk.StringVar(value=range_names[0])
+            range_box = ttk.Combobox(range_frame, textvariable=range_var, values=range_names,
+                                     state='readonly', width=10)
+            range_box.pack(side='left', padx=5)
+            default_start, default_end = preset_range('week')
+            start_var = tk.StringVar(value=default_start)
+            end_var = tk.StringVar(value=default_end)
+            start_entry = tk.Entry(range_frame, textvariable=start_var, width=12, state='disabled')
+            start_entry.pack(side='left', padx=(10, 0))
+            tk.Label(range_frame, text='~').pack(side='left', padx=3)
+            end_entry = tk.Entry(range_frame, textvariable=end_var, width=12, state='disabled')
+            end_entry.pack(side='left')
+            apply_btn = tk.Button(range_frame, text='Apply')
+            apply_btn.pack(side='left', padx=10)
+
             tab_control = ttk.Notebook(analytics_win)
             tab_control.pack(fill='both', expand=True)
 
-            # 1. Hourly Focus Heatmap
-            frame1 = tk.Frame(tab_control)
-            tab_control.add(frame1, text='Hourly Focus Heatmap')
-            self.create_focus_heatmap(frame1)
+            tabs = [
+                ('Hourly Focus Heatmap', self.charts['heatmap']),    # 1
+                ('Category Distribution', self.charts['category']),  # 2
+                ('Focus Trend', self.charts['trend']),               # 3
+                ('AI Feedback', None),                               # 4
+            ]
+            pages = []
+            for title, chart in tabs:
+                frame = tk.Frame(tab_control)
+                tab_control.add(frame, text=title)
+                pages.append((frame, chart))
+
+            state = {'range': (default_start, default_end)}
+            rendered = set()
+
+            def on_tab_changed(event=None):
+                index = tab_control.index(tab_control.select())
+                if index in rendered:
+                    return
+                rendered.add(index)
+                frame, chart = pages[index]
+                for child in frame.winfo_children():
+                    child.destroy()
+                loading_text = 'Generating AI feedback...' if chart is None else 'Loading...'
+                placeholder = tk.Label(frame, text=loading_text, font=('Arial', 14))
+                placeholder.pack(expand=True)
+                if chart is None:
+                    self.render_ai_feedback_tab(frame, placeholder)
+                else:
+                    self.render_chart_tab(frame, placeholder, chart, *state['range'])
 
-            # 2. Category Distribution
-            frame2 = tk.Frame(tab_control)
-            tab_control.add(frame2, text='Category Distribution')
-            self.create_type_pie_chart(frame2)
+            def on_range_selected(event=None):
+                name = range_var.get().lower()
+                custom = name == 'custom'
+                start_entry.config(state='normal' if custom else 'disabled')
+                end_entry.config(state='normal' if custom else 'disabled')
+                if not custom:
+                    start, end = preset_range(name)
+                    start_var.set(start)
+                    end_var.set(end)
+                    apply_range()
 
-            # 3. Weekly Trend
-            frame3 = tk.Frame(tab_control)
-            tab_control.add(frame3, text='Weekly Trend')
-            self.create_weekly_trend(frame3)
+            def apply_range():
+                start, end = start_var.get().strip(), end_var.get().strip()
+                try:
+                    if datetime.strptime(start, '%Y-%m-%d') > datetime.strptime(end, '%Y-%m-%d'):
+                        raise ValueError
+                except ValueError:
+                    messagebox.showerror('Range', 'Enter dates as YYYY-MM-DD (start <= end).',
+                                         parent=analytics_win)
+                    return
+                state['range'] = (start, end)
+                # AI 요약은 기간과 무관하므로 차트 탭만 다시 그린다
+                rendered.difference_update(
+                    i for i, (_, chart) in enumerate(pages) if chart is not None
+                )
+                on_tab_changed()
 
-            # 4. AI Feedback
-            frame4 = tk.Frame(tab_control)
-            tab_control.add(frame4, text='AI Feedback')
-            self.create_ai_feedback_tab(frame4)
+            range_box.bind('<<ComboboxSelected>>', on_range_selected)
+            apply_btn.config(command=apply_range)
+            tab_control.bind('<<NotebookTabChanged>>', on_tab_changed)
+            on_tab_changed()
 
         except Exception as e:
             self.add_log(f'❌ Error showing statistics: {e}')
-    
-    def create_focus_heatmap(self, parent):
-        import pandas as pd
-        conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql_query('SELECT * FROM task_records', conn)
-        conn.close()
-        if df.empty or 'start_time' not in df.columns or 'focus_rating' not in df.columns:
-            label = tk.Label(parent, text='Not enough data.', font=('Arial', 14))
-            label.pack()
-            return
-        df['hour'] = pd.to_datetime(df['start_time'], errors='coerce').dt.hour
-        heatmap_data = df.groupby('hour')['focus_rating'].mean().reindex(range(24), fill_value=0)
-        plt.figure(figsize=(8,2))
-        sns.heatmap([heatmap_data.values], cmap='YlGnBu', annot=True, cbar=True, xticklabels=range(24), yticklabels=['Focus'])
-        plt.title('Average Focus by Hour')
-        fig = plt.gcf()
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
-        plt.close(fig)
-
-    def create_type_pie_chart(self, parent):
-        import pandas as pd
-        conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql_query('SELECT * FROM task_records', conn)
-        conn.close()
-        if df.empty or 'type' not in df.columns or 'duration_minutes' not in df.columns:
-            label = tk.Label(parent, text='Not enough data.', font=('Arial', 14))
-            label.pack()
-            return
-        type_sum = df.groupby('type')['duration_minutes'].sum()
-        plt.figure(figsize=(5,5))
-        plt.pie(type_sum, labels=type_sum.index, autopct='%1.1f%%', startangle=90)
-        plt.title('Time Spent by Category')
-        fig = plt.gcf()
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
-        plt.close(fig)
-
-    def create_weekly_trend(self, parent):
-        import pandas as pd
-        conn = sqlite3.connect(self.db_path)
-        df = pd.read_sql_query('SELECT * FROM daily_stats', conn)
-        conn.close()
-        if df.empty or 'date' not in df.columns:
-            label = tk.Label(parent, text='Not enough data.', font=('Arial', 14))
-            label.pack()
-            return
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.sort_values('date').tail(7)
-        plt.figure(figsize=(8,4))
-        plt.plot(df['date'], df['avg_focus_rating'], marker='o', label='Avg. Focus')
-        plt.plot(df['date'], df['completed_tasks']/df['total_tasks'], marker='s', label='Goal Achievement Rate')
-        plt.ylim(0, 1.1)
-        plt.legend()
-        plt.title('Last 7 Days: Focus & Goal Achievement')
-        plt.xlabel('Date')
-        plt.ylabel('Rate/Score')
-        fig = plt.gcf()
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
-        plt.close(fig)
-
-    def create_ai_feedback_tab(self, parent):
-        import tkinter as tk
-        feedback = self.generate_dashboard_ai_feedback()
+
+    def call_when_done(self, future, callback, interval=50):
+        """⏳ 워커의 Future 가 끝나면 Tk 메인 루프에서 callback(future) 호출"""
+        def poll():
+            if future.done():
+                callback(future)
+            else:
+                self.root.after(interval, poll)
+        self.root.after(interval, poll)
+
+    def render_chart_tab(self, parent, placeholder, chart, start=None, end=None):
+        """📊 차트를 워커 스레드에서 PNG 로 그리고 준비되면 placeholder 교체
+
+        차트 Figure 는 재사용되며 데이터 버전(기간 포함)이 바뀌었을 때만 다시 그린다.
+        """
+        def work():
+            return chart.render(self.analytics.snapshot(start=start, end=end))
+
+        def show(future):
+            # 창이 닫혔거나 기간이 바뀌어 이미 다른 렌더가 placeholder 를 치웠으면 무시
+            if not placeholder.winfo_exists():
+                return
+            placeholder.destroy()
+            if future.exception() is not None:
+                tk.Label(parent, text=f'Chart error: {future.exception()}',
+                         font=('Arial', 12)).pack()
+                return
+            png = future.result()
+            if png is None:
+                label = tk.Label(parent, text='Not enough data.', font=('Arial', 14))
+                label.pack()
+                return
+            image = ImageTk.PhotoImage(Image.open(BytesIO(png)))
+            label = tk.Label(parent, image=image)
+            label.image = image  # GC 방지
+            label.pack(fill='both', expand=True)
+
+        self.call_when_done(self.chart_pool.submit(work), show)
+
+    def render_ai_feedback_tab(self, parent, placeholder):
+        """🤖 AI 요약은 별도 워커에서 생성 - 첫 화면 표시를 막지 않음"""
+        def work(cancel):
+            end = datetime.now()
+            start = (end - timedelta(days=14)).strftime('%Y-%m-%d')
+            recommendations = self.repo.get_feedback_items('recommendation', start,
+                                                           end.strftime('%Y-%m-%d'))
+            feedback = self.generate_dashboard_ai_feedback(self.analytics.snapshot(), cancel)
+            return feedback, recommendations
+
+        def show(result):
+            if not parent.winfo_exists():
+                return
+            placeholder.destroy()
+            self.create_ai_feedback_tab(parent, *result)
+
+        def failed(error):
+            if not placeholder.winfo_exists():
+                return
+            if error is None:
+                placeholder.configure(text='AI summary cancelled.')
+            else:
+                placeholder.configure(text=f'AI feedback generation error: {error}')
+
+        self.run_ai_task('대시보드 AI 요약', work, show, join_running=True, on_failure=failed)
+
+    def create_ai_feedback_tab(self, parent, feedback, recommendations=()):
         text = tk.Text(parent, wrap='word', font=('Arial', 12))
         if not feedback or '데이터가 부족' in feedback or 'AI 피드백' in feedback:
             feedback = 'No feedback data available.'
         text.insert('1.0', feedback)
+        if recommendations:
+            # Stored daily / period feedback items - no need to ask the LLM again
+            lines = [f'- {item.date} ({item.label}) {item.text}' for item in recommendations[:15]]
+            text.insert('end', '\n\nRecent recommendations (last 14 days)\n' + '\n'.join(lines))
+        usage = self.llm.usage_summary()
+        if usage:
+            # Per-operation totals for the AI calls made since the app started
+            lines = [f'- {op}: {calls} calls ({failed} failed), avg {latency:.1f}s, '
+                     f'tokens {prompt}+{completion}'
+                     for op, (calls, failed, latency, prompt, completion) in sorted(usage.items())]
+            text.insert('end', '\n\nAI usage this session\n' + '\n'.join(lines))
         text.config(state='disabled')
         text.pack(fill='both', expand=True, padx=10, pady=10)
 
-    def generate_dashboard_ai_feedback(self):
+    def generate_dashboard_ai_feedback(self, snapshot=None, cancel=None):
         # Summarize last 7 days focus, category distribution, golden hour, etc. for GPT
-        import pandas as pd
-        conn = sqlite3.connect(self.db_path)
-        df_task = pd.read_sql_query('SELECT * FROM task_records', conn)
-        df_stats = pd.read_sql_query('SELECT * FROM daily_stats', conn)
-        conn.close()
-        if df_task.empty or df_stats.empty:
+        if not self.openai_key:
+            return 'OpenAI API key is not set. Add OPENAI_API_KEY to .env to get AI feedback.'
+        snapshot = snapshot or self.analytics.snapshot()
+        trend = snapshot.trend
+        if not snapshot.hours or not trend:
             return 'No feedback data available.'
         # Golden hour
-        df_task['hour'] = pd.to_datetime(df_task['start_time'], errors='coerce').dt.hour
-        focus_by_hour = df_task.groupby('hour')['focus_rating'].mean().dropna()
-        if not focus_by_hour.empty:
-            golden_hour = focus_by_hour.idxmax()
-            golden_score = focus_by_hour.max()
-            golden_str = f"Golden hour: {golden_hour}:00 (Avg. focus {golden_score:.2f})"
+        golden = snapshot.golden
+        if golden:
+            golden_str = f"Golden hour: {golden.hour}:00 (Avg. focus {golden.avg_focus:.2f})"
         else:
             golden_str = "No golden hour data."
         # Category distribution
-        type_sum = df_task.groupby('type')['duration_minutes'].sum()
-        type_str = ', '.join([f"{k}: {v} min" for k,v in type_sum.items()])
+        type_str = ', '.join([f"{row.category}: {row.minutes} min" for row in snapshot.categories])
         # Weekly focus/goal
-        df_stats['date'] = pd.to_datetime(df_stats['date'])
-        df_stats = df_stats.sort_values('date').tail(7)
-        avg_focus = df_stats['avg_focus_rating'].mean()
-        avg_goal = (df_stats['completed_tasks']/df_stats['total_tasks']).mean()
+        avg_focus = sum(day.avg_focus for day in trend) / len(trend)
+        avg_goal = sum(day.completion_rate for day in trend) / len(trend)
         # Prompt
         prompt = f"""
 You are a productivity coach. Based on the following data, analyze the user's work pattern for today/this week, and summarize golden hour, category time distribution, focus/goal trends, and give friendly feedback and suggestions in 5 lines or less. No emojis.
@@ -1224,16 +1887,12 @@ You are a productivity coach. Based on the following data, analyze the user's wo
 - Last 7 days avg. focus: {avg_focus:.2f}
 - Last 7 days goal achievement: {avg_goal*100:.1f}%
 """
+        def create():
+            return self.llm.complete(prompt, 500, operation='dashboard_feedback', cancel=cancel)
+        
         try:
-            import openai
-            openai.api_key = self.openai_key
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=500,
-                temperature=0.7
-            )
-            return response['choices'][0]['message']['content']
+            return self.cached_completion('dashboard_feedback', self.llm.model, prompt, create,
+                                          cancel=cancel)
         except Exception as e:
             return f'AI feedback generation error: {e}'
     
@@ -1368,20 +2027,9 @@ You are a productivity coach. Based on the following data, analyze the user's wo
             
             today = datetime.now().strftime('%Y-%m-%d')
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 기존 목표 업데이트 또는 새로 생성
-            cursor.execute('''
-                INSERT OR REPLACE INTO goals 
-                (goal_type, date_range, target_work_hours, target_tasks, 
-                 target_focus_avg, target_pomodoros, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', ('daily', today, work_hours, tasks, focus, pomodoros, 
-                  datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
+            self.repo.save_goal('daily', today, datetime.now().isoformat(),
+                                target_work_hours=work_hours, target_tasks=tasks,
+                                target_focus_avg=focus, target_pomodoros=pomodoros)
             
             self.add_log('💾 일일 목표가 저장되었습니다!')
             self.show_toast('💾 목표 저장', '오늘의 목표가 설정되었습니다!')
@@ -1394,17 +2042,7 @@ You are a productivity coach. Based on the following data, analyze the user's wo
         try:
             today = datetime.now().strftime('%Y-%m-%d')
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT target_work_hours, target_tasks, target_focus_avg, target_pomodoros
-                FROM goals 
-                WHERE goal_type = 'daily' AND date_range = ?
-            ''', (today,))
-            
-            result = cursor.fetchone()
-            conn.close()
+            result = self.repo.get_goal('daily', today)
             
             if result:
                 self.daily_work_hours.delete(0, tk.END)
@@ -1432,17 +2070,8 @@ You are a productivity coach. Based on the following data, analyze the user's wo
             today = datetime.now()
             week_str = today.strftime('%Y-W%U')
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO goals 
-                (goal_type, date_range, target_work_hours, target_tasks, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', ('weekly', week_str, work_hours, tasks, datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
+            self.repo.save_goal('weekly', week_str, datetime.now().isoformat(),
+                                target_work_hours=work_hours, target_tasks=tasks)
             
             self.add_log('💾 주간 목표가 저장되었습니다!')
             self.show_toast('💾 주간 목표', '이번 주 목표가 설정되었습니다!')
@@ -1459,30 +2088,14 @@ You are a productivity coach. Based on the following data, analyze the user's wo
             
             today = datetime.now().strftime('%Y-%m-%d')
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # 오늘의 실제 성과 가져오기
-            cursor.execute('''
-                SELECT total_work_minutes, completed_tasks, avg_focus_rating
-                FROM daily_stats 
-                WHERE date = ?
-            ''', (today,))
-            
-            actual = cursor.fetchone()
-            actual_work_hours = (actual[0] / 60) if actual and actual[0] else 0
-            actual_tasks = actual[1] if actual and actual[1] else 0
-            actual_focus = actual[2] if actual and actual[2] else 0
+            actual = self.repo.get_daily_stats(today)
+            actual_work_hours = (actual.total_work_minutes / 60) if actual and actual.total_work_minutes else 0
+            actual_tasks = actual.completed_tasks if actual and actual.completed_tasks else 0
+            actual_focus = actual.avg_focus_rating if actual and actual.avg_focus_rating else 0
             
             # 오늘의 목표 가져오기
-            cursor.execute('''
-                SELECT target_work_hours, target_tasks, target_focus_avg, target_pomodoros
-                FROM goals 
-                WHERE goal_type = 'daily' AND date_range = ?
-            ''', (today,))
-            
-            target = cursor.fetchone()
-            conn.close()
+            target = self.repo.get_goal('daily', today)
             
             if target:
                 target_work, target_tasks_count, target_focus, target_pomodoros = target
@@ -1534,44 +2147,82 @@ You are a productivity coach. Based on the following data, analyze the user's wo
                      font=('Arial', 12)).pack(pady=50)
     
     def get_smart_schedule(self):
-        """🔄 AI 스마트 일정 추천"""
-        if not self.openai_key:
-            self.add_log('❌ OpenAI API 키가 설정되지 않았습니다')
-            self.show_toast('❌ AI 설정 필요', 'OpenAI API 키를 .env 파일에 추가해주세요')
+        """🔄 스마트 일정 추천 - 순서는 로컬 최적화로, AI 는 (키가 있으면) 설명만
+
+        집중도 집계는 차트 워커에서 (대시보드 '월' 범위와 같은 캐시된 스냅샷) 읽는다.
+        계산 중이거나 추천 창이 열려 있으면 (더블클릭) 추천을 또 만들지 않는다.
+        """
+        if self.schedule_pending or self.ai_jobs.find('AI 일정 설명') is not None:
+            self.add_log('⏳ 스마트 일정을 이미 만드는 중입니다')
+            return
+        if self.schedule_window is not None and self.schedule_window.winfo_exists():
+            self.schedule_window.lift()
             return
         
-        try:
-            self.add_log('🔄 AI 스마트 일정 생성 중...')
-            self.show_toast('🔄 AI 분석 중', '최적의 업무 순서를 분석하고 있습니다...')
-            
-            # 오늘의 업무 목록 가져오기
-            today_tasks = self.get_today_tasks()
-            if not today_tasks:
-                self.add_log('📝 오늘 등록된 업무가 없습니다')
-                self.show_toast('📝 업무 없음', '먼저 노션에 오늘의 업무를 등록해주세요')
-                return
-            
-            # AI 일정 추천 생성
-            schedule_suggestion = self.generate_smart_schedule(today_tasks)
-            
-            # 스마트 일정 창 표시
-            self.show_smart_schedule_window(schedule_suggestion, today_tasks)
-            
-            # 데이터베이스에 저장
-            self.save_schedule_suggestion(schedule_suggestion)
-            
-        except Exception as e:
-            self.add_log(f'❌ 스마트 일정 오류: {e}')
-            self.show_toast('❌ AI 오류', f'일정 생성 실패: {str(e)[:50]}')
+        # 오늘의 업무 목록 가져오기 (self.tasks 는 메인 스레드에서 읽기)
+        today_tasks = self.get_today_tasks()
+        if not today_tasks:
+            self.add_log('📝 오늘 등록된 업무가 없습니다')
+            self.show_toast('📝 업무 없음', '먼저 노션에 오늘의 업무를 등록해주세요')
+            return
+        
+        def work():
+            # 최근 30일 시간대별 집중도 (업무 2개 이상 기록된 시간대만)
+            start, end = preset_range('month')
+            hours = self.analytics.snapshot(start=start, end=end).hours
+            hour_focus = {row.hour: row.avg_focus for row in hours
+                          if row.avg_focus is not None and row.task_count >= 2}
+            return optimize_schedule(today_tasks, hour_focus)
+        
+        def done(future):
+            self.schedule_pending = False
+            try:
+                plan = future.result()
+                
+                # 데이터베이스에 JSON 계획 저장 (Future 결과가 추천 id)
+                suggestion_id = self.repo.insert_schedule_suggestion(
+                    plan['date'], plan_to_json(plan), '로컬 최적화 (우선순위 / 마감 / 집중 시간대)'
+                )
+                self.add_log(f"🔄 스마트 일정: 업무 {len(plan['items'])}개 배치")
+                
+                stream = job = None
+                if self.openai_key and plan['items']:
+                    # AI 설명은 창 아래에 받는 대로 채우고, 성공하면 추천 이유로 저장
+                    stream = TokenStream()
+                    job = self.run_ai_task(
+                        'AI 일정 설명',
+                        lambda cancel: self.generate_smart_schedule(plan, stream, cancel),
+                        lambda reasoning: self.repo.update_schedule_reasoning(suggestion_id, reasoning)
+                    )
+                self.schedule_window = self.show_smart_schedule_window(plan, suggestion_id, stream, job)
+                
+            except Exception as e:
+                self.add_log(f'❌ 스마트 일정 오류: {e}')
+                self.show_toast('❌ 일정 오류', f'일정 생성 실패: {str(e)[:50]}')
+        
+        self.schedule_pending = True
+        self.call_when_done(self.chart_pool.submit(work), done)
     
     def get_today_tasks(self):
-        """📝 오늘의 업무 목록 가져오기"""
+        """📝 오늘 예정된, 아직 끝나지 않은 업무 목록 (업무 표와 같은 기준)"""
         try:
             if not self.tasks:
                 return None
             
+            today = datetime.now().date()
             tasks_info = []
             for task in self.tasks:
+                # 오늘 날짜의 업무만 (노션 DB 전체가 아니라)
+                time_prop = task['properties'].get('Time')
+                if not (time_prop and time_prop.get('date') and time_prop['date'].get('start')):
+                    continue
+                try:
+                    scheduled = datetime.fromisoformat(time_prop['date']['start'].replace('Z', '+00:00'))
+                except ValueError:
+                    continue
+                if scheduled.date() != today:
+                    continue
+                
                 task_name = 'Untitled'
                 if (task['properties'].get('Task') and 
                     task['properties']['Task'].get('title') and 
@@ -1595,11 +2246,23 @@ You are a productivity coach. Based on the following data, analyze the user's wo
                     task['properties']['Status'].get('select')):
                     status = task['properties']['Status']['select']['name']
                 
+                if status in ('Done', '완료'):
+                    continue
+                
+                # 마감 (있으면) - 날짜만 있으면 그날 끝까지
+                deadline = None
+                deadline_prop = task['properties'].get('Deadline')
+                if deadline_prop and deadline_prop.get('date'):
+                    deadline = deadline_prop['date'].get('start')
+                
                 tasks_info.append({
+                    'page_id': task['id'],
                     'name': task_name,
                     'duration': duration,
                     'priority': priority,
-                    'status': status
+                    'status': status,
+                    'time': scheduled.strftime('%H:%M'),
+                    'deadline': deadline
                 })
             
             return tasks_info
@@ -1608,122 +2271,102 @@ You are a productivity coach. Based on the following data, analyze the user's wo
             print(f'Get today tasks error: {e}')
             return None
     
-    def generate_smart_schedule(self, tasks):
-        """🔄 AI 기반 스마트 일정 생성"""
-        try:
-            # 과거 생산성 패턴 분석
-            productivity_pattern = self.analyze_productivity_pattern()
-            
-            # 현재 시간과 남은 시간 계산
-            now = datetime.now()
-            current_time = now.strftime('%H:%M')
-            
-            # 업무 목록 정리
-            task_list = "\n".join([
-                f"- {task['name']} (예상: {task['duration']}분, 우선순위: {task['priority']}, 상태: {task['status']})"
-                for task in tasks
-            ])
-            
-            prompt = f"""
-당신은 생산성 전문가입니다. 다음 정보를 바탕으로 최적의 업무 순서를 추천해주세요.
+    def generate_smart_schedule(self, plan, stream=None, cancel=None):
+        """🤖 로컬에서 정한 일정을 AI 가 설명 (순서는 바꾸지 않음)
 
-**현재 상황**
-- 현재 시간: {current_time}
-- 오늘 남은 업무들:
-{task_list}
+        실패하면 예외를 그대로 올린다 (오류 메시지가 추천 이유로 저장되지 않도록).
+        """
+        # 과거 생산성 패턴 분석
+        productivity_pattern = self.analyze_productivity_pattern()
+        
+        template = f"""
+당신은 생산성 전문가입니다. 아래는 사용자의 우선순위, 마감, 집중이 잘 되는 시간대를 반영해
+이미 계산된 오늘의 업무 순서입니다. 순서와 시각은 바꾸지 말고, 왜 이 배치가 좋은지 설명해주세요.
+
+**추천 업무 순서** (시작-끝, 뽀모도로 횟수, 배치 이유)
+{{plan_items}}
 
 **생산성 패턴 분석**
 {productivity_pattern}
 
-**추천 기준**
-1. 생산성이 높은 시간대에 중요하고 어려운 업무 배치
-2. 에너지 소모가 큰 업무 후엔 가벼운 업무 배치
-3. 뽀모도로 기법 고려 (25분 단위)
-4. 우선순위와 예상 소요시간 고려
-
 다음 형식으로 답변해주세요:
 
-**🔄 추천 업무 순서**
-1. [시간] 업무명 (소요시간, 이유)
-2. [시간] 업무명 (소요시간, 이유)
-...
-
-**📋 추천 이유**
+**📋 배치 설명**
 - 전체적인 배치 논리
 - 생산성 최적화 포인트
 
 **💡 추가 조언**
 - 효율성 향상을 위한 팁
+- 오늘 시간에 들어가지 않은 업무가 있다면 다루는 방법
 """
-            
-            # OpenAI API 호출
-            from openai import OpenAI
-            client = OpenAI(api_key=self.openai_key)
-            
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1200,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            return f"스마트 일정 생성 중 오류가 발생했습니다: {str(e)}"
-    
+        
+        # 계획이 길면 앞쪽 업무부터 예산까지, 나머지는 합계 한 줄로
+        def render(item):
+            return (f"- [{item['start']}-{item['end']}] {item['name']} "
+                    f"(🍅 {item['pomodoros']}회, {item['reason']})")
+        
+        def collapse(rest):
+            return f"- 이후 업무 {len(rest)}개 ({rest[0]['start']}부터, 🍅 {sum(i['pomodoros'] for i in rest)}회)"
+        
+        items = plan['items']
+        budget = AI_PROMPT_BUDGETS['smart_schedule'] - count_tokens(template, self.llm.model)
+        plan_items = "\n".join(fit_rows(items, render, collapse, budget, self.llm.model))
+        if plan['unscheduled']:
+            plan_items += f"\n- 오늘 시간에 들어가지 않은 업무 {len(plan['unscheduled'])}개"
+        prompt = template.replace('{plan_items}', plan_items)
+        
+        # OpenAI API 호출
+        model = self.llm.model
+        
+        def create():
+            return self.llm.complete(prompt, 800, operation='smart_schedule',
+                                     stream=stream, cancel=cancel)
+        
+        return self.cached_completion('smart_schedule', model, prompt, create, stream=stream,
+                                      cancel=cancel)
+
     def analyze_productivity_pattern(self):
         """📊 개인 생산성 패턴 분석"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # 최근 7일간의 시간대별 생산성 데이터
-            cursor.execute('''
-                SELECT start_time, focus_rating, duration_minutes
-                FROM task_records 
-                WHERE date >= date('now', '-7 days') AND status = 'Done'
-                ORDER BY start_time
-            ''')
-            
-            records = cursor.fetchall()
-            conn.close()
-            
-            if not records:
-                return "아직 충분한 데이터가 없습니다. 며칠 더 사용한 후 패턴 분석이 가능합니다."
-            
-            # 시간대별 평균 집중도 계산
-            hourly_focus = {}
-            for record in records:
-                hour = int(record[0].split(':')[0])
-                focus = record[1] or 3
+            if self.columnar is not None and self.columnar.ready:
+                # 열 단위 캐시가 있으면 행 객체 없이 벡터 연산으로
+                self.columnar.sync()
+                start = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+                count, hourly_focus, avg_duration = self.columnar.task_pattern(start)
+            else:
+                records = self.repo.get_recent_task_patterns(7)
+                count = len(records)
                 
-                if hour not in hourly_focus:
-                    hourly_focus[hour] = []
-                hourly_focus[hour].append(focus)
+                # 시간대별 평균 집중도 계산
+                focuses = {}
+                for record in records:
+                    hour = int(record.start_time.split(':')[0])
+                    focuses.setdefault(hour, []).append(record.focus_rating or 3)
+                hourly_focus = {hour: sum(values) / len(values) for hour, values in focuses.items()}
+                avg_duration = sum(r.duration_minutes or 0 for r in records) / count if count else 0
+            
+            if not count:
+                return "아직 충분한 데이터가 없습니다. 며칠 더 사용한 후 패턴 분석이 가능합니다."
             
             # 최고 생산성 시간대 찾기
-            best_hours = []
-            for hour, focuses in hourly_focus.items():
-                avg_focus = sum(focuses) / len(focuses)
-                if avg_focus >= 4.0:
-                    best_hours.append(f"{hour:02d}시")
+            best_hours = [f"{hour:02d}시" for hour, avg_focus in hourly_focus.items() if avg_focus >= 4.0]
             
             pattern_text = f"""
 **개인 생산성 패턴 분석**
-- 총 분석 데이터: {len(records)}개 업무
+- 총 분석 데이터: {count}개 업무
 - 고집중 시간대: {', '.join(best_hours) if best_hours else '패턴 분석 중'}
-- 평균 업무 지속시간: {sum(r[2] or 0 for r in records) / len(records):.1f}분
+- 평균 업무 지속시간: {avg_duration:.1f}분
 """
             return pattern_text
             
         except Exception as e:
             return f"패턴 분석 오류: {str(e)}"
     
-    def show_smart_schedule_window(self, suggestion, tasks):
-        """🔄 스마트 일정 창 표시"""
+    def show_smart_schedule_window(self, plan, suggestion_id, stream=None, job=None):
+        """🔄 스마트 일정 창 표시 (계획은 바로, AI 설명은 job 이 있으면 받는 대로 아래에). 창을 돌려준다"""
         schedule_window = tk.Toplevel(self.root)
-        schedule_window.title('🔄 AI 스마트 일정 추천')
+        schedule_window.title('🔄 스마트 일정 추천')
         schedule_window.geometry('700x600')
         
         # 스크롤 가능한 텍스트
@@ -1739,113 +2382,122 @@ You are a productivity coach. Based on the following data, analyze the user's wo
         
         scrollbar.config(command=text_widget.yview)
         
-        text_widget.insert(tk.END, suggestion)
-        text_widget.config(state=tk.DISABLED)
+        self.fill_text_widget(text_widget, format_plan(plan))
+        if job is not None:
+            self.fill_text_widget(text_widget, '\n\n🤖 AI 설명\n\n')
+            self.fill_text_widget(text_widget, stream, job)
         
         # 버튼 프레임
         btn_frame = tk.Frame(schedule_window)
         btn_frame.pack(pady=10)
         
         accept_btn = tk.Button(btn_frame, text='✅ 일정 적용', 
-                             command=lambda: self.accept_schedule(schedule_window),
+                             command=lambda: self.accept_schedule(schedule_window, plan, suggestion_id),
                              bg='lightgreen', font=('Arial', 12, 'bold'))
         accept_btn.pack(side=tk.LEFT, padx=10)
+        if not plan['items']:
+            accept_btn.config(state=tk.DISABLED)
         
         close_btn = tk.Button(btn_frame, text='닫기', 
                             command=schedule_window.destroy,
                             font=('Arial', 12, 'bold'))
         close_btn.pack(side=tk.LEFT, padx=10)
+        return schedule_window
     
-    def accept_schedule(self, window):
-        """✅ AI 추천 일정 적용"""
-        self.add_log('✅ AI 추천 일정을 적용했습니다!')
-        self.show_toast('✅ 일정 적용', 'AI 추천 일정이 적용되었습니다!')
+    def accept_schedule(self, window, plan, suggestion_id):
+        """✅ 추천 일정의 시작 시각을 노션 Time 속성에 쓰기 (노션 워커에서)"""
+        headers = dict(self.headers)
+        
+        def work():
+            failed = []
+            for item in plan['items']:
+                if not item.get('page_id'):
+                    continue
+                response = requests.patch(
+                    f"https://api.notion.com/v1/pages/{item['page_id']}",
+                    headers=headers,
+                    json={'properties': {'Time': {'date': {'start': notion_start(plan, item)}}}},
+                    timeout=15
+                )
+                if response.status_code != 200:
+                    failed.append(f"{item['name']} ({response.status_code})")
+            return failed
+        
+        def done(future):
+            if future.exception() is not None:
+                self.add_log(f'❌ 일정 적용 오류: {future.exception()}')
+                return
+            failed = future.result()
+            if failed:
+                self.add_log(f"❌ 일정 적용 실패: {', '.join(failed)}")
+                return
+            self.repo.accept_schedule_suggestion(suggestion_id)
+            self.add_log('✅ 추천 일정을 노션에 적용했습니다!')
+            self.show_toast('✅ 일정 적용', '추천 일정이 노션에 적용되었습니다!')
+            # 바뀐 시각으로 업무 표 / 알림 다시 맞추기
+            self.notified_tasks.clear()
+            self.load_tasks()
+        
         window.destroy()
-    
-    def save_schedule_suggestion(self, suggestion):
-        """💾 AI 일정 추천 저장"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            today = datetime.now().strftime('%Y-%m-%d')
-            
-            cursor.execute('''
-                INSERT INTO ai_schedule_suggestions (date, suggested_order, reasoning)
-                VALUES (?, ?, ?)
-            ''', (today, suggestion, 'AI 기반 최적 순서 추천'))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            print(f'Save schedule error: {e}')
+        self.add_log('🔄 노션에 추천 일정 적용 중...')
+        self.call_when_done(self.notion_pool.submit(work), done)
     
     def get_productivity_prediction(self):
-        """📈 생산성 예측 및 권장사항"""
-        if not self.openai_key:
-            self.add_log('❌ OpenAI API 키가 설정되지 않았습니다')
-            self.show_toast('❌ AI 설정 필요', 'OpenAI API 키를 .env 파일에 추가해주세요')
-            return
-        
+        """📈 생산성 예측 및 권장사항 (로컬 계산, AI 해설은 선택)
+
+        하루 정리에서 미리 만든 내일 예측이 있으면 그대로 보여준다.
+        """
         try:
+            tomorrow = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+            stored = self.repo.get_latest_ai_feedback(tomorrow, 'forecast')
+            if stored:
+                self.add_log('🌙 저장된 내일 예측을 불러왔습니다')
+                self.show_prediction_window(stored)
+                return
+            
             self.add_log('📈 생산성 예측 분석 중...')
-            self.show_toast('📈 AI 예측 중', '내일의 생산성을 예측하고 있습니다...')
             
-            # 예측을 위한 데이터 수집
+            # 예측을 위한 데이터 수집 + 로컬 예측
             prediction_data = self.collect_prediction_data()
+            if not prediction_data or prediction_data['forecast'] is None:
+                self.show_prediction_window("""📈 생산성 예측
+
+❌ 예측을 위한 데이터가 부족합니다.
+최소 3일 이상의 데이터가 필요합니다.
+
+📝 권장사항:
+- 며칠 더 꾸준히 사용해주세요
+- 업무 완료 시 집중도 평가를 정확히 해주세요
+- 목표를 설정하고 추적해보세요""")
+                return
             
-            # AI 예측 생성
-            prediction = self.generate_productivity_prediction(prediction_data)
-            
-            # 예측 결과 창 표시
-            self.show_prediction_window(prediction)
+            # 예측 결과 창 표시 (AI 해설은 창에서 요청)
+            self.show_prediction_window(format_forecast(prediction_data['forecast']),
+                                        prediction_data)
             
         except Exception as e:
             self.add_log(f'❌ 생산성 예측 오류: {e}')
-            self.show_toast('❌ AI 오류', f'예측 생성 실패: {str(e)[:50]}')
+            self.show_toast('❌ 예측 오류', f'예측 생성 실패: {str(e)[:50]}')
     
     def collect_prediction_data(self):
-        """📊 예측을 위한 데이터 수집"""
+        """📊 예측을 위한 데이터 수집 - 최근 일일 / 시간대별 집계로 내일 예측"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 최근 7일 데이터
-            cursor.execute('''
-                SELECT date, total_work_minutes, completed_tasks, avg_focus_rating
-                FROM daily_stats 
-                WHERE date >= date('now', '-7 days')
-                ORDER BY date DESC
-            ''', )
-            
-            daily_data = cursor.fetchall()
+            # 최근 90일 일일 집계 (요일 패턴 + 추세 회귀용)
+            daily_data = self.repo.get_recent_daily_stats(90)
             
-            # 최근 업무 패턴
-            cursor.execute('''
-                SELECT task_name, duration_minutes, focus_rating, start_time
-                FROM task_records 
-                WHERE date >= date('now', '-7 days') AND status = 'Done'
-                ORDER BY date DESC
-            ''')
-            
-            task_data = cursor.fetchall()
+            # 시간대별 집중도 (같은 기간)
+            start = (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d')
+            hours = self.analytics.focus_by_hour(start)
             
             # 목표 대비 달성률
             today = datetime.now().strftime('%Y-%m-%d')
-            cursor.execute('''
-                SELECT target_work_hours, target_tasks, target_focus_avg
-                FROM goals 
-                WHERE goal_type = 'daily' AND date_range = ?
-            ''', (today,))
-            
-            goal_data = cursor.fetchone()
-            conn.close()
+            goal_data = self.repo.get_goal('daily', today)
             
             return {
                 'daily_stats': daily_data,
-                'task_patterns': task_data,
+                'hours': hours,
                 'current_goals': goal_data,
+                'forecast': forecast_day(daily_data, hours),
                 'data_points': len(daily_data)
             }
             
@@ -1853,59 +2505,41 @@ You are a productivity coach. Based on the following data, analyze the user's wo
             print(f'Collect prediction data error: {e}')
             return None
     
-    def generate_productivity_prediction(self, data):
-        """📈 AI 기반 생산성 예측"""
+    def generate_productivity_prediction(self, data, stream=None, cancel=None):
+        """🤖 로컬 예측 결과를 AI 가 해설 (수치는 바꾸지 않고 전략만 제안)"""
         try:
-            if not data or data['data_points'] < 3:
-                return """📈 생산성 예측
-
-❌ 예측을 위한 데이터가 부족합니다.
-최소 3일 이상의 데이터가 필요합니다.
-
-📝 권장사항:
-- 며칠 더 꾸준히 사용해주세요
-- 업무 완료 시 집중도 평가를 정확히 해주세요
-- 목표를 설정하고 추적해보세요"""
+            prompt = self.build_prediction_prompt(data)
             
-            # 최근 패턴 분석
-            daily_stats = data['daily_stats']
-            task_patterns = data['task_patterns']
-            
-            # 평균값 계산
-            avg_work_time = sum(stat[1] or 0 for stat in daily_stats) / len(daily_stats)
-            avg_tasks = sum(stat[2] or 0 for stat in daily_stats) / len(daily_stats)
-            avg_focus = sum(stat[3] or 0 for stat in daily_stats) / len(daily_stats)
-            
-            # 트렌드 분석
-            recent_3_days = daily_stats[:3]
-            recent_avg_focus = sum(stat[3] or 0 for stat in recent_3_days) / len(recent_3_days)
+            # OpenAI API 호출
+            model = self.llm.model
             
-            trend = "상승" if recent_avg_focus > avg_focus else "하락" if recent_avg_focus < avg_focus else "안정"
+            def create():
+                return self.llm.complete(prompt, 1500, operation='prediction',
+                                         stream=stream, cancel=cancel)
             
-            # 요일별 패턴 (간단히)
-            tomorrow = datetime.now() + timedelta(days=1)
-            tomorrow_weekday = tomorrow.strftime('%A')
+            key_data = {'forecast': data['forecast'], 'goal': data['current_goals']}
+            return self.cached_completion('prediction', model, key_data, create, stream=stream,
+                                          cancel=cancel)
             
-            prompt = f"""
-당신은 생산성 분석 전문가입니다. 다음 데이터를 바탕으로 내일의 생산성을 예측하고 구체적인 권장사항을 제공해주세요.
-
-**최근 7일 생산성 데이터**
-- 평균 작업시간: {avg_work_time:.1f}분/일
-- 평균 완료업무: {avg_tasks:.1f}개/일  
-- 평균 집중도: {avg_focus:.1f}/5.0
-- 최근 3일 집중도 트렌드: {trend}
+        except Exception as e:
+            return f"생산성 예측 해설 생성 중 오류가 발생했습니다: {str(e)}"
+    
+    def build_prediction_prompt(self, data):
+        """📝 로컬 예측(collect_prediction_data) 해설 프롬프트"""
+        forecast = data['forecast']
+        goal = data['current_goals']
+        goal_str = (f"작업 {goal.target_work_hours}시간, 업무 {goal.target_tasks}개, "
+                    f"집중도 {goal.target_focus_avg}" if goal else '설정 안 됨')
+        
+        return f"""
+당신은 생산성 분석 전문가입니다. 아래는 사용자의 기록으로 계산한 내일의 생산성 예측입니다.
+숫자는 이미 계산되어 있으니 다시 예측하지 말고, 이 예측을 바탕으로 구체적인 권장사항만 제공해주세요.
 
-**내일 정보**
-- 요일: {tomorrow_weekday}
-- 날짜: {tomorrow.strftime('%Y-%m-%d')}
+{format_forecast(forecast)}
 
-**분석 요청**
-다음 형식으로 예측 보고서를 작성해주세요:
+**오늘의 목표**: {goal_str}
 
-**📈 내일 생산성 예측**
-- 예상 집중도: X.X/5.0 (이유)
-- 권장 작업시간: X시간 (이유)  
-- 완료 가능 업무수: X개 (이유)
+다음 형식으로 작성해주세요:
 
 **⚡ 생산성 향상 전략**
 1. 최적 시간대 활용 방법
@@ -1922,25 +2556,9 @@ You are a productivity coach. Based on the following data, analyze the user's wo
 
 친근하고 실용적인 조언을 제공해주세요.
 """
-            
-            # OpenAI API 호출
-            from openai import OpenAI
-            client = OpenAI(api_key=self.openai_key)
-            
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1500,
-                temperature=0.7
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            return f"생산성 예측 생성 중 오류가 발생했습니다: {str(e)}"
     
-    def show_prediction_window(self, prediction):
-        """📈 생산성 예측 창 표시"""
+    def show_prediction_window(self, prediction, data=None):
+        """📈 생산성 예측 창 표시 (data 가 있고 API 키가 있으면 AI 해설 버튼)"""
         prediction_window = tk.Toplevel(self.root)
         prediction_window.title('📈 생산성 예측 & 권장사항')
         prediction_window.geometry('700x600')
@@ -1958,20 +2576,79 @@ You are a productivity coach. Based on the following data, analyze the user's wo
         
         scrollbar.config(command=text_widget.yview)
         
-        text_widget.insert(tk.END, prediction)
-        text_widget.config(state=tk.DISABLED)
+        self.fill_text_widget(text_widget, prediction)
+        
+        button_frame = tk.Frame(prediction_window)
+        button_frame.pack(pady=10)
+        
+        if data and self.openai_key:
+            def narrate():
+                narrate_btn.config(state=tk.DISABLED)
+                self.add_log('🤖 예측 해설 생성 중...')
+                stream = TokenStream()
+                job = self.run_ai_task(
+                    'AI 예측 해설',
+                    lambda cancel: self.generate_productivity_prediction(data, stream, cancel),
+                    lambda narration: None
+                )
+                if job is not None:
+                    self.fill_text_widget(text_widget, '\n\n🤖 AI 해설\n\n')
+                    self.fill_text_widget(text_widget, stream, job)
+                    
+                    # 취소되면 다시 누를 수 있게
+                    def restore(future):
+                        if job.cancelled and narrate_btn.winfo_exists():
+                            narrate_btn.config(state=tk.NORMAL)
+                    self.call_when_done(job.future, restore)
+            
+            narrate_btn = tk.Button(button_frame, text='🤖 AI 해설', command=narrate,
+                                    font=('Arial', 12))
+            narrate_btn.pack(side=tk.LEFT, padx=5)
         
         # 닫기 버튼
-        close_btn = tk.Button(prediction_window, text='닫기', 
+        close_btn = tk.Button(button_frame, text='닫기', 
                             command=prediction_window.destroy,
                             font=('Arial', 12, 'bold'))
-        close_btn.pack(pady=10)
+        close_btn.pack(side=tk.LEFT, padx=5)
 
     def add_log(self, message):
         timestamp = datetime.now().strftime('%H:%M:%S')
         self.log_text.insert("end", f'[{timestamp}] {message}\n')
         self.log_text.see("end")
 
+    def post_log(self, message):
+        """📝 워커 스레드용 로그 - Tk 를 직접 부르지 않고 큐에 넣으면 update_timer 가 메인 스레드에서 출력
+
+        (root.after 는 메인 스레드가 응답할 때까지 기다리므로 종료 시 하루 정리를 기다리는 동안 멈춘다)
+        """
+        self.log_queue.put((datetime.now().strftime('%H:%M:%S'), message))
+
+    def drain_log_queue(self):
+        """📝 post_log 로 쌓인 로그 출력 (메인 스레드)"""
+        while True:
+            try:
+                timestamp, message = self.log_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.log_text.insert("end", f'[{timestamp}] {message}\n')
+            self.log_text.see("end")
+
+    def on_close(self):
+        """🚪 종료 시 오늘 정리를 마치고 남은 DB 쓰기를 모두 커밋한 뒤 창 닫기"""
+        try:
+            self.finish_digest_on_exit()
+        except Exception as e:
+            print(f'Digest on exit error: {e}')
+        try:
+            self.db_writer.stop()
+        except Exception as e:
+            print(f'DB writer stop error: {e}')
+        self.chart_pool.shutdown(wait=False)
+        self.ai_jobs.shutdown()
+        self.notion_pool.shutdown(wait=False)
+        self.llm.close()
+        self.root.destroy()
+
     def run(self):
         self.root.mainloop()
 